@@ -0,0 +1,200 @@
+"""
+aggregate.py - Fungsi Agregat (COUNT, SUM, AVG, MIN, MAX) untuk CSV_QL
+
+Modul ini berisi accumulator untuk hash aggregation (lihat
+operators.HashAggregate). Setiap grup menyimpan satu accumulator per fungsi
+agregat, dan nilai dimasukkan satu per satu saat baris lewat. Memori
+sebanding dengan jumlah grup, bukan jumlah baris input.
+
+Semantik nilai:
+    - Nilai kosong ("") dianggap NULL: dilewati semua fungsi kecuali COUNT(*)
+    - SUM/AVG: nilai non-numerik dianggap 0, sama seperti perbandingan
+      numerik di WHERE (lihat engine.get_value)
+    - MIN/MAX: dibandingkan secara numerik jika semua nilai di grup numerik,
+      selain itu dibandingkan sebagai string. Hasilnya adalah nilai aslinya.
+    - Grup tanpa nilai (selain NULL) menghasilkan "" (COUNT menghasilkan "0")
+
+Accumulator bisa digabung (merge), sehingga scan paralel cukup mengirim
+hasil agregasi parsial setiap potongan file (lihat parallel.py).
+"""
+
+import operator
+from typing import Callable, Optional
+from ast_nodes import AggFunc, Aggregate
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ACCUMULATOR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Accumulator:
+    """Basis accumulator: add() per nilai, merge() hasil parsial, result() akhir."""
+    __slots__ = ()
+
+    def add(self, value: str) -> None:
+        raise NotImplementedError
+
+    def merge(self, other: 'Accumulator') -> None:
+        raise NotImplementedError
+
+    def result(self) -> str:
+        raise NotImplementedError
+
+
+class CountRows(Accumulator):
+    """COUNT(*): jumlah baris, termasuk yang nilainya kosong."""
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, value: str) -> None:
+        self.count += 1
+
+    def merge(self, other: 'CountRows') -> None:
+        self.count += other.count
+
+    def result(self) -> str:
+        return str(self.count)
+
+
+class Count(CountRows):
+    """COUNT(kolom): jumlah nilai yang tidak kosong."""
+    __slots__ = ()
+
+    def add(self, value: str) -> None:
+        if value:
+            self.count += 1
+
+
+class Sum(Accumulator):
+    """SUM(kolom): jumlah nilai numerik (non-numerik = 0)."""
+    __slots__ = ("count", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: str) -> None:
+        if not value:
+            return
+        try:
+            self.total += float(value)
+        except ValueError:
+            pass
+        self.count += 1
+
+    def merge(self, other: 'Sum') -> None:
+        self.count += other.count
+        self.total += other.total
+
+    def result(self) -> str:
+        return format_number(self.total) if self.count else ""
+
+
+class Avg(Sum):
+    """AVG(kolom): rata-rata nilai numerik (non-numerik = 0)."""
+    __slots__ = ()
+
+    def result(self) -> str:
+        return format_number(self.total / self.count) if self.count else ""
+
+
+class Min(Accumulator):
+    """
+    MIN(kolom): nilai terkecil. Perbandingan numerik dan string dilacak
+    bersamaan; yang dipakai ditentukan saat result() (lihat docstring modul).
+    """
+    __slots__ = ("number", "text", "string", "numeric")
+
+    # Urutan yang dicari: a "lebih baik" dari b
+    better: Callable = operator.lt
+
+    def __init__(self):
+        self.number: Optional[float] = None
+        self.text = ""
+        self.string: Optional[str] = None
+        self.numeric = True
+
+    def add(self, value: str) -> None:
+        if not value:
+            return
+        better = self.better
+        if self.string is None or better(value, self.string):
+            self.string = value
+        if self.numeric:
+            try:
+                number = float(value)
+            except ValueError:
+                self.numeric = False
+                return
+            if self.number is None or better(number, self.number):
+                self.number = number
+                self.text = value
+
+    def merge(self, other: 'Min') -> None:
+        if other.string is None:
+            return
+        better = self.better
+        if self.string is None or better(other.string, self.string):
+            self.string = other.string
+        self.numeric = self.numeric and other.numeric
+        if self.numeric and (self.number is None or better(other.number, self.number)):
+            self.number = other.number
+            self.text = other.text
+
+    def result(self) -> str:
+        if self.string is None:
+            return ""
+        return self.text if self.numeric else self.string
+
+
+class Max(Min):
+    """MAX(kolom): nilai terbesar (lihat Min)."""
+    __slots__ = ()
+
+    better: Callable = operator.gt
+
+
+# Fungsi agregat -> class accumulator (COUNT(*) memakai CountRows)
+ACCUMULATORS = {
+    AggFunc.COUNT: Count,
+    AggFunc.SUM: Sum,
+    AggFunc.AVG: Avg,
+    AggFunc.MIN: Min,
+    AggFunc.MAX: Max,
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HELPER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def accumulator_factory(aggregate: Aggregate) -> Callable[[], Accumulator]:
+    """
+    Class accumulator untuk satu fungsi agregat.
+
+    Args:
+        aggregate: Aggregate dari daftar SELECT
+
+    Returns:
+        Callable tanpa argumen yang membuat accumulator baru
+    """
+    if aggregate.column == "*":
+        return CountRows
+    return ACCUMULATORS[aggregate.func]
+
+
+def aggregate_label(aggregate: Aggregate) -> str:
+    """Nama kolom hasil agregat, mis. "AVG(nilai_angka)"."""
+    return f"{aggregate.func.name}({aggregate.column})"
+
+
+def format_number(value: float) -> str:
+    """
+    Format angka hasil SUM/AVG: bilangan bulat tanpa ".0" (150, bukan 150.0),
+    selain itu repr float.
+    """
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
@@ -55,7 +55,7 @@ class Op(Enum):
 """
 
 from enum import Enum, auto
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Union, List
 
 
@@ -75,6 +75,15 @@ class Op(Enum):
     AND = auto()                # AND
 
 
+class AggFunc(Enum):
+    """Enum untuk fungsi agregat"""
+    COUNT = auto()
+    SUM = auto()
+    AVG = auto()
+    MIN = auto()
+    MAX = auto()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #                              Expr Classes
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -111,26 +120,116 @@ class Identifier:
     name: str
 
 
+@dataclass
+class BoolLiteral:
+    """Konstanta boolean hasil constant folding (tidak ditulis di query)"""
+    value: bool
+
+
+@dataclass
+class InList:
+    """
+    Keanggotaan: expr IN (values) atau expr NOT IN (values)
+    
+    Setara dengan expr = v1 OR expr = v2 OR ..., dengan semantik = yang sama
+    (string untuk nilai string, numerik dengan epsilon untuk angka).
+    NOT IN adalah negasi dari hasil tersebut.
+    """
+    expr: 'Expr'                    # biasanya Identifier (kolom)
+    values: List['Expr']            # Number / StringLiteral / Literal
+    negated: bool = False           # True untuk NOT IN
+
+
+@dataclass
+class Between:
+    """
+    Rentang inklusif: expr BETWEEN low AND high
+    
+    Setara dengan expr >= low AND expr <= high (perbandingan numerik, nilai
+    non-numerik = 0), tetapi nilai expr cukup diambil dan dikonversi sekali.
+    """
+    expr: 'Expr'                    # biasanya Identifier (kolom)
+    low: 'Expr'                     # batas bawah (biasanya Number)
+    high: 'Expr'                    # batas atas (biasanya Number)
+
+
 # Union type untuk semua jenis Expr
-Expr = Union[BinaryOp, Literal, StringLiteral, Number, Identifier]
+Expr = Union[BinaryOp, Literal, StringLiteral, Number, Identifier, BoolLiteral, InList, Between]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                              Statement Classes
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@dataclass(frozen=True)
+class Aggregate:
+    """
+    Fungsi agregat di daftar SELECT: func(column)
+    
+    Contoh: COUNT(*), AVG(nilai_angka)
+    """
+    func: AggFunc
+    column: str                     # nama kolom, atau "*" (hanya untuk COUNT)
+
+
+# Item daftar SELECT: nama kolom ("*" = semua kolom) atau fungsi agregat
+SelectItem = Union[str, Aggregate]
+
+
+@dataclass(frozen=True)
+class OrderItem:
+    """
+    Satu kunci ORDER BY: column [ASC | DESC]
+    
+    Contoh: nilai_angka DESC, AVG(nilai_angka)
+    """
+    column: SelectItem              # nama kolom atau fungsi agregat
+    descending: bool = False        # True untuk DESC
+
+
+@dataclass(frozen=True)
+class JoinClause:
+    """
+    JOIN table ON left = right (inner equi-join)
+    
+    Contoh: JOIN mahasiswa.csv ON data_nilai.nim = mahasiswa.nim
+    """
+    table: str                      # nama file CSV kedua
+    left: str                       # kolom kunci (setelah di-resolve: tabel FROM)
+    right: str                      # kolom kunci (setelah di-resolve: tabel JOIN)
+
+
 @dataclass
 class SelectStatement:
     """
     Representasi SELECT statement
     
     Contoh: SELECT nama, nilai FROM data.csv WHERE nilai > 80 LIMIT 10
+            SELECT mata_kuliah, AVG(nilai_angka) FROM data.csv GROUP BY mata_kuliah
+            SELECT nama FROM data.csv ORDER BY nilai_angka DESC LIMIT 10
+            SELECT nama, alamat FROM data.csv JOIN mhs.csv ON data.nim = mhs.nim
     """
-    columns: List[str]              # daftar kolom yang di-SELECT
+    columns: List[SelectItem]       # daftar kolom / agregat yang di-SELECT
     table: str                      # nama file CSV
     where_clause: Optional[Expr] = None  # kondisi WHERE (opsional)
     limit: Optional[int] = None     # batasan jumlah baris (opsional)
+    group_by: List[str] = field(default_factory=list)  # kolom GROUP BY (opsional)
+    order_by: List[OrderItem] = field(default_factory=list)  # kunci ORDER BY (opsional)
+    join: Optional[JoinClause] = None  # JOIN tabel kedua (opsional)
+
+
+@dataclass
+class CreateIndexStatement:
+    """
+    Representasi CREATE INDEX statement
+    
+    Contoh: CREATE INDEX ON data.csv (nim)
+            CREATE INDEX ON data.csv (nilai_angka) USING SORTED
+    """
+    table: str                      # nama file CSV
+    column: str                     # kolom yang di-index
+    kind: str = "hash"              # jenis index: "hash" atau "sorted"
 
 
-# Statement adalah alias untuk SelectStatement (untuk saat ini)
-Statement = SelectStatement
+# Union type untuk semua jenis statement
+Statement = Union[SelectStatement, CreateIndexStatement]
@@ -0,0 +1,192 @@
+"""
+cache.py - Cache Hasil Query untuk CSV_QL
+
+Modul ini menyediakan LRU cache dengan batas ukuran (byte atau jumlah entri)
+dan statistik hit/miss, serta kunci cache yang kanonik untuk SelectStatement.
+
+Dua query yang ditulis berbeda tetapi maknanya sama menghasilkan kunci yang
+sama, misalnya:
+    WHERE semester = 5 AND status = "Lulus"
+    WHERE status = 'Lulus' AND 5 = semester
+
+Kunci juga memuat fingerprint file (ukuran, mtime, inode), jadi hasil untuk
+file yang sudah berubah tidak pernah dipakai lagi dan akhirnya tergusur LRU.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+from ast_nodes import (Expr, Op, BinaryOp, Identifier, Number, StringLiteral, Literal, BoolLiteral, InList,
+                       Between)
+from fingerprint import file_fingerprint
+from predicate import flatten_chain, _FLIPPED_OPS
+
+
+# Perkiraan overhead memori per baris dan per nilai (list + objek str)
+ROW_OVERHEAD_BYTES = 64
+VALUE_OVERHEAD_BYTES = 56
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LRU CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class LRUCache:
+    """
+    LRU cache dengan anggaran ukuran total.
+
+    Setiap entri punya ukuran (mis. perkiraan byte, atau 1 untuk membatasi
+    jumlah entri). Jika total ukuran melebihi capacity, entri yang paling
+    lama tidak dipakai digusur.
+
+    Attributes:
+        capacity: Anggaran ukuran total (0 = cache nonaktif)
+        size: Total ukuran entri saat ini
+        hits, misses, evictions: Statistik pemakaian
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Ambil nilai untuk key (None jika tidak ada), dan catat hit/miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int = 1) -> bool:
+        """
+        Simpan nilai. Entri yang lebih besar dari capacity tidak disimpan.
+
+        Returns:
+            True jika nilai disimpan
+        """
+        self.discard(key)
+        if size > self.capacity:
+            return False
+        self._entries[key] = (value, size)
+        self.size += size
+        self._evict()
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        """Hapus satu entri jika ada."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def resize(self, capacity: int) -> None:
+        """Ubah anggaran ukuran, gusur entri jika perlu."""
+        self.capacity = capacity
+        self._evict()
+
+    def clear(self) -> None:
+        """Kosongkan cache dan reset statistik."""
+        self._entries.clear()
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def _evict(self) -> None:
+        """Gusur entri paling lama sampai total ukuran muat di capacity."""
+        while self.size > self.capacity and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KUNCI KANONIK
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def normalize_expr(expr: Optional[Expr]) -> Hashable:
+    """
+    Bentuk kanonik expression (tuple bersarang yang bisa di-hash).
+
+    - Operand rantai AND/OR diratakan lalu diurutkan (urutan tidak mengubah hasil)
+    - Perbandingan dinormalkan ke "kolom op nilai" (operator dibalik jika perlu)
+    - StringLiteral dan Literal disamakan (semantiknya identik di engine)
+
+    Args:
+        expr: Expression (boleh None)
+
+    Returns:
+        Tuple kanonik
+    """
+    if expr is None:
+        return None
+    if isinstance(expr, Identifier):
+        return ("col", expr.name)
+    if isinstance(expr, Number):
+        return ("num", float(expr.value))
+    if isinstance(expr, (StringLiteral, Literal)):
+        return ("str", expr.value)
+    if isinstance(expr, BoolLiteral):
+        return ("bool", expr.value)
+    if isinstance(expr, InList):
+        # Urutan dan duplikat nilai tidak mengubah hasil
+        values = {normalize_expr(value) for value in expr.values}
+        return ("NOT IN" if expr.negated else "IN", normalize_expr(expr.expr),
+                tuple(sorted(values, key=repr)))
+    if isinstance(expr, Between):
+        return ("BETWEEN", normalize_expr(expr.expr), normalize_expr(expr.low),
+                normalize_expr(expr.high))
+    if not isinstance(expr, BinaryOp):
+        return ("expr", repr(expr))
+
+    if expr.op in (Op.AND, Op.OR):
+        operands = {normalize_expr(e) for e in flatten_chain(expr, expr.op)}
+        return (expr.op.name, tuple(sorted(operands, key=repr)))
+
+    left, right, op = normalize_expr(expr.left), normalize_expr(expr.right), expr.op
+    if left[0] != "col" and right[0] == "col" or \
+            (left[0] == right[0] and repr(right) < repr(left)):
+        left, right, op = right, left, _FLIPPED_OPS[op]
+    return (op.name, left, right)
+
+
+def result_key(query) -> Optional[Hashable]:  # query: SelectStatement
+    """
+    Kunci cache hasil untuk query: bentuk kanonik + fingerprint file
+    (termasuk file JOIN).
+
+    Args:
+        query: SelectStatement dari parser
+
+    Returns:
+        Tuple kunci, atau None jika file tidak bisa di-stat
+    """
+    join = query.join
+    try:
+        fingerprint = file_fingerprint(query.table)
+        join_fingerprint = file_fingerprint(join.table) if join is not None else None
+    except OSError:
+        return None
+    return (
+        os.path.abspath(query.table),
+        fingerprint,
+        tuple(query.columns),
+        normalize_expr(query.where_clause),
+        tuple(query.group_by),
+        tuple(query.order_by),
+        (os.path.abspath(join.table), join.left, join.right) if join is not None else None,
+        join_fingerprint,
+        # LIMIT 0 dan tanpa LIMIT sama-sama berarti tanpa batas di engine
+        query.limit or None,
+    )
+
+
+def row_size(row: List[str]) -> int:
+    """Perkiraan memori (byte) untuk satu baris hasil."""
+    return ROW_OVERHEAD_BYTES + VALUE_OVERHEAD_BYTES * len(row) + sum(map(len, row))
@@ -0,0 +1,246 @@
+"""
+catalog.py - Katalog Tabel untuk CSV_QL
+
+Modul ini menyimpan metadata setiap file CSV yang pernah dibuka: header,
+dialect, schema hasil inferensi, dan rasio record ber-quote. Semantic
+analysis dan engine memakai katalog yang sama, jadi file cukup dibuka dan
+dibaca sekali per query.
+
+Entri katalog divalidasi dengan fingerprint file (lihat fingerprint.py):
+satu os.stat per lookup, tanpa membuka atau membaca file. Jika file
+berubah, entri dibaca ulang.
+
+Handle MmapTable yang dibuka saat lookup tidak langsung ditutup, tetapi
+dititipkan di katalog. Engine mengambilnya dengan take_table() sehingga
+eksekusi memakai handle yang sama dengan analisis.
+"""
+
+import csv
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+from cache import LRUCache
+from fingerprint import Fingerprint, file_fingerprint
+from scanner import MmapTable
+from operators import normalize_rows
+
+
+# Jumlah baris data yang diperiksa untuk menebak tipe kolom
+SCHEMA_SAMPLE_ROWS = 1000
+
+# Tipe kolom hasil inferensi
+TYPE_INT = "int"
+TYPE_FLOAT = "float"
+TYPE_STRING = "string"
+
+# Jumlah maksimum tabel yang metadata-nya disimpan
+CATALOG_ENTRIES = 128
+
+# Jumlah maksimum handle terbuka yang dititipkan (menunggu diambil engine)
+CATALOG_OPEN_HANDLES = 4
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INFERENSI SCHEMA
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def infer_schema(header: List[str], rows: Iterable[List[str]],
+                 sample: int = SCHEMA_SAMPLE_ROWS) -> Dict[str, str]:
+    """
+    Tebak tipe setiap kolom dari sampel baris data.
+
+    Nilai kosong diabaikan. Kolom bertipe "int" jika semua nilai di sampel
+    bisa di-parse int(), "float" jika bisa di-parse float(), selain itu "string".
+    Tipe ini hanya perkiraan: baris di luar sampel boleh saja berbeda, jadi
+    engine tetap menyiapkan jalur cadangan untuk nilai yang gagal dikonversi.
+
+    Args:
+        header: List nama kolom
+        rows: Iterator baris data (sesudah header)
+        sample: Jumlah baris yang diperiksa
+
+    Returns:
+        Mapping nama kolom -> "int" | "float" | "string"
+    """
+    width = len(header)
+    types = [TYPE_INT] * width
+
+    for count, row in enumerate(rows):
+        if count >= sample:
+            break
+        for i, value in enumerate(row[:width]):
+            kind = types[i]
+            if kind == TYPE_STRING or not value:
+                continue
+            if kind == TYPE_INT:
+                try:
+                    int(value)
+                    continue
+                except ValueError:
+                    kind = types[i] = TYPE_FLOAT
+            try:
+                float(value)
+            except ValueError:
+                types[i] = TYPE_STRING
+
+    return dict(zip(header, types))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KATALOG
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class TableInfo:
+    """
+    Metadata satu file CSV.
+
+    Attributes:
+        path: Path absolut file
+        fingerprint: Fingerprint file saat metadata dibaca
+        header: List nama kolom
+        dialect: Dialect csv yang dipakai untuk membaca file
+        schema: Tipe kolom hasil infer_schema()
+        quoted_ratio: Proporsi record ber-quote di sampel
+                      (None jika file tidak bisa dibaca scanner mmap)
+        sample: Baris data awal (maks. SCHEMA_SAMPLE_ROWS, lebar = header),
+                dipakai optimizer untuk memperkirakan selektivitas
+    """
+    path: str
+    fingerprint: Fingerprint
+    header: List[str]
+    dialect: type
+    schema: Dict[str, str]
+    quoted_ratio: Optional[float]
+    sample: List[List[str]]
+
+
+class TableCatalog:
+    """
+    Cache metadata tabel per path, divalidasi dengan fingerprint file.
+
+    Attributes:
+        entries: LRU cache path absolut -> TableInfo
+    """
+
+    def __init__(self, capacity: int = CATALOG_ENTRIES):
+        self.entries = LRUCache(capacity)
+        self._handles: 'OrderedDict[str, MmapTable]' = OrderedDict()
+
+    def lookup(self, path: str) -> TableInfo:
+        """
+        Ambil metadata tabel, baca dari file jika belum ada atau sudah basi.
+
+        Args:
+            path: Path file CSV
+
+        Returns:
+            TableInfo yang sesuai dengan isi file saat ini
+
+        Raises:
+            OSError: Jika file tidak bisa dibuka
+            StopIteration: Jika file kosong (tanpa header)
+        """
+        key = os.path.abspath(path)
+        fingerprint = file_fingerprint(key)
+        info = self.entries.get(key)
+        if info is not None and info.fingerprint == fingerprint:
+            return info
+
+        info = self._load(key, fingerprint)
+        self.entries.put(key, info)
+        return info
+
+    def take_table(self, path: str) -> Optional[MmapTable]:
+        """
+        Ambil handle MmapTable yang dibuka saat lookup (jika masih sesuai).
+
+        Kepemilikan handle berpindah ke pemanggil, yang wajib menutupnya.
+        Setiap handle hanya bisa diambil sekali.
+
+        Args:
+            path: Path file CSV
+
+        Returns:
+            MmapTable, atau None jika tidak ada handle atau file sudah berubah
+        """
+        key = os.path.abspath(path)
+        table = self._handles.pop(key, None)
+        if table is None:
+            return None
+        info = self.entries.get(key)
+        try:
+            fresh = info is not None and info.fingerprint == file_fingerprint(key)
+        except OSError:
+            fresh = False
+        if not fresh:
+            table.close()
+            return None
+        return table
+
+    def open_table(self, path: str) -> Optional[MmapTable]:
+        """
+        Handle MmapTable untuk path: titipan dari lookup, atau dibuka baru.
+
+        Args:
+            path: Path file CSV
+
+        Returns:
+            MmapTable, atau None jika file/dialect tidak didukung scanner mmap
+        """
+        table = self.take_table(path)
+        if table is not None:
+            return table
+        info = self.entries.get(os.path.abspath(path))
+        return MmapTable.open(path, info.dialect if info is not None else csv.excel)
+
+    def clear(self) -> None:
+        """Kosongkan katalog dan tutup semua handle titipan."""
+        self.entries.clear()
+        while self._handles:
+            self._handles.popitem()[1].close()
+
+    def _load(self, path: str, fingerprint: Fingerprint) -> TableInfo:
+        """Baca header, sampel baris, dan schema dari file."""
+        # Semua file dibaca dengan dialect CSV standar (RFC 4180)
+        dialect = csv.excel
+
+        table = MmapTable.open(path, dialect)
+        if table is not None:
+            try:
+                records = list(islice(table.iter_records(), SCHEMA_SAMPLE_ROWS))
+                quoted = sum(1 for _, record in records if b'"' in record)
+                header = table.header
+                sample = list(table.decode_records(list(range(len(header))), records))
+                schema = infer_schema(header, sample)
+            except Exception:
+                # Scanner mmap gagal membaca file ini: jangan simpan handle-nya,
+                # baca ulang lewat csv.reader di bawah
+                table.close()
+            else:
+                self._keep(path, table)
+                ratio = quoted / len(records) if records else 0.0
+                return TableInfo(path, fingerprint, header, dialect, schema, ratio, sample)
+
+        # Dialect/newline tidak didukung scanner mmap: baca lewat csv.reader
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f, dialect)
+            header = next(reader)
+            sample = list(islice(normalize_rows(reader, len(header)), SCHEMA_SAMPLE_ROWS))
+        schema = infer_schema(header, sample)
+        return TableInfo(path, fingerprint, header, dialect, schema, None, sample)
+
+    def _keep(self, path: str, table: MmapTable) -> None:
+        """Titipkan handle sampai diambil engine (handle lama ditutup)."""
+        old = self._handles.pop(path, None)
+        if old is not None:
+            old.close()
+        self._handles[path] = table
+        while len(self._handles) > CATALOG_OPEN_HANDLES:
+            self._handles.popitem(last=False)[1].close()
+
+
+# Katalog bersama untuk semantic analysis dan engine
+table_catalog = TableCatalog()
@@ -0,0 +1,304 @@
+"""
+colcache.py - Cache Kolom (Columnar Sidecar) untuk CSV_QL
+
+Modul ini menyimpan isi file CSV dalam format kolom biner di samping file
+aslinya (mis. data_nilai.csv -> data_nilai.csv.cqlc). Query berikutnya cukup
+membaca kolom yang direferensikan dari sidecar, tanpa mem-parse CSV lagi.
+
+Format file sidecar:
+    MAGIC
+    row group 1: kolom 0, kolom 1, ...
+    row group 2: ...
+    metadata (JSON)
+    panjang metadata (8 byte, little-endian)
+    MAGIC
+
+Setiap row group berisi maksimal ROW_GROUP_SIZE baris. Setiap kolom dalam
+row group disimpan dengan tipe yang paling sempit tanpa kehilangan informasi:
+    - "int"   -> array('q'), jika str(int(v)) == v untuk semua nilai
+    - "float" -> array('d'), jika repr(float(v)) == v untuk semua nilai
+    - "str"   -> offset array('q') + teks UTF-8
+
+Karena konversi dijamin lossless, nilai yang dibaca kembali identik dengan
+string aslinya di CSV. Metadata menyimpan ukuran file, mtime, dan hash header;
+jika salah satunya berubah, sidecar dianggap basi dan dibangun ulang.
+"""
+
+import csv
+import json
+import os
+import struct
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+from fingerprint import file_fingerprint, header_hash
+
+
+# Penanda awal dan akhir file sidecar
+MAGIC = b"CQLC\x01"
+
+# Ekstensi file sidecar
+SUFFIX = ".cqlc"
+
+# Jumlah baris per row group
+ROW_GROUP_SIZE = 65536
+
+# Batas nilai int64
+_INT_MIN, _INT_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+def sidecar_path(path: str) -> str:
+    """Path file sidecar untuk file CSV."""
+    return path + SUFFIX
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENCODING KOLOM
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _encode_column(values: List[str]) -> Tuple[str, bytes]:
+    """
+    Encode satu kolom (satu row group) ke tipe tersempit yang lossless.
+
+    Returns:
+        Tuple (tipe, data biner)
+    """
+    try:
+        ints = [int(v) for v in values]
+        if all(_INT_MIN <= n <= _INT_MAX and str(n) == v for n, v in zip(ints, values)):
+            return ("int", array('q', ints).tobytes())
+    except ValueError:
+        pass
+
+    try:
+        floats = [float(v) for v in values]
+        if all(repr(x) == v for x, v in zip(floats, values)):
+            return ("float", array('d', floats).tobytes())
+    except ValueError:
+        pass
+
+    offsets = array('q', [0])
+    total = 0
+    for v in values:
+        total += len(v)
+        offsets.append(total)
+    return ("str", offsets.tobytes() + "".join(values).encode('utf-8'))
+
+
+def _decode_column(kind: str, data: bytes, rows: int) -> List[str]:
+    """Kebalikan dari _encode_column: kembalikan list string asli."""
+    if kind == "int":
+        values = array('q')
+        values.frombytes(data)
+        return list(map(str, values))
+
+    if kind == "float":
+        values = array('d')
+        values.frombytes(data)
+        return list(map(repr, values))
+
+    offsets = array('q')
+    offsets.frombytes(data[:(rows + 1) * 8])
+    text = data[(rows + 1) * 8:].decode('utf-8')
+    return [text[a:b] for a, b in zip(offsets, offsets[1:])]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build(path: str) -> None:
+    """
+    Bangun (atau bangun ulang) sidecar kolom untuk file CSV.
+
+    File ditulis ke path sementara lalu di-rename, sehingga pembaca lain
+    tidak pernah melihat sidecar yang setengah jadi.
+
+    Args:
+        path: Path file CSV
+    """
+    size, mtime_ns, _ = file_fingerprint(path)
+    target = sidecar_path(path)
+    temp = target + ".tmp"
+
+    try:
+        with open(path, 'r', newline='', encoding='utf-8') as f, open(temp, 'wb') as out:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            width = len(header)
+            out.write(MAGIC)
+
+            groups = []
+            buffer: List[List[str]] = []
+
+            def flush() -> None:
+                columns = []
+                for values in zip(*buffer) if width else []:
+                    kind, data = _encode_column(list(values))
+                    columns.append({"type": kind, "offset": out.tell(), "length": len(data)})
+                    out.write(data)
+                groups.append({"rows": len(buffer), "columns": columns})
+                buffer.clear()
+
+            for row in reader:
+                # Sama seperti operators.normalize_rows: lewati baris kosong, lengkapi baris pendek
+                if not row:
+                    continue
+                if len(row) != width:
+                    row = (row + [""] * width)[:width]
+                buffer.append(row)
+                if len(buffer) >= ROW_GROUP_SIZE:
+                    flush()
+            if buffer:
+                flush()
+
+            meta = json.dumps({
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "header_hash": header_hash(header),
+                "header": header,
+                "groups": groups,
+            }).encode('utf-8')
+            out.write(meta)
+            out.write(struct.pack('<Q', len(meta)))
+            out.write(MAGIC)
+        os.replace(temp, target)
+    except BaseException:
+        # Jangan tinggalkan file sementara yang setengah jadi
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# READ
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ColumnarTable:
+    """
+    Sidecar kolom yang sudah divalidasi terhadap file CSV-nya.
+
+    Attributes:
+        path: Path file CSV
+        header: List nama kolom
+        rows: Jumlah baris data
+    """
+
+    def __init__(self, path: str, f, meta: Dict):
+        self.path = path
+        self.header: List[str] = meta["header"]
+        self.rows = sum(g["rows"] for g in meta["groups"])
+        self._file = f
+        self._groups = meta["groups"]
+
+    @classmethod
+    def open(cls, path: str) -> Optional['ColumnarTable']:
+        """
+        Buka sidecar jika ada dan masih sesuai dengan file CSV.
+
+        Args:
+            path: Path file CSV
+
+        Returns:
+            ColumnarTable, atau None jika sidecar tidak ada / basi / rusak
+        """
+        target = sidecar_path(path)
+        if not os.path.exists(target):
+            return None
+
+        f = open(target, 'rb')
+        try:
+            meta = _read_meta(f)
+            size, mtime_ns, _ = file_fingerprint(path)
+            if (meta is None or meta["size"] != size or meta["mtime_ns"] != mtime_ns
+                    or meta["header_hash"] != header_hash(_read_csv_header(path))):
+                f.close()
+                return None
+        except (OSError, ValueError, KeyError, struct.error):
+            f.close()
+            return None
+        return cls(path, f, meta)
+
+    @classmethod
+    def open_or_build(cls, path: str) -> Optional['ColumnarTable']:
+        """
+        Buka sidecar, atau bangun dulu jika belum ada / sudah basi.
+
+        Args:
+            path: Path file CSV
+
+        Returns:
+            ColumnarTable, atau None jika sidecar tidak bisa ditulis
+        """
+        table = cls.open(path)
+        if table is not None:
+            return table
+        try:
+            build(path)
+        except OSError:
+            return None
+        return cls.open(path)
+
+    def close(self) -> None:
+        """Tutup file sidecar."""
+        self._file.close()
+
+    def __enter__(self) -> 'ColumnarTable':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def read_column(self, group: Dict, index: int) -> List[str]:
+        """Baca satu kolom dari satu row group."""
+        column = group["columns"][index]
+        self._file.seek(column["offset"])
+        return _decode_column(column["type"], self._file.read(column["length"]), group["rows"])
+
+    def scan(self, indexes: List[int]) -> Iterator[List[str]]:
+        """
+        Scan baris, hanya membaca kolom pada indexes dari sidecar.
+
+        Args:
+            indexes: Index kolom (di header) yang dibutuhkan, berurutan
+
+        Yields:
+            List string dengan panjang len(indexes), sesuai urutan indexes
+        """
+        for group in self._groups:
+            if not indexes:
+                for _ in range(group["rows"]):
+                    yield []
+                continue
+            columns = [self.read_column(group, i) for i in indexes]
+            yield from map(list, zip(*columns))
+
+    def scan_columns(self, indexes: List[int]) -> Iterator[List[List[str]]]:
+        """
+        Scan per row group dalam bentuk kolom (untuk mode batch).
+
+        Args:
+            indexes: Index kolom (di header) yang dibutuhkan, berurutan
+
+        Yields:
+            List kolom (sesuai urutan indexes) untuk setiap row group
+        """
+        for group in self._groups:
+            yield [self.read_column(group, i) for i in indexes]
+
+
+def _read_meta(f) -> Optional[Dict]:
+    """Baca metadata JSON dari footer sidecar (None jika format tidak cocok)."""
+    if f.read(len(MAGIC)) != MAGIC:
+        return None
+    f.seek(-(len(MAGIC) + 8), os.SEEK_END)
+    (length,) = struct.unpack('<Q', f.read(8))
+    if f.read(len(MAGIC)) != MAGIC:
+        return None
+    f.seek(-(len(MAGIC) + 8 + length), os.SEEK_END)
+    return json.loads(f.read(length).decode('utf-8'))
+
+
+def _read_csv_header(path: str) -> List[str]:
+    """Baca baris header file CSV."""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return next(csv.reader(f), [])
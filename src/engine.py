@@ -41,8 +41,9 @@ Lihat file Rust: src/engine.rs
 
 TIPS:
 -----
-- Gunakan module 'csv' bawaan Python: csv.DictReader untuk baca CSV
-- DictReader otomatis mapping kolom ke nama
+- Gunakan module 'csv' bawaan Python: csv.reader untuk baca CSV
+- Resolve nama kolom ke index sekali dari header (lihat build_layout),
+  jangan bangun dict untuk setiap baris
 - Perhatikan tipe data: string vs angka
 - Untuk perbandingan float, gunakan threshold kecil (epsilon)
 
@@ -50,17 +51,120 @@ TIPS:
 """
 
 import csv
-from typing import Tuple, List, Dict, Optional
+import os
+from contextlib import ExitStack
+from dataclasses import dataclass
+from itertools import chain
+from typing import Tuple, List, Dict, Optional, Iterator, Iterable, Callable
 from ast_nodes import (Statement, Expr, Op, BinaryOp, Literal, 
-                       StringLiteral, Number, Identifier, SelectStatement)
+                       StringLiteral, Number, Identifier, SelectStatement,
+                       CreateIndexStatement, BoolLiteral, InList, Between)
+from predicate import compile_predicate, compile_adaptive_predicate, expr_columns
+from parallel import parallel_scan
+from scanner import MmapTable, supports_file
+from colcache import ColumnarTable
+from zonemap import ZoneMap
+from cache import LRUCache, result_key, row_size
+from index import open_index, usable_indexes, build as build_index
+from catalog import table_catalog, TableInfo
+from ir import (QueryPlan, PlanStep, JoinStep, FilterStep, AggregateStep, SortStep, ProjectStep,
+                LimitStep, ast_to_ir, plan_table, scan_filter, limit_after, step_position)
+from operators import (Operator, Scan, Filter, Project, Limit, BatchScan, BatchFilter,
+                       BatchProject, BatchLimit, HashAggregate, Sort, HashJoin, MergeJoin, Rescan,
+                       build_layout, build_projection, normalize_rows)
+from join import JOIN_METHODS, JOIN_MERGE, JOIN_AUTO, is_sorted_on, qualified_header, qualified_schema
+from vectorized import compile_kernel
+from optimizer import optimize
 
 
-def execute_query(query) -> Tuple[List[str], List[List[str]]]:  # query: Statement
+# ═══════════════════════════════════════════════════════════════════════════════
+# KONFIGURASI ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class EngineConfig:
+    """
+    Pengaturan eksekusi. Bisa diubah dari REPL dengan perintah `set`.
+    
+    Attributes:
+        parallel_workers: Jumlah proses worker untuk scan paralel (<= 1 = nonaktif)
+        parallel_min_bytes: Ukuran file minimum agar scan dijalankan paralel
+        parallel_chunk_bytes: Ukuran kira-kira satu potongan (byte range) per task
+        use_mmap: Baca tabel lewat scanner mmap (lihat scanner.py) jika dialect didukung
+        columnar_cache: Simpan & baca sidecar kolom biner (lihat colcache.py). Opt-in.
+        zone_maps: Lewati blok yang pasti tidak cocok dengan WHERE berdasarkan
+                   statistik min/max per blok (lihat zonemap.py). Opt-in.
+        result_cache_bytes: Anggaran memori cache hasil query (0 = nonaktif)
+        batch_rows: Jumlah baris per batch untuk eksekusi batch/vektor
+                    (lihat operators.BatchOperator). 0 = baris per baris.
+        batch_backend: Backend kernel filter mode batch: "python", "numpy",
+                       atau "auto" (NumPy jika terpasang, lihat vectorized.py)
+        sort_memory_bytes: Anggaran memori ORDER BY; run yang melebihinya
+                           ditulis ke file sementara (lihat sorting.py).
+                           0 = selalu di memori.
+        sort_temp_dir: Direktori file sementara ORDER BY ("" = direktori
+                       sementara sistem)
+        join_memory_bytes: Anggaran memori hash table JOIN; jika terlampaui,
+                           kedua tabel dipartisi ke file sementara (grace
+                           hash join, lihat join.py). 0 = selalu di memori.
+        join_temp_dir: Direktori file partisi JOIN ("" = direktori
+                       sementara sistem)
+        join_method: Algoritma JOIN: "auto" (merge join jika sampel kedua
+                     tabel terurut menurut kunci, selain itu hash join),
+                     "merge" (kedua tabel dinyatakan terurut), atau "hash".
+                     Urutan tetap diverifikasi; jika ternyata tidak terurut,
+                     merge join beralih ke hash join (lihat join.py).
+    """
+    parallel_workers: int = os.cpu_count() or 1
+    parallel_min_bytes: int = 64 * 1024 * 1024
+    parallel_chunk_bytes: int = 16 * 1024 * 1024
+    use_mmap: bool = True
+    columnar_cache: bool = False
+    zone_maps: bool = False
+    result_cache_bytes: int = 64 * 1024 * 1024
+    batch_rows: int = 0
+    batch_backend: str = "auto"
+    sort_memory_bytes: int = 64 * 1024 * 1024
+    sort_temp_dir: str = ""
+    join_memory_bytes: int = 64 * 1024 * 1024
+    join_temp_dir: str = ""
+    join_method: str = "auto"
+
+
+# Konfigurasi aktif (dipakai oleh semua query)
+config = EngineConfig()
+
+# Cache hasil query, kunci: bentuk kanonik query + fingerprint file (lihat cache.py)
+result_cache = LRUCache(config.result_cache_bytes)
+
+# Di atas rasio record ber-quote ini, scanner mmap kalah cepat dari csv.reader
+MMAP_MAX_QUOTED_RATIO = 0.25
+
+# Di atas proporsi baris kandidat ini, lookup index kalah cepat dari scan berurutan
+INDEX_MAX_SELECTIVITY = 0.2
+
+
+
+def execute_query(query, compiled: bool = True,
+                  schema: Optional[Dict[str, str]] = None,
+                  plan: Optional[QueryPlan] = None) -> Tuple[List[str], List[List[str]]]:  # query: SelectStatement
     """
     Eksekusi query dan kembalikan hasil.
     
+    Seluruh hasil dikumpulkan di memori. Untuk hasil besar, gunakan
+    execute_query_iter() supaya baris diproses satu per satu.
+    
     Args:
-        query: Statement AST dari parser
+        query: SelectStatement dari parser (CREATE INDEX dijalankan lewat
+               create_index())
+        compiled: Jika True (default), WHERE clause dikompilasi sekali menjadi
+                  closure (lihat predicate.py). Jika False, pakai eval_expr
+                  sebagai reference path.
+        schema: Tipe kolom hasil semantic.analyze (SemanticResult.schema).
+                Jika diberikan, kolom numerik dibandingkan dengan komparator
+                bertipe tanpa try/except per baris.
+        plan: Query Plan yang dijalankan (default: ast_to_ir(query)).
+              Plan hasil rewrite harus setara dengan query.
         
     Returns:
         Tuple berisi (headers, rows)
@@ -68,48 +172,625 @@ def execute_query(query) -> Tuple[List[str], List[List[str]]]:  # query: Stateme
         - rows: List baris data (setiap baris adalah list string)
         
     Raises:
-        Exception: Jika ada error saat eksekusi (file tidak ada, dll)
+        Exception: Jika query bukan SELECT, atau ada error saat eksekusi
+                   (file tidak ada, dll)
+    """
+    stream = execute_query_iter(query, compiled, schema, plan)
+    headers = next(stream)
+    return (headers, list(stream))
+
+
+def execute_query_iter(query, compiled: bool = True,
+                       schema: Optional[Dict[str, str]] = None,
+                       plan: Optional[QueryPlan] = None) -> Iterator:  # query: SelectStatement
+    """
+    Eksekusi query secara streaming (generator).
+    
+    Item pertama yang di-yield adalah headers (list nama kolom), lalu setiap
+    baris hasil di-yield satu per satu selama file masih terbuka. Memori tetap
+    datar berapapun jumlah baris hasil. File ditutup saat generator habis
+    atau di-close().
+    
+    Hasil yang muat di anggaran config.result_cache_bytes disimpan di
+    result_cache; query yang sama (bentuk kanonik) terhadap file yang belum
+    berubah langsung dijawab dari memori.
+    
+    Contoh:
+        stream = execute_query_iter(ast)
+        headers = next(stream)
+        for row in stream:
+            ...
+    
+    Args:
+        query: SelectStatement dari parser (lihat execute_query())
+        compiled: Lihat execute_query()
+        schema: Lihat execute_query()
+        plan: Lihat execute_query()
+        
+    Yields:
+        headers (List[str]), lalu setiap baris (List[str])
+        
+    Raises:
+        Exception: Jika query bukan SELECT, atau ada error saat eksekusi
+                   (file tidak ada, dll)
+    """
+    # CREATE INDEX tidak menghasilkan tabel (lihat create_index())
+    if isinstance(query, CreateIndexStatement):
+        raise Exception("CREATE INDEX tidak menghasilkan tabel; jalankan lewat engine.create_index()")
+    
+    # Cache hasil: query yang sama terhadap file yang tidak berubah tidak di-scan ulang
+    key = result_key(query) if compiled and config.result_cache_bytes > 0 else None
+    if key is None:
+        yield from run_query(query, compiled, schema, plan)
+        return
+    
+    result_cache.resize(config.result_cache_bytes)
+    cached = result_cache.get(key)
+    if cached is not None:
+        headers, rows = cached
+        yield list(headers)
+        for row in rows:
+            yield list(row)
+        return
+    
+    # Miss: teruskan baris sambil mengumpulkannya, selama masih muat di anggaran.
+    # Hasil hanya disimpan jika stream dibaca sampai habis.
+    stream = run_query(query, compiled, schema, plan)
+    headers = next(stream)
+    yield headers
+    
+    collected: Optional[List[tuple]] = []
+    size = 0
+    try:
+        for row in stream:
+            yield row
+            if collected is not None:
+                collected.append(tuple(row))
+                size += row_size(row)
+                if size > result_cache.capacity:
+                    collected = None
+    finally:
+        stream.close()
+    if collected is not None:
+        result_cache.put(key, (tuple(headers), collected), size)
+
+
+def run_query(query, compiled: bool = True,
+              schema: Optional[Dict[str, str]] = None,
+              plan: Optional[QueryPlan] = None) -> Iterator:  # query: Statement
+    """
+    Eksekusi query tanpa cache hasil (lihat execute_query_iter).
+    
+    Yang dijalankan adalah Query Plan (default: ast_to_ir(query) yang
+    dioptimasi dengan optimizer.optimize). Langkah
+    SCAN menjadi jalur akses tabel: cache kolom, index, zone map, paralel,
+    mmap, atau csv.reader biasa. Langkah sesudahnya menjadi operator fisik
+    (lihat build_pipeline). Header, dialect, dan schema diambil dari katalog
+    tabel (lihat catalog.py) yang juga dipakai semantic analysis. Jika
+    FILTER sudah pasti False, file tidak dibaca sama sekali (agregat tanpa
+    GROUP BY tetap menghasilkan satu baris, mis. COUNT(*) = 0). Plan dengan
+    JOIN dijalankan oleh run_join.
+    
+    Yields:
+        headers (List[str]), lalu setiap baris (List[str])
     """
+    generated = plan is None
+    if generated:
+        plan = ast_to_ir(query)
+    path = plan_table(plan)
+    
+    if step_position(plan, JoinStep) is not None:
+        if generated and compiled:
+            plan = optimize(plan)
+        yield from run_join(plan, compiled, schema)
+        return
     
-    # TODO: Implementasi
-    #
-    # 1. Buka file CSV
-    with open(query.table, 'r', newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    info = table_info(path)
+    if schema is None and compiled and info is not None:
+        schema = info.schema
+    if generated and compiled:
+        plan = optimize(plan, info)
+    where = scan_filter(plan)
+    
+    # FILTER tidak mungkin terpenuhi (lihat optimizer.simplify): tanpa scan
+    if isinstance(where, BoolLiteral) and not where.value and info is not None:
+        pipeline = build_pipeline(plan, Scan(info.header, ()), compiled, schema)
+        yield pipeline.columns
+        yield from pipeline
+        return
+    
+    # Cache kolom: baca hanya kolom yang direferensikan dari sidecar
+    if compiled and config.columnar_cache:
+        table = ColumnarTable.open_or_build(path)
+        if table is not None:
+            with table:
+                yield from scan_table(plan, table, schema)
+            return
+    
+    # Index: FILTER berisi kolom = "nilai" (hash) atau rentang numerik (sorted)
+    # pada kolom ber-index, baca langsung record kandidat (lihat index.py)
+    if compiled and where is not None:
+        candidates = usable_indexes(path, where)
+        table = table_catalog.open_table(path) if candidates else None
+        if table is not None:
+            with table:
+                offsets = lookup_index(table, candidates)
+                if offsets is not None:
+                    yield from scan_table(plan, table, schema,
+                                          lambda indexes: table.scan_offsets(indexes, offsets))
+                    return
+    
+    # Zone map: lewati blok yang pasti tidak cocok tanpa mem-parse isinya
+    if compiled and config.zone_maps and where is not None:
+        table = table_catalog.open_table(path)
+        if table is not None:
+            with table:
+                ranges = prune_blocks(table, where)
+                if ranges is not None:
+                    yield from scan_table(plan, table, schema, lambda indexes: chain.from_iterable(
+                        table.scan(indexes, start, end) for start, end in ranges))
+                    return
+    
+    # Mode paralel untuk file besar (lihat parallel.py)
+    if compiled and use_parallel(path, info.dialect if info is not None else csv.excel):
+        yield from parallel_scan(plan, config.parallel_workers, config.parallel_chunk_bytes,
+                                 config.use_mmap, schema, config.sort_memory_bytes,
+                                 config.sort_temp_dir)
+        return
+    
+    # Scanner mmap: hanya kolom yang direferensikan yang di-decode
+    if compiled and config.use_mmap:
+        table = open_mmap_table(path, info)
+        if table is not None:
+            with table:
+                yield from scan_table(plan, table, schema)
+            return
+    
+    # csv.reader: baris dibaca posisional (tanpa membangun dict per baris)
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f, info.dialect if info is not None else csv.excel)
+        header = next(reader, [])
+        source = Scan(header, normalize_rows(reader, len(header)))
+        pipeline = build_pipeline(plan, source, compiled, schema)
         
-        # 2. Dapatkan header
-        all_headers = list(reader.fieldnames) if reader.fieldnames else []
+        yield pipeline.columns
+        yield from pipeline
+
+
+def run_join(plan: QueryPlan, compiled: bool = True,
+             schema: Optional[Dict[str, str]] = None) -> Iterator:
+    """
+    Eksekusi plan dengan langkah JOIN (lihat run_query).
+    
+    Kedua tabel di-scan berurutan (mmap atau csv.reader) dan hanya kolom
+    yang dibutuhkan plan yang dibaca. Jika kedua tabel terurut menurut kunci
+    (lihat EngineConfig.join_method), keduanya di-stream bersamaan dengan
+    merge join. Selain itu hash table dibangun dari sisi yang perkiraan
+    ukurannya lebih kecil (ukuran file x proporsi kolom yang dibaca); sisi
+    lain di-stream. Langkah sesudah JOIN berjalan di atas baris hasil join
+    seperti query satu tabel.
+    
+    Yields:
+        headers (List[str]), lalu setiap baris (List[str])
         
-        # 3. Tentukan output headers
-        if query.columns == ["*"]:
-            output_headers = all_headers
+    Raises:
+        Exception: Jika file tidak bisa dibaca, kolom tidak ditemukan, atau
+                   join_method tidak dikenal
+    """
+    method = config.join_method
+    if method not in JOIN_METHODS:
+        raise Exception(f"Metode join '{method}' tidak dikenal (auto, hash, merge)")
+    
+    position = step_position(plan, JoinStep)
+    step = plan.steps[position]
+    paths = [plan_table(plan), step.table]
+    infos = [table_catalog.lookup(path) for path in paths]
+    headers = [qualified_header(path, info.header) for path, info in zip(paths, infos)]
+    if schema is None and compiled:
+        schema = {**qualified_schema(paths[0], infos[0].schema),
+                  **qualified_schema(paths[1], infos[1].schema)}
+    rest = QueryPlan(steps=[plan.steps[0]] + plan.steps[position + 1:])
+    
+    # Kolom yang dibaca per tabel: kolom plan sesudah JOIN + kolom kunci
+    keys = [headers[0].index(step.left_key), headers[1].index(step.right_key)]
+    width = len(headers[0])
+    needed = set(referenced_indexes(rest, headers[0] + headers[1]))
+    needed.update((keys[0], width + keys[1]))
+    indexes = [sorted(i for i in needed if i < width),
+               sorted(i - width for i in needed if i >= width)]
+    
+    merge = method == JOIN_MERGE or (method == JOIN_AUTO and all(
+        is_sorted_on(info.sample, key) for info, key in zip(infos, keys)))
+    sizes = [os.path.getsize(path) * len(idx) / max(len(info.header), 1)
+             for path, info, idx in zip(paths, infos, indexes)]
+    
+    with ExitStack() as stack:
+        left, right = (join_input(path, info, idx, header, compiled, stack)
+                       for path, info, idx, header in zip(paths, infos, indexes, headers))
+        kind = MergeJoin if merge else HashJoin
+        op = kind(left, right, step.left_key, step.right_key, sizes[0] < sizes[1],
+                  config.join_memory_bytes, config.join_temp_dir)
+        pipeline = build_pipeline(rest, op, compiled, schema)
+        
+        yield pipeline.columns
+        yield from pipeline
+
+
+def join_input(path: str, info: TableInfo, indexes: List[int], names: List[str],
+               compiled: bool, stack: ExitStack) -> Scan:
+    """
+    Scan satu tabel JOIN: hanya kolom pada indexes, lewat scanner mmap jika
+    menguntungkan, selain itu csv.reader. Baris scan bisa diiterasi ulang
+    (lihat operators.Rescan).
+    
+    Args:
+        path: Path file CSV
+        info: Metadata tabel dari katalog
+        indexes: Index kolom (di header) yang dibaca, terurut
+        names: Nama kolom keluaran untuk setiap kolom header
+        compiled: Lihat execute_query() (False = selalu csv.reader)
+        stack: Tempat mendaftarkan tabel mmap yang dibuka (ditutup pemanggil)
+        
+    Returns:
+        Operator Scan
+    """
+    columns = [names[i] for i in indexes]
+    table = open_mmap_table(path, info) if compiled and config.use_mmap else None
+    if table is not None:
+        stack.enter_context(table)
+        return Scan(columns, Rescan(lambda: table.scan(indexes)))
+    return Scan(columns, Rescan(lambda: read_columns(path, info.dialect, indexes)))
+
+
+def read_columns(path: str, dialect, indexes: List[int]) -> Iterator[List[str]]:
+    """
+    Baca file CSV dengan csv.reader dan ambil hanya kolom pada indexes.
+    File ditutup saat generator habis atau di-close().
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f, dialect)
+        header = next(reader, [])
+        project = build_projection([header[i] for i in indexes], build_layout(header))
+        yield from map(project, normalize_rows(reader, len(header)))
+
+
+def table_info(path: str) -> Optional[TableInfo]:
+    """
+    Metadata tabel dari katalog.
+    
+    Args:
+        path: Path file CSV
+        
+    Returns:
+        TableInfo, atau None jika file tidak bisa dibaca (error aslinya
+        muncul lagi saat file dibuka oleh csv.reader)
+    """
+    try:
+        return table_catalog.lookup(path)
+    except (OSError, ValueError, StopIteration, csv.Error):
+        return None
+
+
+def open_mmap_table(path: str, info: Optional[TableInfo]) -> Optional[MmapTable]:
+    """
+    Buka tabel dengan scanner mmap jika menguntungkan.
+    
+    Args:
+        path: Path file CSV
+        info: Metadata tabel dari katalog (None jika tidak tersedia)
+        
+    Returns:
+        MmapTable, atau None jika dialect tidak didukung atau sebagian besar
+        record mengandung tanda kutip (lebih cepat lewat csv.reader)
+    """
+    if info is None or info.quoted_ratio is None or info.quoted_ratio > MMAP_MAX_QUOTED_RATIO:
+        return None
+    return table_catalog.open_table(path)
+
+
+def lookup_index(table: MmapTable, candidates: List[Tuple[str, str, object]]) -> Optional[List[int]]:
+    """
+    Cari offset record lewat index. Jika beberapa index bisa dipakai,
+    dipilih yang menghasilkan kandidat paling sedikit.
+    
+    Args:
+        table: Tabel CSV yang sudah dibuka dengan mmap
+        candidates: (jenis, kolom, key) dari index.usable_indexes()
+        
+    Returns:
+        List offset record kandidat, atau None jika tidak ada index yang valid
+        atau selektivitasnya terlalu rendah (scan biasa lebih cepat)
+    """
+    best = None
+    rows = 0
+    for kind, column, key in candidates:
+        opened = open_index(table, column, kind)
+        if opened is None:
+            continue
+        with opened:
+            count = opened.count(key)
+            rows = opened.rows
+        if best is None or count < best[0]:
+            best = (count, kind, column, key)
+    
+    if best is None or best[0] > rows * INDEX_MAX_SELECTIVITY:
+        return None
+    _, kind, column, key = best
+    with open_index(table, column, kind) as opened:
+        return opened.lookup(key)
+
+
+def create_index(statement) -> Tuple[int, int]:  # statement: CreateIndexStatement
+    """
+    Eksekusi CREATE INDEX: bangun index (hash atau sorted) untuk satu kolom.
+    
+    Args:
+        statement: CreateIndexStatement dari parser
+        
+    Returns:
+        Tuple (jumlah baris, jumlah nilai unik)
+        
+    Raises:
+        Exception: Jika file tidak bisa dibaca dengan mmap atau kolom tidak ada
+    """
+    table = table_catalog.open_table(statement.table)
+    if table is None:
+        raise Exception(f"File '{statement.table}' kosong atau formatnya tidak didukung untuk index")
+    with table:
+        meta = build_index(table, statement.column, statement.kind)
+    return (meta["rows"], meta["keys"])
+
+
+def prune_blocks(table: MmapTable, where_clause: Expr) -> Optional[List[Tuple[int, int]]]:
+    """
+    Pilih byte range yang perlu di-scan berdasarkan zone map.
+    
+    Args:
+        table: Tabel CSV yang sudah dibuka dengan mmap
+        where_clause: WHERE clause query
+        
+    Returns:
+        List (start, end) blok yang mungkin cocok, atau None jika zone map
+        tidak tersedia atau tidak ada blok yang bisa dilewati
+    """
+    zones = ZoneMap.open_or_build(table)
+    if zones is None:
+        return None
+    ranges = zones.candidate_ranges(where_clause)
+    if ranges == zones.candidate_ranges(None):
+        return None
+    return ranges
+
+
+def scan_table(plan: QueryPlan, table, schema: Optional[Dict[str, str]] = None,
+               scan: Optional[Callable[[List[int]], Iterable[List[str]]]] = None) -> Iterator:
+    """
+    Jalankan plan di atas tabel yang hanya men-decode kolom yang dibutuhkan
+    (MmapTable atau ColumnarTable).
+    
+    Args:
+        plan: Query Plan
+        table: Tabel dengan atribut header dan method scan(indexes, ...)
+        schema: Tipe kolom (lihat execute_query)
+        scan: Fungsi indexes -> baris hasil scan, untuk membaca sebagian tabel
+              (byte range, hasil zone map, offset dari index).
+              Default: table.scan (seluruh tabel).
+        
+    Yields:
+        headers, lalu setiap baris hasil
+    """
+    pipeline = table_pipeline(plan, table, schema, scan)
+    
+    yield pipeline.columns
+    yield from pipeline
+
+
+def table_pipeline(plan: QueryPlan, table, schema: Optional[Dict[str, str]] = None,
+                   scan: Optional[Callable[[List[int]], Iterable[List[str]]]] = None) -> Operator:
+    """
+    Bangun pipeline operator di atas tabel (lihat scan_table), tanpa
+    menjalankannya.
+    
+    Returns:
+        Operator teratas
+    """
+    indexes = referenced_indexes(plan, table.header)
+    columns = [table.header[i] for i in indexes]
+    if config.batch_rows > 0 and scan is None and indexes and hasattr(table, "scan_columns"):
+        # Cache kolom: row group langsung menjadi batch, tanpa merakit baris
+        # (tanpa kolom, mis. COUNT(*), jumlah baris hanya ada di scan biasa)
+        source = BatchScan(columns, None, config.batch_rows, table.scan_columns(indexes))
+    else:
+        source = Scan(columns, (scan or table.scan)(indexes))
+    return build_pipeline(plan, source, schema=schema)
+
+
+def referenced_indexes(plan: QueryPlan, all_headers: List[str]) -> List[int]:
+    """
+    Index kolom (di header) yang dibutuhkan plan: kolom FILTER, SORT, dan
+    PROJECT, atau kolom AGGREGATE (langkah sesudahnya membaca hasil agregasi).
+    
+    Args:
+        plan: Query Plan
+        all_headers: Baris header CSV
+        
+    Returns:
+        List index terurut. PROJECT * membutuhkan semua kolom.
+        
+    Raises:
+        Exception: Jika kolom tidak ada di header
+    """
+    names: List[str] = []
+    for step in plan.steps:
+        if isinstance(step, FilterStep):
+            names.extend(expr_columns(step.condition))
+        elif isinstance(step, AggregateStep):
+            names.extend(step.group_by)
+            names.extend(a.column for a in step.aggregates if a.column != "*")
+            break
+        elif isinstance(step, SortStep):
+            names.extend(item.column for item in step.keys)
+        elif isinstance(step, ProjectStep):
+            if step.columns == ["*"]:
+                return list(range(len(all_headers)))
+            names.extend(step.columns)
+    
+    layout = build_layout(all_headers)
+    indexes = set()
+    for col in names:
+        if col not in layout:
+            raise Exception(f"Kolom '{col}' tidak ditemukan")
+        indexes.add(layout[col])
+    return sorted(indexes)
+
+
+def build_pipeline(plan: QueryPlan, source: Operator, compiled: bool = True,
+                   schema: Optional[Dict[str, str]] = None) -> Operator:
+    """
+    Bangun rangkaian operator fisik untuk langkah plan sesudah SCAN.
+    
+    Jika config.batch_rows > 0 (dan compiled), operator yang dibangun adalah
+    versi batch (lihat operators.BatchOperator); baris tetap keluar satu per
+    satu dari operator teratas.
+    
+    Args:
+        plan: Query Plan
+        source: Operator Scan (atau BatchScan) untuk langkah SCAN
+        compiled: Lihat execute_query()
+        schema: Tipe kolom (lihat execute_query)
+        
+    Returns:
+        Operator teratas; iterasi operator ini menjalankan seluruh plan
+        
+    Raises:
+        Exception: Jika plan berisi langkah yang tidak bisa dijalankan
+    """
+    if compiled and (config.batch_rows > 0 or isinstance(source, BatchScan)):
+        return build_batch_pipeline(plan, source, schema)
+    return build_operators(source, plan.steps[1:], compiled, schema)
+
+
+def build_operators(op: Operator, steps: List[PlanStep], compiled: bool = True,
+                    schema: Optional[Dict[str, str]] = None) -> Operator:
+    """
+    Rangkai operator baris untuk langkah plan di atas operator op.
+    
+    Args:
+        op: Operator sumber (hasil langkah sebelumnya)
+        steps: Langkah plan yang dijalankan
+        compiled: Lihat execute_query()
+        schema: Tipe kolom (lihat execute_query)
+        
+    Returns:
+        Operator teratas
+        
+    Raises:
+        Exception: Jika plan berisi langkah yang tidak bisa dijalankan
+    """
+    for i, step in enumerate(steps):
+        if isinstance(step, FilterStep):
+            predicate, fallback, chains = build_predicate(step.condition, op.columns, compiled, schema)
+            op = Filter(op, predicate, fallback, chains)
+        elif isinstance(step, AggregateStep):
+            op = HashAggregate(op, step.group_by, step.aggregates)
+        elif isinstance(step, SortStep):
+            # LIMIT sesudahnya: Sort cukup menyimpan K baris teratas
+            op = Sort(op, step.keys, limit_after(steps[i + 1:]), schema,
+                      config.sort_memory_bytes, config.sort_temp_dir)
+        elif isinstance(step, ProjectStep):
+            op = Project(op, step.columns)
+        elif isinstance(step, LimitStep):
+            op = Limit(op, step.count)
         else:
-            output_headers = query.columns
+            raise Exception(f"Langkah plan tidak bisa dieksekusi: {type(step).__name__}")
+    return op
+
+
+def build_batch_pipeline(plan: QueryPlan, source: Operator,
+                         schema: Optional[Dict[str, str]] = None) -> Operator:
+    """
+    Versi batch dari build_pipeline: FILTER menjadi kernel (lihat vectorized.py).
+    AGGREGATE membaca kolom langsung dari batch. Mulai dari AGGREGATE atau
+    SORT, langkah selanjutnya memakai operator baris biasa (lihat
+    build_operators).
+    
+    Args:
+        plan: Query Plan
+        source: Operator Scan (dipotong per config.batch_rows) atau BatchScan
+        schema: Tipe kolom (lihat execute_query)
         
-        # 4. Proses setiap baris
-        results = []
-        count = 0
+    Returns:
+        Operator batch teratas
         
-        for row in reader:
-            # 5. Evaluasi WHERE clause
-            if query.where_clause:
-                if not eval_expr(query.where_clause, row):
-                    continue
-            
-            # 6. Ambil kolom yang diminta
-            if query.columns == ["*"]:
-                row_data = [row[col] for col in all_headers]
-            else:
-                row_data = [row.get(col, "") for col in query.columns]
-            
-            results.append(row_data)
-            
-            # 7. Cek LIMIT
-            count += 1
-            if query.limit and count >= query.limit:
-                break
+    Raises:
+        Exception: Jika plan berisi langkah yang tidak bisa dijalankan
+    """
+    op = source
+    if not isinstance(op, BatchScan):
+        op = BatchScan(source.columns, source, config.batch_rows)
+    for i, step in enumerate(plan.steps[1:], 1):
+        if isinstance(step, FilterStep):
+            layout = build_layout(op.columns)
+            backend = config.batch_backend
+            kernel = compile_kernel(step.condition, layout, schema, backend)
+            fallback = compile_kernel(step.condition, layout, backend=backend) if schema else None
+            op = BatchFilter(op, kernel, fallback)
+        elif isinstance(step, (AggregateStep, SortStep)):
+            return build_operators(op, plan.steps[i:], schema=schema)
+        elif isinstance(step, ProjectStep):
+            op = BatchProject(op, step.columns)
+        elif isinstance(step, LimitStep):
+            op = BatchLimit(op, step.count)
+        else:
+            raise Exception(f"Langkah plan tidak bisa dieksekusi: {type(step).__name__}")
+    return op
+
+
+def build_predicate(condition: Expr, columns: List[str], compiled: bool = True,
+                    schema: Optional[Dict[str, str]] = None) -> Tuple[Callable, Optional[Callable], list]:
+    """
+    Siapkan predicate untuk operator Filter (dibangun sekali sebelum scan).
+    
+    Args:
+        condition: Expression FILTER
+        columns: Nama kolom untuk setiap posisi di baris input
+        compiled: Lihat execute_query()
+        schema: Tipe kolom (lihat execute_query)
         
-        return (output_headers, results)
+    Returns:
+        Tuple (predicate, fallback, chains). fallback adalah predicate tanpa
+        asumsi tipe untuk baris yang membuat predicate bertipe gagal konversi
+        (None jika tidak perlu). chains adalah rantai AND/OR adaptif di dalam
+        predicate (lihat predicate.AdaptiveChain).
+    """
+    if not compiled:
+        return (lambda row: eval_expr(condition, dict(zip(columns, row))), None, [])
+    
+    layout = build_layout(columns)
+    predicate, chains = compile_adaptive_predicate(condition, layout, schema)
+    fallback = compile_predicate(condition, layout) if schema else None
+    return (predicate, fallback, chains)
+
+
+def use_parallel(table: str, dialect=csv.excel) -> bool:
+    """
+    Tentukan apakah scan dijalankan paralel untuk file ini.
+    
+    Args:
+        table: Path file CSV
+        dialect: Dialect CSV file
+        
+    Returns:
+        True jika worker > 1, ukuran file melewati threshold, dan batas
+        record bisa dicari di level byte (dialect standar, newline LF/CRLF)
+    """
+    if config.parallel_workers <= 1:
+        return False
+    try:
+        return (os.path.getsize(table) >= config.parallel_min_bytes
+                and supports_file(table, dialect))
+    except OSError:
+        return False
 
 
 def eval_expr(expr: Expr, row: Dict[str, str]) -> bool:
@@ -124,6 +805,20 @@ def eval_expr(expr: Expr, row: Dict[str, str]) -> bool:
         True jika baris memenuhi kondisi, False jika tidak
     """
     
+    if isinstance(expr, BoolLiteral):
+        return expr.value
+    
+    if isinstance(expr, InList):
+        # Setara rantai OR dari perbandingan = (NOT IN: negasinya)
+        found = any(eval_expr(BinaryOp(left=expr.expr, op=Op.EQUAL, right=value), row)
+                    for value in expr.values)
+        return found != expr.negated
+    
+    if isinstance(expr, Between):
+        # Satu kali ambil & konversi nilai, lalu dua perbandingan
+        value = get_value(expr.expr, row)
+        return get_value(expr.low, row) <= value <= get_value(expr.high, row)
+    
     if isinstance(expr, BinaryOp):
         # LOGIKA (AND / OR)
         if expr.op == Op.AND:
@@ -0,0 +1,46 @@
+"""
+fingerprint.py - Sidik Jari File CSV untuk CSV_QL
+
+Modul ini menyediakan identitas ringan sebuah file CSV (ukuran, waktu
+modifikasi, inode) dan hash header. Semua artefak yang disimpan di samping
+file CSV (cache kolom, index, dll) memakai fingerprint ini untuk memastikan
+artefak masih sesuai dengan isi file.
+"""
+
+import hashlib
+import os
+from typing import List, Tuple
+
+
+# Fingerprint file: (ukuran byte, mtime dalam nanodetik, inode)
+Fingerprint = Tuple[int, int, int]
+
+
+def file_fingerprint(path: str) -> Fingerprint:
+    """
+    Ambil fingerprint file dari os.stat (tanpa membaca isi file).
+
+    Args:
+        path: Path file
+
+    Returns:
+        Tuple (size, mtime_ns, inode)
+
+    Raises:
+        OSError: Jika file tidak bisa di-stat
+    """
+    st = os.stat(path)
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def header_hash(header: List[str]) -> str:
+    """
+    Hash stabil untuk baris header CSV.
+
+    Args:
+        header: List nama kolom
+
+    Returns:
+        String hex SHA-1
+    """
+    return hashlib.sha1("\x1f".join(header).encode('utf-8')).hexdigest()
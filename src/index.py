@@ -0,0 +1,607 @@
+"""
+index.py - Index Sekunder On-Disk untuk CSV_QL
+
+Modul ini membangun index untuk satu kolom file CSV lewat perintah
+`CREATE INDEX ON data.csv (kolom) [USING HASH | SORTED]` dan memakainya saat
+WHERE clause (sendirian atau sebagai operand AND) bisa dijawab oleh index:
+
+    - Hash index   : kesetaraan string, kolom = "nilai"
+    - Sorted index : perbandingan numerik, kolom >, <, >=, <=, = angka
+
+Kedua index memetakan nilai kolom ke offset byte awal setiap record, lalu
+record diambil langsung dari offset-nya lewat mmap tanpa men-scan file.
+
+Hash index menyimpan nilai string persis seperti di CSV. Saat query, hanya
+bucket untuk nilai yang dicari yang dibaca dari disk.
+
+Format file hash (data.csv -> data.csv.<kolom>.cqlh):
+    MAGIC
+    entri per bucket: [panjang key (u32), key UTF-8, jumlah offset (u32), offset (i64)...]
+    direktori bucket: offset awal setiap bucket + offset akhir (i64)
+    metadata (JSON)
+    panjang metadata (8 byte, little-endian)
+    MAGIC
+
+Sorted index menyimpan pasangan (nilai, offset) terurut berdasarkan nilai
+numerik (semantik engine.get_value: nilai non-numerik = 0.0; NaN tidak
+disimpan karena tidak pernah lolos perbandingan). Rentang dicari dengan
+bisect langsung di atas mmap, jadi jumlah baris kandidat diketahui persis
+sebelum satu record pun dibaca.
+
+Format file sorted (data.csv -> data.csv.<kolom>.cqls):
+    SORTED_MAGIC (8 byte, supaya array sejajar 8 byte)
+    nilai terurut (f64) x n
+    offset record (i64) x n
+    metadata (JSON)
+    panjang metadata (8 byte, little-endian)
+    SORTED_MAGIC
+
+Metadata menyimpan fingerprint file CSV; index yang basi (file berubah)
+tidak dipakai sampai CREATE INDEX dijalankan lagi.
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import tee
+from typing import Any, Dict, List, Optional, Tuple, Union
+from ast_nodes import Expr, Op, BinaryOp, Identifier, Number, StringLiteral, Literal, Between
+from fingerprint import file_fingerprint, header_hash
+from predicate import EPSILON, flatten_chain, _FLIPPED_OPS
+from scanner import MmapTable
+
+
+# Jenis index
+HASH = "hash"
+SORTED = "sorted"
+
+# Penanda awal dan akhir file index
+MAGIC = b"CQLI\x01"
+SORTED_MAGIC = b"CQLS\x01\x00\x00\x00"
+
+# Ekstensi file index per jenis
+SUFFIXES = {HASH: ".cqlh", SORTED: ".cqls"}
+
+# Target rata-rata jumlah key per bucket
+KEYS_PER_BUCKET = 4
+
+
+def index_path(path: str, column: str, kind: str = HASH) -> str:
+    """Path file index (jenis kind) untuk kolom pada file CSV."""
+    return f"{path}.{column}{SUFFIXES[kind]}"
+
+
+def column_index(header: List[str], column: str) -> int:
+    """
+    Posisi kolom di header (nama ganda: yang terakhir, seperti operators.build_layout).
+
+    Raises:
+        Exception: Jika kolom tidak ada di header
+    """
+    layout = {name: i for i, name in enumerate(header)}
+    if column not in layout:
+        raise Exception(f"Kolom '{column}' tidak ditemukan")
+    return layout[column]
+
+
+def equality_terms(expr: Optional[Expr]) -> List[Tuple[str, str]]:
+    """
+    Ambil kesetaraan string "kolom = nilai" yang WAJIB terpenuhi oleh expr.
+
+    Hanya expr itu sendiri atau operand dari rantai AND yang dipertimbangkan;
+    operand di dalam OR tidak wajib terpenuhi sehingga tidak bisa dipakai.
+
+    Args:
+        expr: WHERE clause
+
+    Returns:
+        List (nama kolom, nilai string)
+    """
+    if expr is None:
+        return []
+    terms = []
+    for term in flatten_chain(expr, Op.AND):
+        if not isinstance(term, BinaryOp) or term.op != Op.EQUAL:
+            continue
+        left, right = term.left, term.right
+        if isinstance(right, Identifier):
+            left, right = right, left
+        if isinstance(left, Identifier) and isinstance(right, (StringLiteral, Literal)):
+            terms.append((left.name, right.value))
+    return terms
+
+
+@dataclass
+class Interval:
+    """
+    Rentang nilai numerik yang wajib dipenuhi sebuah kolom.
+
+    Attributes:
+        low, high: Batas bawah dan atas
+        low_inclusive, high_inclusive: Apakah batas termasuk dalam rentang
+    """
+    low: float = -math.inf
+    high: float = math.inf
+    low_inclusive: bool = True
+    high_inclusive: bool = True
+
+    def restrict(self, op: Op, const: float) -> None:
+        """Persempit rentang dengan "kolom op konstanta"."""
+        if op == Op.EQUAL:
+            # |v - c| < EPSILON, diperlebar sedikit (record tetap dicek predicate)
+            self.restrict(Op.GREATER_THAN_OR_EQ, const - EPSILON)
+            self.restrict(Op.LESS_THAN_OR_EQ, const + EPSILON)
+        elif op in (Op.GREATER_THAN, Op.GREATER_THAN_OR_EQ):
+            inclusive = op == Op.GREATER_THAN_OR_EQ
+            if const > self.low or (const == self.low and not inclusive):
+                self.low, self.low_inclusive = const, inclusive
+        elif op in (Op.LESS_THAN, Op.LESS_THAN_OR_EQ):
+            inclusive = op == Op.LESS_THAN_OR_EQ
+            if const < self.high or (const == self.high and not inclusive):
+                self.high, self.high_inclusive = const, inclusive
+
+
+def range_terms(expr: Optional[Expr]) -> Dict[str, Interval]:
+    """
+    Ambil perbandingan numerik "kolom op angka" yang WAJIB terpenuhi oleh expr,
+    digabung menjadi satu Interval per kolom.
+
+    Sama seperti equality_terms(), hanya operand rantai AND yang dipakai.
+    "kolom BETWEEN a AND b" dipakai langsung sebagai satu rentang; != tidak
+    membentuk rentang sehingga diabaikan.
+
+    Args:
+        expr: WHERE clause
+
+    Returns:
+        Mapping nama kolom -> Interval
+    """
+    if expr is None:
+        return {}
+    intervals: Dict[str, Interval] = {}
+    for term in flatten_chain(expr, Op.AND):
+        if isinstance(term, Between):
+            if isinstance(term.expr, Identifier) and isinstance(term.low, Number) \
+                    and isinstance(term.high, Number):
+                interval = intervals.setdefault(term.expr.name, Interval())
+                interval.restrict(Op.GREATER_THAN_OR_EQ, term.low.value)
+                interval.restrict(Op.LESS_THAN_OR_EQ, term.high.value)
+            continue
+        if not isinstance(term, BinaryOp) or term.op not in _FLIPPED_OPS \
+                or term.op == Op.NOT_EQUAL:
+            continue
+        if isinstance(term.left, Identifier) and isinstance(term.right, Number):
+            name, op, const = term.left.name, term.op, term.right.value
+        elif isinstance(term.right, Identifier) and isinstance(term.left, Number):
+            name, op, const = term.right.name, _FLIPPED_OPS[term.op], term.left.value
+        else:
+            continue
+        intervals.setdefault(name, Interval()).restrict(op, const)
+    return intervals
+
+
+def usable_indexes(path: str, expr: Optional[Expr]) -> List[Tuple[str, str, Any]]:
+    """
+    Daftar index yang file-nya ada dan bisa membantu menjawab expr.
+
+    Args:
+        path: Path file CSV
+        expr: WHERE clause
+
+    Returns:
+        List (jenis, kolom, key): key berupa string untuk hash index
+        atau Interval untuk sorted index
+    """
+    candidates: List[Tuple[str, str, Any]] = []
+    for column, value in equality_terms(expr):
+        if os.path.exists(index_path(path, column, HASH)):
+            candidates.append((HASH, column, value))
+    for column, interval in range_terms(expr).items():
+        if os.path.exists(index_path(path, column, SORTED)):
+            candidates.append((SORTED, column, interval))
+    return candidates
+
+
+def open_index(table: MmapTable, column: str,
+               kind: str) -> Optional[Union['HashIndex', 'SortedIndex']]:
+    """Buka index jenis kind untuk kolom (None jika tidak ada / basi)."""
+    if kind == SORTED:
+        return SortedIndex.open(table, column)
+    return HashIndex.open(table, column)
+
+
+def _bucket(key: bytes, buckets: int) -> int:
+    """Nomor bucket untuk key."""
+    return zlib.crc32(key) % buckets
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build(table: MmapTable, column: str, kind: str = HASH) -> Dict:
+    """
+    Bangun (atau bangun ulang) index jenis kind untuk satu kolom.
+
+    Args:
+        table: Tabel CSV yang sudah dibuka dengan mmap
+        column: Nama kolom
+        kind: HASH atau SORTED
+
+    Returns:
+        Metadata index (dict yang sama dengan footer file)
+
+    Raises:
+        Exception: Jika kolom tidak ada di header
+    """
+    if kind == SORTED:
+        return build_sorted(table, column)
+    return build_hash(table, column)
+
+
+def build_hash(table: MmapTable, column: str) -> Dict:
+    """
+    Bangun (atau bangun ulang) hash index untuk satu kolom.
+
+    Args:
+        table: Tabel CSV yang sudah dibuka dengan mmap
+        column: Nama kolom
+
+    Returns:
+        Metadata index (dict yang sama dengan footer file)
+
+    Raises:
+        Exception: Jika kolom tidak ada di header
+    """
+    size, mtime_ns, _ = file_fingerprint(table.path)
+    position = column_index(table.header, column)
+
+    # 1. Kumpulkan offset setiap nilai (sesuai urutan file)
+    postings: Dict[str, array] = {}
+    rows = 0
+    for offset, value in _column_values(table, position):
+        offsets = postings.get(value)
+        if offsets is None:
+            offsets = postings[value] = array('q')
+        offsets.append(offset)
+        rows += 1
+
+    # 2. Kelompokkan key per bucket
+    buckets = 1
+    while buckets * KEYS_PER_BUCKET < len(postings):
+        buckets *= 2
+    grouped: List[List[Tuple[bytes, array]]] = [[] for _ in range(buckets)]
+    for value, offsets in postings.items():
+        key = value.encode('utf-8')
+        grouped[_bucket(key, buckets)].append((key, offsets))
+
+    # 3. Tulis file (lewat file sementara, seperti colcache.build)
+    target = index_path(table.path, column, HASH)
+    temp = target + ".tmp"
+    try:
+        with open(temp, 'wb') as out:
+            out.write(MAGIC)
+            directory = array('q')
+            for entries in grouped:
+                directory.append(out.tell())
+                for key, offsets in entries:
+                    out.write(struct.pack('<I', len(key)))
+                    out.write(key)
+                    out.write(struct.pack('<I', len(offsets)))
+                    out.write(offsets.tobytes())
+            directory.append(out.tell())
+
+            meta = {
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "header_hash": header_hash(table.header),
+                "column": column,
+                "rows": rows,
+                "keys": len(postings),
+                "buckets": buckets,
+                "directory": out.tell(),
+            }
+            out.write(directory.tobytes())
+            encoded = json.dumps(meta).encode('utf-8')
+            out.write(encoded)
+            out.write(struct.pack('<Q', len(encoded)))
+            out.write(MAGIC)
+        os.replace(temp, target)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    return meta
+
+
+def build_sorted(table: MmapTable, column: str) -> Dict:
+    """
+    Bangun (atau bangun ulang) sorted index untuk satu kolom.
+
+    Args:
+        table: Tabel CSV yang sudah dibuka dengan mmap
+        column: Nama kolom
+
+    Returns:
+        Metadata index (dict yang sama dengan footer file)
+
+    Raises:
+        Exception: Jika kolom tidak ada di header
+    """
+    size, mtime_ns, _ = file_fingerprint(table.path)
+    position = column_index(table.header, column)
+
+    # 1. Nilai numerik setiap record (semantik get_value), NaN dilewati
+    values = array('d')
+    offsets = array('q')
+    rows = 0
+    for offset, text in _column_values(table, position):
+        rows += 1
+        try:
+            value = float(text)
+        except ValueError:
+            value = 0.0
+        if value == value:
+            values.append(value)
+            offsets.append(offset)
+
+    # 2. Urutkan berdasarkan nilai (stabil: nilai sama tetap sesuai urutan file)
+    order = sorted(range(len(values)), key=values.__getitem__)
+    values = array('d', (values[i] for i in order))
+    offsets = array('q', (offsets[i] for i in order))
+
+    # 3. Tulis file
+    target = index_path(table.path, column, SORTED)
+    temp = target + ".tmp"
+    try:
+        with open(temp, 'wb') as out:
+            out.write(SORTED_MAGIC)
+            out.write(values.tobytes())
+            out.write(offsets.tobytes())
+            meta = {
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "header_hash": header_hash(table.header),
+                "column": column,
+                "rows": rows,
+                "entries": len(values),
+                "keys": len(set(values)),
+            }
+            encoded = json.dumps(meta).encode('utf-8')
+            out.write(encoded)
+            out.write(struct.pack('<Q', len(encoded)))
+            out.write(SORTED_MAGIC)
+        os.replace(temp, target)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    return meta
+
+
+def _column_values(table: MmapTable, position: int):
+    """Iterasi (offset record, nilai kolom pada position) sesuai urutan file."""
+    records, to_decode = tee(table.iter_records())
+    for (offset, _), (value,) in zip(records, table.decode_records([position], to_decode)):
+        yield (offset, value)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# READ
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class HashIndex:
+    """
+    Hash index yang sudah divalidasi terhadap file CSV-nya.
+
+    Attributes:
+        column: Nama kolom yang di-index
+        rows: Jumlah record yang di-index
+        keys: Jumlah nilai unik
+    """
+
+    def __init__(self, f, meta: Dict):
+        self.column: str = meta["column"]
+        self.rows: int = meta["rows"]
+        self.keys: int = meta["keys"]
+        self._file = f
+        self._buckets: int = meta["buckets"]
+        self._directory: int = meta["directory"]
+
+    @classmethod
+    def open(cls, table: MmapTable, column: str) -> Optional['HashIndex']:
+        """
+        Buka hash index jika ada dan masih sesuai dengan file CSV.
+
+        Args:
+            table: Tabel CSV yang sudah dibuka dengan mmap
+            column: Nama kolom
+
+        Returns:
+            HashIndex, atau None jika index tidak ada / basi / rusak
+        """
+        target = index_path(table.path, column, HASH)
+        if not os.path.exists(target):
+            return None
+
+        f = open(target, 'rb')
+        try:
+            meta = _read_meta(f, MAGIC)
+            size, mtime_ns, _ = file_fingerprint(table.path)
+            if (meta is None or meta["size"] != size or meta["mtime_ns"] != mtime_ns
+                    or meta["header_hash"] != header_hash(table.header)
+                    or meta["column"] != column):
+                f.close()
+                return None
+        except (OSError, ValueError, KeyError, struct.error):
+            f.close()
+            return None
+        return cls(f, meta)
+
+    def close(self) -> None:
+        """Tutup file index."""
+        self._file.close()
+
+    def __enter__(self) -> 'HashIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def count(self, value: str) -> int:
+        """Jumlah record yang nilai kolomnya sama persis dengan value."""
+        return len(self.lookup(value))
+
+    def lookup(self, value: str) -> List[int]:
+        """
+        Cari offset record yang nilai kolomnya sama persis dengan value.
+
+        Hanya satu bucket yang dibaca dari disk.
+
+        Args:
+            value: Nilai string yang dicari
+
+        Returns:
+            List offset record, berurutan sesuai file (kosong jika tidak ada)
+        """
+        key = value.encode('utf-8')
+        f = self._file
+        f.seek(self._directory + _bucket(key, self._buckets) * 8)
+        start, end = struct.unpack('<qq', f.read(16))
+        f.seek(start)
+        data = f.read(end - start)
+
+        pos = 0
+        while pos < len(data):
+            (length,) = struct.unpack_from('<I', data, pos)
+            pos += 4
+            found = data[pos:pos + length] == key
+            pos += length
+            (count,) = struct.unpack_from('<I', data, pos)
+            pos += 4
+            if found:
+                offsets = array('q')
+                offsets.frombytes(data[pos:pos + count * 8])
+                return offsets.tolist()
+            pos += count * 8
+        return []
+
+
+class SortedIndex:
+    """
+    Sorted index yang sudah divalidasi terhadap file CSV-nya.
+
+    Array nilai dan offset tidak dimuat ke memori: bisect berjalan langsung
+    di atas mmap file index.
+
+    Attributes:
+        column: Nama kolom yang di-index
+        rows: Jumlah record di file CSV
+        keys: Jumlah nilai unik
+    """
+
+    def __init__(self, f, mm: mmap.mmap, meta: Dict):
+        self.column: str = meta["column"]
+        self.rows: int = meta["rows"]
+        self.keys: int = meta["keys"]
+        entries = meta["entries"]
+        start = len(SORTED_MAGIC)
+        self._file = f
+        self._mm = mm
+        self._view = memoryview(mm)
+        self._values = self._view[start:start + entries * 8].cast('d')
+        self._offsets = self._view[start + entries * 8:start + entries * 16].cast('q')
+
+    @classmethod
+    def open(cls, table: MmapTable, column: str) -> Optional['SortedIndex']:
+        """
+        Buka sorted index jika ada dan masih sesuai dengan file CSV.
+
+        Args:
+            table: Tabel CSV yang sudah dibuka dengan mmap
+            column: Nama kolom
+
+        Returns:
+            SortedIndex, atau None jika index tidak ada / basi / rusak
+        """
+        target = index_path(table.path, column, SORTED)
+        if not os.path.exists(target):
+            return None
+
+        f = open(target, 'rb')
+        try:
+            meta = _read_meta(f, SORTED_MAGIC)
+            size, mtime_ns, _ = file_fingerprint(table.path)
+            if (meta is None or meta["size"] != size or meta["mtime_ns"] != mtime_ns
+                    or meta["header_hash"] != header_hash(table.header)
+                    or meta["column"] != column):
+                f.close()
+                return None
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, KeyError, struct.error):
+            f.close()
+            return None
+        return cls(f, mm, meta)
+
+    def close(self) -> None:
+        """Lepas view lalu tutup mmap dan file index."""
+        self._values.release()
+        self._offsets.release()
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> 'SortedIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def bounds(self, interval: Interval) -> Tuple[int, int]:
+        """Posisi [awal, akhir) entri yang nilainya berada di dalam interval."""
+        values = self._values
+        if interval.low_inclusive:
+            lo = bisect_left(values, interval.low)
+        else:
+            lo = bisect_right(values, interval.low)
+        if interval.high_inclusive:
+            hi = bisect_right(values, interval.high)
+        else:
+            hi = bisect_left(values, interval.high)
+        return (lo, max(lo, hi))
+
+    def count(self, interval: Interval) -> int:
+        """Jumlah record yang nilainya berada di dalam interval (tanpa membaca record)."""
+        lo, hi = self.bounds(interval)
+        return hi - lo
+
+    def lookup(self, interval: Interval) -> List[int]:
+        """
+        Cari offset record yang nilai kolomnya berada di dalam interval.
+
+        Args:
+            interval: Rentang nilai dari range_terms()
+
+        Returns:
+            List offset record, berurutan sesuai file
+        """
+        lo, hi = self.bounds(interval)
+        return sorted(self._offsets[lo:hi].tolist())
+
+
+def _read_meta(f, magic: bytes) -> Optional[Dict]:
+    """Baca metadata JSON dari footer file index (None jika format tidak cocok)."""
+    if f.read(len(magic)) != magic:
+        return None
+    f.seek(-(len(magic) + 8), os.SEEK_END)
+    (length,) = struct.unpack('<Q', f.read(8))
+    if f.read(len(magic)) != magic:
+        return None
+    f.seek(-(len(magic) + 8 + length), os.SEEK_END)
+    return json.loads(f.read(length).decode('utf-8'))
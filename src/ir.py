@@ -53,8 +53,12 @@ TIPS:
 
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import List, Union
-from ast_nodes import Statement, Expr, Op, BinaryOp, Identifier, Number, StringLiteral
+from typing import List, Optional, Union
+from ast_nodes import (Statement, CreateIndexStatement, Expr, Op, BinaryOp, Identifier, Number,
+                       StringLiteral, BoolLiteral, InList, Between, Aggregate, OrderItem)
+from aggregate import aggregate_label
+from catalog import table_catalog
+from join import ColumnResolver
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -67,10 +71,44 @@ class ScanStep:
     table: str
 
 
+@dataclass
+class JoinStep:
+    """
+    Inner equi-join dengan tabel kedua (JOIN table ON left_key = right_key).
+    
+    Baris keluarannya berisi kolom tabel SCAN lalu kolom tabel JOIN, semuanya
+    bernama lengkap "tabel.kolom" (lihat join.py).
+    """
+    table: str
+    left_key: str
+    right_key: str
+
+
 @dataclass
 class FilterStep:
-    """Langkah 2: Filter baris berdasarkan kondisi."""
-    condition: str
+    """Langkah 2: Filter baris berdasarkan kondisi (expression WHERE)."""
+    condition: Expr
+
+
+@dataclass
+class AggregateStep:
+    """
+    Hash aggregation: kelompokkan baris per nilai group_by dan hitung agregat.
+    
+    Baris keluarannya berisi kolom group_by lalu satu kolom per agregat
+    (bernama aggregate_label, mis. "AVG(nilai_angka)").
+    """
+    group_by: List[str]
+    aggregates: List[Aggregate]
+
+
+@dataclass
+class SortStep:
+    """
+    Urutkan baris (ORDER BY). Kolom kunci adalah nama kolom baris masukan
+    (kolom tabel, atau kolom hasil AGGREGATE seperti "AVG(nilai_angka)").
+    """
+    keys: List[OrderItem]
 
 
 @dataclass
@@ -85,13 +123,27 @@ class LimitStep:
     count: int
 
 
+@dataclass
+class CreateIndexStep:
+    """Bangun index untuk satu kolom (CREATE INDEX)."""
+    table: str
+    column: str
+    kind: str
+
+
 # Union type untuk semua jenis step
-PlanStep = Union[ScanStep, FilterStep, ProjectStep, LimitStep]
+PlanStep = Union[ScanStep, JoinStep, FilterStep, AggregateStep, SortStep, ProjectStep, LimitStep,
+                 CreateIndexStep]
 
 
 @dataclass
 class QueryPlan:
-    """Query Plan - representasi langkah eksekusi."""
+    """
+    Query Plan - representasi langkah eksekusi.
+    
+    Plan ini yang dijalankan engine: setiap langkah menjadi satu operator
+    fisik (lihat operators.py), jadi rewrite pada plan mengubah eksekusi.
+    """
     steps: List[PlanStep]
 
 
@@ -111,23 +163,137 @@ def ast_to_ir(ast: Statement) -> QueryPlan:
     """
     steps: List[PlanStep] = []
     
+    # CREATE INDEX: satu langkah saja
+    if isinstance(ast, CreateIndexStatement):
+        steps.append(CreateIndexStep(table=ast.table, column=ast.column, kind=ast.kind))
+        return QueryPlan(steps=steps)
+    
     # 1. SCAN - selalu ada (langkah pertama: baca file CSV)
     steps.append(ScanStep(table=ast.table))
     
+    # 1b. JOIN - semua nama kolom query ditulis lengkap ("tabel.kolom")
+    #     berdasarkan header kedua tabel
+    if ast.join is not None:
+        ast = resolve_join_columns(ast)
+        steps.append(JoinStep(table=ast.join.table, left_key=ast.join.left,
+                              right_key=ast.join.right))
+    
     # 2. FILTER - jika ada WHERE clause (filter sebelum project untuk efisiensi)
     if ast.where_clause is not None:
-        steps.append(FilterStep(condition=expr_to_string(ast.where_clause)))
+        steps.append(FilterStep(condition=ast.where_clause))
+    
+    # 3. AGGREGATE - jika ada GROUP BY atau fungsi agregat; PROJECT sesudahnya
+    #    memilih kolom hasil agregasi berdasarkan namanya
+    aggregates: List[Aggregate] = []
+    for col in list(ast.columns) + [item.column for item in ast.order_by]:
+        if isinstance(col, Aggregate) and col not in aggregates:
+            aggregates.append(col)
+    if ast.group_by or aggregates:
+        steps.append(AggregateStep(group_by=list(ast.group_by), aggregates=aggregates))
+    
+    # 4. SORT - jika ada ORDER BY (sebelum PROJECT, jadi kunci boleh kolom
+    #    yang tidak ikut di-SELECT)
+    if ast.order_by:
+        steps.append(SortStep(keys=[OrderItem(column=column_label(item.column),
+                                              descending=item.descending)
+                                    for item in ast.order_by]))
     
-    # 3. PROJECT - pilih kolom yang diminta
-    steps.append(ProjectStep(columns=ast.columns))
+    # 5. PROJECT - pilih kolom yang diminta
+    steps.append(ProjectStep(columns=[column_label(col) for col in ast.columns]))
     
-    # 4. LIMIT - jika ada batasan jumlah hasil
+    # 6. LIMIT - jika ada batasan jumlah hasil
     if ast.limit is not None:
         steps.append(LimitStep(count=ast.limit))
     
     return QueryPlan(steps=steps)
 
 
+def resolve_join_columns(ast):  # ast: SelectStatement
+    """
+    Salinan query JOIN dengan semua nama kolom ditulis lengkap (lihat
+    join.ColumnResolver). Header kedua tabel diambil dari katalog.
+    
+    Raises:
+        Exception: Jika file tidak bisa dibaca atau ada kolom yang tidak bisa
+                   di-resolve
+    """
+    left = table_catalog.lookup(ast.table).header
+    right = table_catalog.lookup(ast.join.table).header
+    return ColumnResolver(ast.table, left, ast.join.table, right).resolve_query(ast)
+
+
+def column_label(column: Union[str, Aggregate]) -> str:
+    """Nama kolom hasil untuk item daftar SELECT (kolom biasa atau agregat)."""
+    if isinstance(column, Aggregate):
+        return aggregate_label(column)
+    return column
+
+
+def plan_table(plan: QueryPlan) -> str:
+    """
+    File CSV yang dibaca plan (dari langkah SCAN pertama).
+    
+    Raises:
+        Exception: Jika plan tidak punya langkah SCAN
+    """
+    for step in plan.steps:
+        if isinstance(step, ScanStep):
+            return step.table
+    raise Exception("Query plan tidak memiliki langkah SCAN")
+
+
+def scan_filter(plan: QueryPlan) -> Optional[Expr]:
+    """
+    Gabungan (AND) kondisi FILTER yang langsung mengikuti SCAN.
+    
+    Kondisi ini boleh dipakai jalur akses tabel (index, zone map) untuk
+    melewati baris yang pasti tidak lolos filter.
+    
+    Returns:
+        Expression, atau None jika tidak ada FILTER sesudah SCAN
+    """
+    condition: Optional[Expr] = None
+    for step in plan.steps[1:]:
+        if not isinstance(step, FilterStep):
+            break
+        condition = step.condition if condition is None else \
+            BinaryOp(left=condition, op=Op.AND, right=step.condition)
+    return condition
+
+
+def plan_limit(plan: QueryPlan) -> Optional[int]:
+    """Batas jumlah baris hasil (LIMIT terkecil di plan; None/0 = tanpa batas)."""
+    counts = [step.count for step in plan.steps if isinstance(step, LimitStep) and step.count]
+    return min(counts) if counts else None
+
+
+def step_position(plan: QueryPlan, kind: type) -> Optional[int]:
+    """Posisi langkah pertama bertipe kind di plan (None jika tidak ada)."""
+    for i, step in enumerate(plan.steps):
+        if isinstance(step, kind):
+            return i
+    return None
+
+
+def limit_after(steps: List[PlanStep]) -> Optional[int]:
+    """
+    LIMIT yang langsung membatasi hasil langkah sebelum steps (hanya PROJECT
+    yang boleh berada di antaranya, karena tidak mengubah jumlah baris).
+    
+    Args:
+        steps: Langkah plan sesudah langkah yang bersangkutan
+        
+    Returns:
+        Jumlah baris maksimum, atau None jika tidak dibatasi (LIMIT 0 = tanpa batas)
+    """
+    for step in steps:
+        if isinstance(step, LimitStep):
+            return step.count or None
+        if not isinstance(step, ProjectStep):
+            return None
+    return None
+
+
 def print_query_plan(plan: QueryPlan) -> None:
     """
     Tampilkan Query Plan dengan format yang bagus.
@@ -142,12 +308,24 @@ def print_query_plan(plan: QueryPlan) -> None:
         # Tentukan icon dan deskripsi berdasarkan tipe step
         if isinstance(step, ScanStep):
             icon, desc = "📂", f"SCAN: {step.table}"
+        elif isinstance(step, JoinStep):
+            icon, desc = "🔗", f"JOIN: {step.table} ON {step.left_key} = {step.right_key}"
         elif isinstance(step, FilterStep):
-            icon, desc = "🔍", f"FILTER: {step.condition}"
+            icon, desc = "🔍", f"FILTER: {expr_to_string(step.condition)}"
+        elif isinstance(step, AggregateStep):
+            parts = [", ".join(map(aggregate_label, step.aggregates))] if step.aggregates else []
+            if step.group_by:
+                parts.append(f"BY {', '.join(step.group_by)}")
+            icon, desc = "🧮", f"AGGREGATE: {' '.join(parts)}"
+        elif isinstance(step, SortStep):
+            keys = [f"{item.column} DESC" if item.descending else item.column for item in step.keys]
+            icon, desc = "🔃", f"SORT: {', '.join(keys)}"
         elif isinstance(step, ProjectStep):
             icon, desc = "📊", f"PROJECT: {', '.join(step.columns)}"
         elif isinstance(step, LimitStep):
             icon, desc = "✂️", f"LIMIT: {step.count}"
+        elif isinstance(step, CreateIndexStep):
+            icon, desc = "🗂️", f"CREATE INDEX: {step.table} ({step.column}) {step.kind.upper()}"
         else:
             icon, desc = "❓", "UNKNOWN"
         
@@ -200,6 +378,21 @@ def expr_to_string(expr: Expr) -> str:
         # String literal: tampilkan dengan tanda kutip
         return f'"{expr.value}"'
     
+    elif isinstance(expr, BoolLiteral):
+        # Konstanta hasil optimasi
+        return "TRUE" if expr.value else "FALSE"
+    
+    elif isinstance(expr, InList):
+        # Keanggotaan: kolom IN (nilai, ...)
+        values = ", ".join(expr_to_string(value) for value in expr.values)
+        keyword = "NOT IN" if expr.negated else "IN"
+        return f"{expr_to_string(expr.expr)} {keyword} ({values})"
+    
+    elif isinstance(expr, Between):
+        # Rentang inklusif: kolom BETWEEN a AND b
+        return (f"{expr_to_string(expr.expr)} BETWEEN {expr_to_string(expr.low)} "
+                f"AND {expr_to_string(expr.high)}")
+    
     elif isinstance(expr, BinaryOp):
         # Binary operation: rekursif ke kiri dan kanan
         left_str = expr_to_string(expr.left)
@@ -0,0 +1,481 @@
+"""
+join.py - Join Dua Tabel CSV untuk CSV_QL
+
+Modul ini berisi resolusi nama kolom untuk query JOIN dan algoritma hash
+join yang dipakai operator HashJoin (lihat operators.py).
+
+Nama kolom:
+    Setiap tabel diberi nama pendek dari nama filenya tanpa ekstensi
+    (data_nilai.csv -> data_nilai). Kolom hasil join bernama lengkap
+    "tabel.kolom"; di query, kolom boleh ditulis tanpa nama tabel selama
+    hanya ada di salah satu tabel.
+
+        SELECT nama, alamat FROM data_nilai.csv JOIN mahasiswa.csv
+            ON data_nilai.nim = mahasiswa.nim
+
+Hash join:
+    1. Build: baris sisi yang lebih kecil dimasukkan ke hash table per kunci
+    2. Probe: baris sisi lain dicocokkan dengan hash table sambil di-stream
+    Jika hash table melebihi anggaran memori, dipakai grace hash join: kedua
+    sisi dipartisi ke file sementara (format biner marshal, sama seperti run
+    sorting.py) berdasarkan hash kunci, lalu setiap pasangan partisi
+    di-join terpisah. Partisi yang masih terlalu besar dipartisi ulang.
+
+Merge join (kedua tabel sudah terurut menurut kunci, urutan string):
+    Kedua sisi dibaca bersamaan; hanya baris kanan dengan kunci yang sedang
+    diproses yang disimpan, jadi memori sebanding dengan ukuran satu grup
+    kunci. Urutan kunci diverifikasi selama stream. Jika ditemukan kunci yang
+    mundur, sisa hasil dihitung dengan hash join atas scan ulang kedua tabel,
+    tanpa mengulang pasangan yang sudah dihasilkan.
+
+Kunci kosong ("") dianggap NULL dan tidak cocok dengan baris manapun.
+"""
+
+import marshal
+import os
+import tempfile
+from dataclasses import replace
+from itertools import chain, islice
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Sequence
+from ast_nodes import BinaryOp, Identifier, InList, Between, Aggregate, OrderItem, JoinClause, Expr
+from cache import row_size
+from sorting import RUN_BLOCK_ROWS, _read_run
+
+
+# Jumlah partisi grace hash join per level
+GRACE_PARTITIONS = 32
+
+# Partisi ulang paling dalam; partisi yang masih terlalu besar (mis. satu
+# kunci dengan sangat banyak baris) di-join di memori
+GRACE_MAX_LEVELS = 3
+
+# Perkiraan memori hash table per baris build selain isi baris (byte)
+ENTRY_OVERHEAD_BYTES = 100
+
+# Algoritma join (EngineConfig.join_method): "auto" memakai merge join jika
+# sampel kedua tabel terurut menurut kunci, "merge" = tabel dinyatakan
+# terurut (tetap diverifikasi), "hash" = selalu hash join
+JOIN_AUTO = "auto"
+JOIN_HASH = "hash"
+JOIN_MERGE = "merge"
+JOIN_METHODS = (JOIN_AUTO, JOIN_HASH, JOIN_MERGE)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# NAMA KOLOM
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def table_qualifier(path: str) -> str:
+    """Nama pendek tabel: nama file tanpa direktori dan ekstensi."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def qualified_header(path: str, header: List[str]) -> List[str]:
+    """Nama lengkap ("tabel.kolom") setiap kolom tabel."""
+    qualifier = table_qualifier(path)
+    return [f"{qualifier}.{name}" for name in header]
+
+
+def qualified_schema(path: str, schema: Dict[str, str]) -> Dict[str, str]:
+    """Schema tabel dengan nama kolom lengkap ("tabel.kolom")."""
+    qualifier = table_qualifier(path)
+    return {f"{qualifier}.{name}": kind for name, kind in schema.items()}
+
+
+class ColumnResolver:
+    """
+    Resolusi nama kolom query JOIN ke nama lengkap "tabel.kolom".
+
+    Attributes:
+        sides: (nama pendek, set kolom) untuk tabel kiri dan kanan
+    """
+
+    def __init__(self, left: str, left_header: List[str], right: str, right_header: List[str]):
+        """
+        Args:
+            left: Path tabel kiri (FROM)
+            left_header: Header tabel kiri
+            right: Path tabel kanan (JOIN)
+            right_header: Header tabel kanan
+
+        Raises:
+            Exception: Jika kedua tabel punya nama pendek yang sama
+        """
+        self.sides = [(table_qualifier(left), set(left_header)),
+                      (table_qualifier(right), set(right_header))]
+        if self.sides[0][0] == self.sides[1][0]:
+            raise Exception(f"Tabel '{left}' dan '{right}' punya nama yang sama "
+                            f"('{self.sides[0][0]}'); self join belum didukung")
+
+    def side(self, name: str) -> int:
+        """Sisi tabel (0 = kiri, 1 = kanan) dari nama kolom lengkap."""
+        for i, (qualifier, header) in enumerate(self.sides):
+            if name.startswith(qualifier + ".") and name[len(qualifier) + 1:] in header:
+                return i
+        raise Exception(f"Kolom '{name}' tidak ditemukan")
+
+    def resolve(self, name: str) -> str:
+        """
+        Nama lengkap untuk nama kolom di query ("tabel.kolom" atau "kolom").
+
+        Raises:
+            Exception: Jika kolom tidak ada di kedua tabel, atau ada di keduanya
+                       tetapi ditulis tanpa nama tabel
+        """
+        for qualifier, header in self.sides:
+            if name.startswith(qualifier + ".") and name[len(qualifier) + 1:] in header:
+                return name
+        matches = [qualifier for qualifier, header in self.sides if name in header]
+        if len(matches) == 1:
+            return f"{matches[0]}.{name}"
+        if matches:
+            options = " atau ".join(f"{qualifier}.{name}" for qualifier in matches)
+            raise Exception(f"Kolom '{name}' ada di kedua tabel, tulis sebagai {options}")
+        tables = " dan ".join(f"'{qualifier}'" for qualifier, _ in self.sides)
+        raise Exception(f"Kolom '{name}' tidak ada di tabel {tables}")
+
+    def resolve_expr(self, expr: Expr) -> Expr:
+        """Salinan expr dengan setiap Identifier di-resolve."""
+        if isinstance(expr, Identifier):
+            return Identifier(name=self.resolve(expr.name))
+        if isinstance(expr, BinaryOp):
+            return BinaryOp(left=self.resolve_expr(expr.left), op=expr.op,
+                            right=self.resolve_expr(expr.right))
+        if isinstance(expr, InList):
+            return replace(expr, expr=self.resolve_expr(expr.expr),
+                           values=[self.resolve_expr(value) for value in expr.values])
+        if isinstance(expr, Between):
+            return Between(expr=self.resolve_expr(expr.expr), low=self.resolve_expr(expr.low),
+                           high=self.resolve_expr(expr.high))
+        return expr
+
+    def resolve_item(self, item):  # item: SelectItem
+        """Resolve item SELECT / ORDER BY (kolom, "*", atau agregat)."""
+        if isinstance(item, Aggregate):
+            if item.column == "*":
+                return item
+            return Aggregate(func=item.func, column=self.resolve(item.column))
+        if item == "*":
+            return item
+        return self.resolve(item)
+
+    def resolve_query(self, query):  # query: SelectStatement
+        """
+        Salinan query dengan semua nama kolom ditulis lengkap, dan kunci ON
+        diurutkan (kolom tabel kiri dulu).
+
+        Raises:
+            Exception: Jika ada kolom yang tidak bisa di-resolve, atau ON tidak
+                       membandingkan kolom dari kedua tabel
+        """
+        first = self.resolve(query.join.left)
+        second = self.resolve(query.join.right)
+        sides = (self.side(first), self.side(second))
+        if sides == (1, 0):
+            first, second = second, first
+        elif sides != (0, 1):
+            raise Exception("ON harus membandingkan satu kolom dari setiap tabel")
+
+        where = query.where_clause
+        return replace(
+            query,
+            columns=[self.resolve_item(col) for col in query.columns],
+            where_clause=self.resolve_expr(where) if where is not None else None,
+            group_by=[self.resolve(col) for col in query.group_by],
+            order_by=[OrderItem(column=self.resolve_item(item.column), descending=item.descending)
+                      for item in query.order_by],
+            join=JoinClause(table=query.join.table, left=first, right=second),
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HASH JOIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def hash_join(build: Iterable[List[str]], probe: Iterable[List[str]], build_key: int,
+              probe_key: int, build_first: bool, memory_bytes: int = 0,
+              temp_dir: str = "", level: int = 0) -> Iterator[List[str]]:
+    """
+    Inner equi-join dengan hash table di sisi build.
+
+    Args:
+        build: Baris sisi build (dimuat ke hash table)
+        probe: Baris sisi probe (di-stream)
+        build_key: Posisi kolom kunci di baris build
+        probe_key: Posisi kolom kunci di baris probe
+        build_first: True jika kolom build berada di kiri baris hasil
+        memory_bytes: Anggaran memori hash table (perkiraan, byte).
+                      <= 0 = selalu di memori.
+        temp_dir: Direktori file partisi ("" = direktori sementara sistem)
+        level: Level partisi grace (dipakai rekursi)
+
+    Yields:
+        Baris hasil: kolom tabel kiri lalu kolom tabel kanan
+    """
+    table: Dict[str, List[List[str]]] = {}
+    rows = iter(build)
+    size = 0
+    budget = memory_bytes if memory_bytes > 0 and level < GRACE_MAX_LEVELS else 0
+    for row in rows:
+        key = row[build_key]
+        if not key:
+            continue
+        matches = table.get(key)
+        if matches is None:
+            table[key] = [row]
+        else:
+            matches.append(row)
+        if budget:
+            size += row_size(row) + ENTRY_OVERHEAD_BYTES
+            if size > budget:
+                loaded = chain.from_iterable(table.values())
+                table = {}
+                yield from _grace_join(chain(loaded, rows), probe, build_key, probe_key,
+                                       build_first, memory_bytes, temp_dir, level)
+                return
+
+    if not table:
+        return
+    get = table.get
+    if build_first:
+        for row in probe:
+            matches = get(row[probe_key])
+            if matches:
+                for match in matches:
+                    yield match + row
+    else:
+        for row in probe:
+            matches = get(row[probe_key])
+            if matches:
+                for match in matches:
+                    yield row + match
+
+
+def _grace_join(build: Iterable[List[str]], probe: Iterable[List[str]], build_key: int,
+                probe_key: int, build_first: bool, memory_bytes: int, temp_dir: str,
+                level: int) -> Iterator[List[str]]:
+    """Partisi kedua sisi ke disk, lalu join setiap pasangan partisi."""
+    build_parts = Partitions(GRACE_PARTITIONS, level, temp_dir)
+    probe_parts = Partitions(GRACE_PARTITIONS, level, temp_dir)
+    try:
+        build_parts.add(build, build_key)
+        probe_parts.add(probe, probe_key, skip=build_parts.empty())
+        empty = [a or b for a, b in zip(build_parts.empty(), probe_parts.empty())]
+        for i in range(GRACE_PARTITIONS):
+            if empty[i]:
+                continue
+            yield from hash_join(build_parts.read(i), probe_parts.read(i), build_key, probe_key,
+                                 build_first, memory_bytes, temp_dir, level + 1)
+    finally:
+        build_parts.close()
+        probe_parts.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MERGE JOIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def is_sorted_on(rows: Iterable[List[str]], key: int) -> bool:
+    """True jika kunci (selain yang kosong) tidak pernah turun (urutan string)."""
+    previous = ""
+    for row in rows:
+        value = row[key]
+        if value:
+            if value < previous:
+                return False
+            previous = value
+    return True
+
+
+class _Unsorted(Exception):
+    """Kunci yang mundur ditemukan saat merge join (args[0]: stream-nya)."""
+
+
+class _SortedStream:
+    """
+    Baris satu sisi merge join dengan verifikasi urutan kunci.
+
+    Attributes:
+        pulled: Jumlah baris yang sudah dibaca (termasuk yang berkunci kosong)
+    """
+
+    def __init__(self, rows: Iterable[List[str]], key: int):
+        self._rows = iter(rows)
+        self._key = key
+        self._last = ""
+        self.pulled = 0
+
+    def next(self) -> Optional[List[str]]:
+        """
+        Baris berikutnya yang kuncinya tidak kosong (None jika habis).
+
+        Raises:
+            _Unsorted: Jika kuncinya lebih kecil dari kunci sebelumnya
+        """
+        key = self._key
+        for row in self._rows:
+            value = row[key]
+            if not value:
+                self.pulled += 1
+                continue
+            if value < self._last:
+                raise _Unsorted(self)
+            self.pulled += 1
+            self._last = value
+            return row
+        return None
+
+
+def merge_join(left: Iterable[List[str]], right: Iterable[List[str]], left_key: int,
+               right_key: int, build_left: bool = False, memory_bytes: int = 0,
+               temp_dir: str = "") -> Iterator[List[str]]:
+    """
+    Inner equi-join untuk dua input yang terurut menurut kunci.
+
+    left dan right harus bisa diiterasi ulang (mis. scan tabel): jika urutan
+    ternyata tidak terurut, keduanya dibaca lagi untuk hash join.
+
+    Args:
+        left: Baris tabel kiri
+        right: Baris tabel kanan
+        left_key: Posisi kolom kunci di baris kiri
+        right_key: Posisi kolom kunci di baris kanan
+        build_left: Sisi build hash join cadangan (lihat hash_join)
+        memory_bytes: Anggaran memori hash join cadangan
+        temp_dir: Direktori file partisi hash join cadangan
+
+    Yields:
+        Baris hasil: kolom tabel kiri lalu kolom tabel kanan
+    """
+    lefts = _SortedStream(left, left_key)
+    rights = _SortedStream(right, right_key)
+    l = r = None
+    try:
+        l = lefts.next()
+        r = rights.next()
+        while l is not None and r is not None:
+            key = l[left_key]
+            other = r[right_key]
+            if key < other:
+                l = lefts.next()
+            elif key > other:
+                r = rights.next()
+            else:
+                group = [r]
+                r = rights.next()
+                while r is not None and r[right_key] == key:
+                    group.append(r)
+                    r = rights.next()
+                while l is not None and l[left_key] == key:
+                    for match in group:
+                        yield l + match
+                    l = lefts.next()
+
+        # Sisa salah satu sisi tidak punya pasangan, tetapi urutannya tetap
+        # diverifikasi (kunci yang mundur bisa cocok dengan baris yang sudah lewat)
+        rest = lefts if l is not None else rights
+        while rest.next() is not None:
+            pass
+    except _Unsorted as e:
+        # Pasangan yang sudah dihasilkan: semua pasangan cocok di antara baris
+        # yang sudah dilewati kedua sisi. Baris yang sedang menunggu di sisi
+        # lain (bukan sisi yang gagal) belum termasuk.
+        failed = e.args[0]
+        done_left = lefts.pulled - (l is not None and failed is not lefts)
+        done_right = rights.pulled - (r is not None and failed is not rights)
+        yield from _remaining_join(left, right, left_key, right_key, done_left, done_right,
+                                   build_left, memory_bytes, temp_dir)
+
+
+def _remaining_join(left: Iterable[List[str]], right: Iterable[List[str]], left_key: int,
+                    right_key: int, done_left: int, done_right: int, build_left: bool,
+                    memory_bytes: int, temp_dir: str) -> Iterator[List[str]]:
+    """
+    Hash join atas scan ulang, tanpa pasangan (left[:done_left], right[:done_right])
+    yang sudah dihasilkan merge join:
+
+        left[done_left:] JOIN right   +   left[:done_left] JOIN right[done_right:]
+    """
+    parts = [(islice(left, done_left, None), right),
+             (islice(left, done_left), islice(right, done_right, None))]
+    for lefts, rights in parts:
+        if build_left:
+            yield from hash_join(lefts, rights, left_key, right_key, True, memory_bytes, temp_dir)
+        else:
+            yield from hash_join(rights, lefts, right_key, left_key, False, memory_bytes, temp_dir)
+
+
+class Partitions:
+    """
+    Partisi baris ke file sementara berdasarkan hash kunci (grace hash join).
+
+    Baris ditulis per blok RUN_BLOCK_ROWS dengan marshal; file partisi baru
+    dibuat saat baris pertamanya masuk, dan dihapus saat close().
+    """
+
+    def __init__(self, count: int, level: int, temp_dir: str = ""):
+        """
+        Args:
+            count: Jumlah partisi
+            level: Level partisi; hash kunci diberi salt level supaya partisi
+                   ulang membagi baris secara berbeda
+            temp_dir: Direktori file partisi ("" = direktori sementara sistem)
+        """
+        self.count = count
+        self.level = level
+        self.temp_dir = temp_dir or None
+        self.files: List[Optional[IO[bytes]]] = [None] * count
+        self._buffers: List[list] = [[] for _ in range(count)]
+
+    def add(self, rows: Iterable[List[str]], key: int,
+            skip: Optional[Sequence[bool]] = None) -> None:
+        """
+        Tulis baris ke partisi kuncinya (kunci kosong dilewati).
+
+        Args:
+            rows: Baris yang dipartisi
+            key: Posisi kolom kunci
+            skip: Partisi yang tidak perlu disimpan (mis. sisi build-nya kosong)
+        """
+        count, level, buffers = self.count, self.level, self._buffers
+        for row in rows:
+            value = row[key]
+            if not value:
+                continue
+            i = hash((level, value)) % count
+            if skip is not None and skip[i]:
+                continue
+            buffer = buffers[i]
+            buffer.append(row)
+            if len(buffer) >= RUN_BLOCK_ROWS:
+                self._flush(i)
+
+    def empty(self) -> List[bool]:
+        """True untuk setiap partisi yang tidak berisi baris."""
+        return [f is None and not buffer for f, buffer in zip(self.files, self._buffers)]
+
+    def read(self, i: int) -> Iterator[List[str]]:
+        """Baris partisi ke-i, sesuai urutan masuk."""
+        if self._buffers[i]:
+            self._flush(i)
+        f = self.files[i]
+        if f is None:
+            return iter(())
+        f.seek(0)
+        return _read_run(f)
+
+    def close(self) -> None:
+        """Tutup (dan hapus) semua file partisi."""
+        for f in self.files:
+            if f is not None:
+                f.close()
+        self.files = [None] * self.count
+        self._buffers = [[] for _ in range(self.count)]
+
+    def _flush(self, i: int) -> None:
+        f = self.files[i]
+        if f is None:
+            f = self.files[i] = tempfile.TemporaryFile(dir=self.temp_dir)
+        marshal.dump(self._buffers[i], f)
+        self._buffers[i] = []
+
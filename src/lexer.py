@@ -147,6 +147,10 @@ class Lexer:
             return Token(TokenType.STAR)
         elif c == ',':
             return Token(TokenType.COMMA)
+        elif c == '(':
+            return Token(TokenType.LPAREN)
+        elif c == ')':
+            return Token(TokenType.RPAREN)
         elif c == '=':
             return Token(TokenType.EQUAL)
         elif c == '!':
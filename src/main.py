@@ -8,11 +8,21 @@ Mendukung dua mode:
 """
 
 import sys
+from dataclasses import fields
+from itertools import islice
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
 from lexer import Lexer
 from parser import Parser
-from semantic import analyze
-from ir import ast_to_ir, print_query_plan
-from engine import execute_query
+from semantic import analyze, SemanticResult
+from ir import ast_to_ir, print_query_plan, QueryPlan
+import engine
+from engine import execute_query_iter, table_info
+from ast_nodes import Statement, SelectStatement, CreateIndexStatement
+from optimizer import optimize
+from cache import LRUCache
+from catalog import table_catalog
+from fingerprint import Fingerprint, file_fingerprint
 from dfa import DFATracker
 
 
@@ -52,7 +62,10 @@ def print_help():
 ═══════════════════════════════════════════════════════════════════════════════{RESET}
 
 {CYAN}{BOLD}SYNTAX DASAR:{RESET}
-  SELECT <kolom> FROM <file.csv> [WHERE <kondisi>] [LIMIT n]
+  SELECT <kolom> FROM <file.csv> [JOIN <file2.csv> ON <kolom> = <kolom>]
+         [WHERE <kondisi>] [GROUP BY <kolom>]
+         [ORDER BY <kolom> [ASC|DESC]] [LIMIT n]
+  CREATE INDEX ON <file.csv> (<kolom>) [USING HASH|SORTED]
 
 {CYAN}{BOLD}CONTOH QUERY:{RESET}
 
@@ -69,21 +82,46 @@ def print_help():
   {GREEN}4. Kombinasi kondisi (AND/OR):{RESET}
      SELECT * FROM data.csv WHERE umur > 20 AND umur < 30
      SELECT * FROM data.csv WHERE kota = "Jakarta" OR kota = "Bandung"
+     SELECT * FROM data.csv WHERE kota IN ("Jakarta", "Bandung")
+     SELECT * FROM data.csv WHERE umur NOT IN (17, 18)
+     SELECT * FROM data.csv WHERE umur BETWEEN 20 AND 30
 
   {GREEN}5. Batasi hasil dengan LIMIT:{RESET}
      SELECT * FROM data.csv LIMIT 5
      SELECT nama FROM data.csv WHERE umur > 25 LIMIT 10
 
+  {GREEN}6. Agregasi (COUNT, SUM, AVG, MIN, MAX) dan GROUP BY:{RESET}
+     SELECT COUNT(*) FROM data.csv WHERE umur > 20
+     SELECT kota, COUNT(*), AVG(umur) FROM data.csv GROUP BY kota
+
+  {GREEN}7. Urutkan dengan ORDER BY (ASC default, DESC untuk menurun):{RESET}
+     SELECT nama, umur FROM data.csv ORDER BY umur DESC LIMIT 10
+     SELECT kota, COUNT(*) FROM data.csv GROUP BY kota ORDER BY COUNT(*) DESC
+
+  {GREEN}8. Index untuk pencarian kolom = "nilai" / rentang angka:{RESET}
+     CREATE INDEX ON data.csv (nim)
+     SELECT * FROM data.csv WHERE nim = "2023005"
+     CREATE INDEX ON data.csv (umur) USING SORTED
+     SELECT * FROM data.csv WHERE umur < 18
+
+  {GREEN}9. Gabungkan dua file dengan JOIN (kolom ditulis tabel.kolom jika ada di keduanya):{RESET}
+     SELECT nama, alamat FROM data.csv JOIN mhs.csv ON data.nim = mhs.nim
+
 {CYAN}{BOLD}OPERATOR YANG DIDUKUNG:{RESET}
   =   (sama dengan)        !=  (tidak sama)
   >   (lebih besar)        <   (lebih kecil)
   >=  (lebih besar/sama)   <=  (lebih kecil/sama)
   AND (dan)                OR  (atau)
+  IN (...) (salah satu)     NOT IN (...) (bukan salah satu)
+  BETWEEN a AND b (rentang inklusif)
 
 {CYAN}{BOLD}PERINTAH REPL:{RESET}
   {MAGENTA}help{RESET}   - Tampilkan bantuan ini
   {MAGENTA}clear{RESET}  - Bersihkan layar  
   {MAGENTA}dfa{RESET}    - Tampilkan diagram DFA lexer
+  {MAGENTA}settings{RESET} - Tampilkan pengaturan engine
+  {MAGENTA}set{RESET} <opsi> <nilai> - Ubah pengaturan engine (mis. set parallel_workers 8)
+  {MAGENTA}cache{RESET}  - Tampilkan statistik cache hasil query & kompilasi ({MAGENTA}cache clear{RESET} untuk mengosongkan)
   {MAGENTA}exit{RESET}   - Keluar program
 
 {YELLOW}═══════════════════════════════════════════════════════════════════════════════{RESET}
@@ -94,6 +132,48 @@ def print_help():
 # EKSEKUSI QUERY - Pipeline Kompilasi
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Jumlah maksimum hasil kompilasi yang disimpan di compile_cache
+COMPILE_CACHE_ENTRIES = 256
+
+
+@dataclass
+class CompiledQuery:
+    """
+    Hasil tahap 1-4 pipeline kompilasi untuk satu teks query.
+    
+    Attributes:
+        ast: Statement AST dari parser
+        result: Hasil semantic analysis (valid)
+        plan: Query plan (IR)
+        fingerprint: Fingerprint file tabel (dan tabel JOIN) saat dikompilasi
+                     (None untuk file yang tidak ada)
+    """
+    ast: Statement
+    result: SemanticResult
+    plan: QueryPlan
+    fingerprint: Tuple[Optional[Fingerprint], ...]
+
+
+# Cache kompilasi: teks query -> CompiledQuery (divalidasi dengan fingerprint file)
+compile_cache = LRUCache(COMPILE_CACHE_ENTRIES)
+
+
+def table_fingerprint(path: str) -> Optional[Fingerprint]:
+    """Fingerprint file tabel, atau None jika file tidak bisa di-stat."""
+    try:
+        return file_fingerprint(path)
+    except OSError:
+        return None
+
+
+def query_fingerprint(ast: Statement) -> Tuple[Optional[Fingerprint], ...]:
+    """Fingerprint semua file yang dibaca query (tabel FROM dan JOIN)."""
+    tables = [ast.table]
+    if isinstance(ast, SelectStatement) and ast.join is not None:
+        tables.append(ast.join.table)
+    return tuple(table_fingerprint(table) for table in tables)
+
+
 def execute_sql(input_query: str, verbose: bool = False):
     """
     Eksekusi query SQL melalui pipeline kompilasi.
@@ -105,12 +185,78 @@ def execute_sql(input_query: str, verbose: bool = False):
         4. IR Generation (AST → Query Plan)
         5. Execution (Jalankan Query Plan)
     
+    Hasil tahap 1-4 disimpan di compile_cache. Query dengan teks yang sama
+    terhadap file yang belum berubah langsung masuk ke tahap 5.
+    
     Args:
         input_query: Query SQL yang akan dieksekusi
         verbose: Jika True, tampilkan detail setiap tahap
     """
     print(f"\n  {DIM}Query: {input_query}{RESET}")
     
+    compiled = compile_cache.get(input_query)
+    if compiled is not None and compiled.fingerprint != query_fingerprint(compiled.ast):
+        # File berubah (atau dihapus): header/schema mungkin sudah berbeda
+        compile_cache.discard(input_query)
+        compiled = None
+    
+    if compiled is None:
+        compiled = compile_sql(input_query, verbose)
+        if compiled is None:
+            return
+        compile_cache.put(input_query, compiled)
+    else:
+        if verbose:
+            print(f"\n  {CYAN}[1-4] KOMPILASI{RESET}")
+            print("  ✓ Diambil dari cache kompilasi")
+            print_query_plan(compiled.plan)
+        for warn in compiled.result.warnings:
+            print(f"  {YELLOW}⚠️ Warning: {warn}{RESET}")
+    
+    ast, result = compiled.ast, compiled.result
+    
+    # ┌─────────────────────────────────────────────────────────────────────────┐
+    # │ TAHAP 5: EXECUTION (Jalankan Query Plan)                               │
+    # └─────────────────────────────────────────────────────────────────────────┘
+    if verbose:
+        print(f"\n  {CYAN}[5] EXECUTION{RESET}")
+    
+    # CREATE INDEX: bangun index, tidak ada tabel hasil
+    if isinstance(ast, CreateIndexStatement):
+        try:
+            rows, keys = engine.create_index(ast)
+            print(f"  {GREEN}✅ Index {ast.kind} '{ast.column}' dibuat: {rows} baris, {keys} nilai unik{RESET}\n")
+        except Exception as e:
+            print(f"  {RED}❌ Runtime Error: {e}{RESET}\n")
+        return
+    
+    # Hasil di-stream baris per baris, tidak dikumpulkan dulu di memori
+    stream = execute_query_iter(ast, schema=result.schema, plan=compiled.plan)
+    try:
+        headers = next(stream)
+        
+        if print_table(headers, stream) == 0:
+            print(f"  {YELLOW}⚠️ Tidak ada data yang cocok.{RESET}\n")
+            
+    except Exception as e:
+        print(f"  {RED}❌ Runtime Error: {e}{RESET}\n")
+    finally:
+        stream.close()
+
+
+def compile_sql(input_query: str, verbose: bool = False) -> Optional[CompiledQuery]:
+    """
+    Jalankan tahap 1-4 pipeline kompilasi (tanpa cache).
+    
+    Error ditampilkan langsung ke layar.
+    
+    Args:
+        input_query: Query SQL
+        verbose: Jika True, tampilkan detail setiap tahap
+        
+    Returns:
+        CompiledQuery, atau None jika query tidak valid
+    """
     # ┌─────────────────────────────────────────────────────────────────────────┐
     # │ TAHAP 1: LEXICAL ANALYSIS (String → Tokens)                            │
     # └─────────────────────────────────────────────────────────────────────────┘
@@ -129,7 +275,7 @@ def execute_sql(input_query: str, verbose: bool = False):
         ast = parser.parse()
     except Exception as e:
         print(f"  {RED}❌ Parse Error: {e}{RESET}\n")
-        return
+        return None
     
     if verbose:
         print(f"\n  {CYAN}[2] SYNTAX ANALYSIS{RESET}")
@@ -138,6 +284,9 @@ def execute_sql(input_query: str, verbose: bool = False):
     # ┌─────────────────────────────────────────────────────────────────────────┐
     # │ TAHAP 3: SEMANTIC ANALYSIS (Validasi AST)                              │
     # └─────────────────────────────────────────────────────────────────────────┘
+    # Fingerprint diambil sebelum analisis: jika file berubah sesudahnya,
+    # hasil kompilasi ini tidak akan cocok lagi dan dikompilasi ulang.
+    fingerprint = query_fingerprint(ast)
     try:
         result = analyze(ast)
         
@@ -152,58 +301,63 @@ def execute_sql(input_query: str, verbose: bool = False):
         if not result.valid:
             for err in result.errors:
                 print(f"  {RED}❌ Semantic Error: {err}{RESET}")
-            return
+            return None
         
         if verbose:
             print("  ✓ Validasi OK")
+            print(f"  Schema: {result.schema}")
             
     except Exception as e:
         print(f"  {RED}❌ Semantic Error: {e}{RESET}\n")
-        return
+        return None
     
     # ┌─────────────────────────────────────────────────────────────────────────┐
     # │ TAHAP 4: IR GENERATION (AST → Query Plan)                              │
     # └─────────────────────────────────────────────────────────────────────────┘
     query_plan = ast_to_ir(ast)
+    if isinstance(ast, SelectStatement):
+        # Rewrite pass (urutan predicate, ...) dengan statistik dari katalog
+        query_plan = optimize(query_plan, table_info(ast.table))
     
     if verbose:
         print(f"\n  {CYAN}[4] IR GENERATION{RESET}")
         print_query_plan(query_plan)
     
-    # ┌─────────────────────────────────────────────────────────────────────────┐
-    # │ TAHAP 5: EXECUTION (Jalankan Query Plan)                               │
-    # └─────────────────────────────────────────────────────────────────────────┘
-    if verbose:
-        print(f"\n  {CYAN}[5] EXECUTION{RESET}")
-    
-    try:
-        headers, rows = execute_query(ast)
-        
-        if not rows:
-            print(f"  {YELLOW}⚠️ Tidak ada data yang cocok.{RESET}\n")
-        else:
-            print_table(headers, rows)
-            
-    except Exception as e:
-        print(f"  {RED}❌ Runtime Error: {e}{RESET}\n")
+    return CompiledQuery(ast=ast, result=result, plan=query_plan, fingerprint=fingerprint)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAMPILKAN TABEL
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def print_table(headers: list[str], rows: list[list[str]]):
+# Jumlah baris awal yang dipakai untuk menghitung lebar kolom tabel
+WIDTH_SAMPLE_ROWS = 1000
+
+
+def print_table(headers: List[str], rows: Iterable[List[str]]) -> int:
     """
     Tampilkan hasil query dalam format tabel.
     
+    rows boleh berupa list atau iterator (misalnya dari execute_query_iter).
+    Lebar kolom dihitung dari WIDTH_SAMPLE_ROWS baris pertama, lalu sisanya
+    dicetak sambil di-stream sehingga memori tetap datar.
+    
     Args:
         headers: List nama kolom
-        rows: List baris data
+        rows: Baris data (list atau iterator)
+        
+    Returns:
+        Jumlah baris yang dicetak (0 berarti tabel tidak dicetak)
     """
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    if not sample:
+        return 0
+    
     # Hitung lebar kolom
     widths = []
     for i, h in enumerate(headers):
-        max_data = max((len(row[i]) if i < len(row) else 0 for row in rows), default=0)
+        max_data = max((len(row[i]) if i < len(row) else 0 for row in sample), default=0)
         widths.append(max(len(h), max_data) + 2)
     
     # Fungsi helper untuk buat garis
@@ -226,15 +380,88 @@ def print_table(headers: list[str], rows: list[list[str]]):
     line("├", "┼", "┤")
     
     # Data rows
-    for row in rows:
-        print(f"  {CYAN}│{RESET}", end="")
-        for i, cell in enumerate(row):
-            if i < len(widths):
-                print(f"{WHITE} {cell:^{widths[i]-1}}{RESET}{CYAN}│{RESET}", end="")
-        print()
+    count = 0
+    for rows_part in (sample, rows):
+        for row in rows_part:
+            print(f"  {CYAN}│{RESET}", end="")
+            for i, cell in enumerate(row):
+                if i < len(widths):
+                    print(f"{WHITE} {cell:^{widths[i]-1}}{RESET}{CYAN}│{RESET}", end="")
+            print()
+            count += 1
     
     line("╰", "┴", "╯")
-    print(f"  {GREEN}✅ {len(rows)} baris ditemukan{RESET}\n")
+    print(f"  {GREEN}✅ {count} baris ditemukan{RESET}\n")
+    return count
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PENGATURAN ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def print_settings():
+    """Tampilkan pengaturan engine yang sedang aktif."""
+    print(f"\n  {CYAN}{BOLD}PENGATURAN ENGINE:{RESET}")
+    for f in fields(engine.config):
+        print(f"  {MAGENTA}{f.name}{RESET} = {getattr(engine.config, f.name)}")
+    print()
+
+
+def print_cache_stats():
+    """Tampilkan statistik cache hasil query dan cache kompilasi."""
+    caches = [
+        ("CACHE HASIL QUERY", engine.result_cache, "byte"),
+        ("CACHE KOMPILASI", compile_cache, "entri"),
+    ]
+    for title, cache, unit in caches:
+        lookups = cache.hits + cache.misses
+        ratio = cache.hits / lookups * 100 if lookups else 0.0
+        print(f"\n  {CYAN}{BOLD}{title}:{RESET}")
+        print(f"  {MAGENTA}entri{RESET}     = {len(cache)}")
+        print(f"  {MAGENTA}ukuran{RESET}    = {cache.size} / {cache.capacity} {unit}")
+        print(f"  {MAGENTA}hit{RESET}       = {cache.hits} ({ratio:.1f}%)")
+        print(f"  {MAGENTA}miss{RESET}      = {cache.misses}")
+        print(f"  {MAGENTA}eviction{RESET}  = {cache.evictions}")
+    print()
+
+
+def apply_setting(args: str):
+    """
+    Ubah satu pengaturan engine dari REPL.
+    
+    Args:
+        args: String "<opsi> <nilai>"
+    """
+    parts = args.split()
+    if len(parts) != 2:
+        print(f"  {RED}❌ Format: set <opsi> <nilai>{RESET}\n")
+        return
+    
+    name, raw = parts
+    current = {f.name: f for f in fields(engine.config)}
+    if name not in current:
+        print(f"  {RED}❌ Opsi '{name}' tidak dikenal. Ketik settings untuk melihat daftar opsi.{RESET}\n")
+        return
+    
+    # Konversi nilai mengikuti tipe nilai yang sedang aktif
+    old = getattr(engine.config, name)
+    try:
+        if isinstance(old, bool):
+            if raw.lower() not in ("on", "off", "true", "false", "1", "0"):
+                raise ValueError(raw)
+            value = raw.lower() in ("on", "true", "1")
+        elif isinstance(old, int):
+            value = int(raw)
+        elif isinstance(old, float):
+            value = float(raw)
+        else:
+            value = raw
+    except ValueError:
+        print(f"  {RED}❌ Nilai '{raw}' tidak valid untuk {name}{RESET}\n")
+        return
+    
+    setattr(engine.config, name, value)
+    print(f"  {GREEN}✓ {name} = {value}{RESET}\n")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -295,6 +522,17 @@ def main():
             print_banner()
         elif cmd == "dfa":
             DFATracker.print_dfa_diagram()
+        elif cmd == "settings":
+            print_settings()
+        elif cmd == "cache":
+            print_cache_stats()
+        elif cmd == "cache clear":
+            engine.result_cache.clear()
+            compile_cache.clear()
+            table_catalog.clear()
+            print(f"  {GREEN}✓ Cache dikosongkan{RESET}\n")
+        elif cmd.startswith("set "):
+            apply_setting(clean_input[4:])
         else:
             execute_sql(clean_input, verbose_mode)
 
@@ -0,0 +1,704 @@
+"""
+operators.py - Operator Fisik (Model Iterator) untuk CSV_QL
+
+Modul ini berisi operator fisik yang menjalankan Query Plan (lihat ir.py).
+Setiap langkah plan menjadi satu operator, dan operator dirangkai seperti
+pipa: operator membaca baris dari child-nya lalu meneruskan hasilnya.
+
+    Scan -> Filter -> Project -> Limit
+
+Setiap operator punya atribut columns: nama kolom untuk setiap posisi di
+baris keluarannya. Baris berupa list string posisional; operator berikutnya
+me-resolve nama kolom ke posisi sekali saat dibangun, bukan per baris.
+
+Operator sengaja tipis: bila memungkinkan, iterasi diserahkan ke builtin
+(filter, map, islice) sehingga loop per baris berjalan di C.
+
+Mode batch (EngineConfig.batch_rows > 0) memakai operator Batch*: data
+mengalir per Batch (beberapa ribu baris), filter dievaluasi per kolom untuk
+seluruh batch sekaligus, dan baris yang lolos hanya dicatat di selection
+vector. Baris keluaran dirakit (dan diproyeksikan) di operator teratas.
+
+    BatchScan -> BatchFilter -> BatchProject -> BatchLimit
+
+Query dengan GROUP BY / fungsi agregat memakai HashAggregate sesudah
+filter; child-nya boleh operator baris maupun batch.
+
+    Scan -> Filter -> HashAggregate -> Project -> Limit
+
+ORDER BY menjadi operator Sort sebelum Project. Jika LIMIT (kecil) menyusul,
+Sort hanya menyimpan K baris teratas (heap); selain itu Sort memakai external
+merge sort dengan anggaran memori (lihat sorting.py).
+
+    Scan -> Filter -> Sort -> Project -> Limit
+
+JOIN menjadi operator HashJoin dengan dua child (satu Scan per tabel), atau
+MergeJoin jika kedua tabel terurut menurut kunci; langkah sesudahnya berjalan
+di atas baris hasil join (lihat join.py).
+
+    Scan, Scan -> HashJoin | MergeJoin -> Filter -> Project -> Limit
+"""
+
+import heapq
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from vectorized import Kernel, gather
+from aggregate import Accumulator, accumulator_factory, aggregate_label
+from sorting import HEAP_MAX_ROWS, ExternalSort, SortKey, column_kinds
+from join import hash_join, merge_join
+
+
+# Filter adaptif: setiap baris ke-N dijadikan sampel pengamatan pass rate,
+# dan sampel diserahkan ke rantai adaptif per kelompok sebesar ini
+ADAPT_SAMPLE_STRIDE = 32
+ADAPT_SAMPLE_BATCH = 64
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HELPER LAYOUT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build_layout(headers: List[str]) -> Dict[str, int]:
+    """
+    Resolve nama kolom ke index posisinya di baris CSV.
+
+    Args:
+        headers: Baris header CSV
+
+    Returns:
+        Dictionary nama kolom -> index. Jika ada nama kolom ganda,
+        yang terakhir dipakai (sama seperti csv.DictReader).
+    """
+    return {name: i for i, name in enumerate(headers)}
+
+
+def build_projection(columns: List[str], layout: Dict[str, int]):
+    """
+    Buat fungsi proyeksi baris posisional ke kolom yang diminta.
+
+    Args:
+        columns: Daftar kolom yang di-SELECT
+        layout: Mapping nama kolom -> index
+
+    Returns:
+        Fungsi row -> list nilai kolom yang diminta
+
+    Raises:
+        Exception: Jika kolom tidak ada di header
+    """
+    for col in columns:
+        if col not in layout:
+            raise Exception(f"Kolom '{col}' tidak ditemukan")
+
+    indexes = [layout[col] for col in columns]
+    if len(indexes) == 1:
+        index = indexes[0]
+        return lambda row: [row[index]]
+    getter = itemgetter(*indexes)
+    return lambda row: list(getter(row))
+
+
+def normalize_rows(rows: Iterable[List[str]], width: int) -> Iterator[List[str]]:
+    """
+    Rapikan baris dari csv.reader: lewati baris kosong (sama seperti
+    csv.DictReader), lengkapi baris pendek dengan string kosong, dan
+    potong baris yang lebih panjang dari header.
+
+    Args:
+        rows: Baris dari csv.reader (tanpa header)
+        width: Jumlah kolom di header
+
+    Yields:
+        Baris dengan panjang tepat width
+    """
+    for row in rows:
+        if not row:
+            continue
+        if len(row) != width:
+            row = (row + [""] * width)[:width]
+        yield row
+
+
+class Rescan:
+    """
+    Sumber baris yang bisa diiterasi ulang: setiap iterasi memanggil scan()
+    lagi (mis. untuk MergeJoin yang bisa membaca tabel dua kali).
+    """
+
+    def __init__(self, scan: Callable[[], Iterable[List[str]]]):
+        self.scan = scan
+
+    def __iter__(self) -> Iterator[List[str]]:
+        return iter(self.scan())
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OPERATOR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Operator:
+    """
+    Basis operator fisik.
+
+    Attributes:
+        columns: Nama kolom untuk setiap posisi di baris keluaran
+    """
+    columns: List[str]
+
+    def layout(self) -> Dict[str, int]:
+        """Mapping nama kolom -> posisi di baris keluaran."""
+        return build_layout(self.columns)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        raise NotImplementedError
+
+
+class Scan(Operator):
+    """
+    Sumber baris: hasil scan tabel (csv.reader, mmap, cache kolom, ...).
+
+    Pemilihan jalur akses dan pembukaan file dilakukan oleh engine; Scan
+    hanya membungkus iterator barisnya.
+    """
+
+    def __init__(self, columns: List[str], rows: Iterable[List[str]]):
+        self.columns = columns
+        self._rows = rows
+
+    def __iter__(self) -> Iterator[List[str]]:
+        return iter(self._rows)
+
+
+class Filter(Operator):
+    """
+    Teruskan hanya baris yang memenuhi predicate.
+
+    Predicate bertipe (dibangun dengan schema) melempar ValueError/TypeError
+    untuk nilai yang tidak sesuai tipe kolom; baris itu dievaluasi ulang
+    dengan fallback (predicate tanpa asumsi tipe).
+
+    Jika predicate punya rantai adaptif (predicate.AdaptiveChain), setiap
+    baris ke-ADAPT_SAMPLE_STRIDE juga dipakai untuk mengamati pass rate
+    operand, sehingga urutan evaluasi mengikuti data yang sebenarnya.
+    Baris tetap di-stream (tidak dikumpulkan per potongan).
+    """
+
+    def __init__(self, child: Operator, predicate: Callable[[List[str]], bool],
+                 fallback: Optional[Callable[[List[str]], bool]] = None,
+                 chains: Sequence = ()):
+        self.child = child
+        self.columns = child.columns
+        self.predicate = predicate
+        self.fallback = fallback
+        self.chains = chains
+
+    def __iter__(self) -> Iterator[List[str]]:
+        if self.chains:
+            return self._filter_adaptive()
+        if self.fallback is None:
+            return filter(self.predicate, self.child)
+        return self._filter_with_fallback(self.child)
+
+    def _filter_adaptive(self) -> Iterator[List[str]]:
+        rows = iter(self.child)
+        sample: List[List[str]] = []
+        for head in rows:
+            sample.append(head)
+            if len(sample) >= ADAPT_SAMPLE_BATCH:
+                for adaptive in self.chains:
+                    adaptive.observe(sample)
+                sample = []
+
+            # Baris sampel dan ADAPT_SAMPLE_STRIDE - 1 baris sesudahnya
+            stride = chain((head,), islice(rows, ADAPT_SAMPLE_STRIDE - 1))
+            if self.fallback is None:
+                yield from filter(self.predicate, stride)
+            else:
+                yield from self._filter_with_fallback(stride)
+
+    def _filter_with_fallback(self, rows: Iterable[List[str]]) -> Iterator[List[str]]:
+        predicate, fallback = self.predicate, self.fallback
+        for row in rows:
+            try:
+                if not predicate(row):
+                    continue
+            except (ValueError, TypeError):
+                if not fallback(row):
+                    continue
+            yield row
+
+
+class Project(Operator):
+    """
+    Pilih kolom yang diminta (["*"] = semua kolom child).
+
+    Raises:
+        Exception: Jika kolom tidak ada di child (saat dibangun)
+    """
+
+    def __init__(self, child: Operator, columns: List[str]):
+        self.child = child
+        if columns == ["*"]:
+            self.columns = child.columns
+            self._project = None
+        else:
+            self.columns = columns
+            self._project = build_projection(columns, child.layout())
+
+    def __iter__(self) -> Iterator[List[str]]:
+        if self._project is None:
+            return iter(self.child)
+        return map(self._project, self.child)
+
+
+class Limit(Operator):
+    """Batasi jumlah baris (0 = tanpa batas, sama seperti LIMIT 0 di engine)."""
+
+    def __init__(self, child: Operator, count: int):
+        self.child = child
+        self.columns = child.columns
+        self.count = count
+
+    def __iter__(self) -> Iterator[List[str]]:
+        if not self.count:
+            return iter(self.child)
+        return islice(self.child, self.count)
+
+
+class Sort(Operator):
+    """
+    Urutkan baris berdasarkan kunci ORDER BY (lihat sorting.py).
+
+    Jika limit diberikan (LIMIT sesudah ORDER BY) dan tidak lebih dari
+    HEAP_MAX_ROWS, hanya limit baris teratas yang disimpan (heapq.nsmallest /
+    nlargest), jadi memori O(limit), bukan O(jumlah baris). Selain itu baris
+    diurutkan dengan external merge sort: run yang melebihi memory_bytes
+    ditulis ke file sementara di temp_dir (memory_bytes <= 0 = semua di
+    memori). Hasilnya selalu sama dengan mengurutkan semua lalu memotong.
+
+    Raises:
+        Exception: Jika kolom kunci tidak ada di child (saat dibangun)
+    """
+
+    def __init__(self, child: Operator, keys: Sequence, limit: Optional[int] = None,
+                 schema: Optional[Dict[str, str]] = None, memory_bytes: int = 0,
+                 temp_dir: str = ""):
+        self.child = child
+        self.columns = child.columns
+        self.limit = limit
+        self.memory_bytes = memory_bytes
+        self.temp_dir = temp_dir
+
+        layout = child.layout()
+        for item in keys:
+            if item.column not in layout:
+                raise Exception(f"Kolom '{item.column}' tidak ditemukan")
+        names = [item.column for item in keys]
+        self.key = SortKey([layout[name] for name in names], [item.descending for item in keys],
+                           column_kinds(names, schema))
+
+    def __iter__(self) -> Iterator[List[str]]:
+        key, reverse = self.key.row(), self.key.reverse
+        if self.limit and self.limit <= HEAP_MAX_ROWS:
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            return iter(select(self.limit, self.child, key=key))
+        if self.memory_bytes <= 0:
+            rows = sorted(self.child, key=key, reverse=reverse)
+            return iter(rows[:self.limit] if self.limit else rows)
+        return self._external()
+
+    def _external(self) -> Iterator[List[str]]:
+        sorter = ExternalSort(self.key, self.memory_bytes, self.temp_dir, self.limit)
+        try:
+            sorter.add(self.child)
+            yield from sorter.merged()
+        finally:
+            sorter.close()
+
+
+class HashJoin(Operator):
+    """
+    Inner equi-join dua child: left.left_key = right.right_key.
+
+    Sisi build (build_left) dimuat ke hash table, sisi lain di-stream.
+    Jika hash table melebihi memory_bytes, kedua sisi dipartisi ke file
+    sementara di temp_dir (grace hash join, lihat join.hash_join).
+    Kolom keluaran: kolom left lalu kolom right.
+
+    Raises:
+        Exception: Jika kolom kunci tidak ada di child (saat dibangun)
+    """
+
+    def __init__(self, left: Operator, right: Operator, left_key: str, right_key: str,
+                 build_left: bool = False, memory_bytes: int = 0, temp_dir: str = ""):
+        self.left = left
+        self.right = right
+        self.columns = left.columns + right.columns
+        self.build_left = build_left
+        self.memory_bytes = memory_bytes
+        self.temp_dir = temp_dir
+
+        for child, key in ((left, left_key), (right, right_key)):
+            if key not in child.layout():
+                raise Exception(f"Kolom '{key}' tidak ditemukan")
+        self.left_key = left.layout()[left_key]
+        self.right_key = right.layout()[right_key]
+
+    def __iter__(self) -> Iterator[List[str]]:
+        if self.build_left:
+            return hash_join(self.left, self.right, self.left_key, self.right_key, True,
+                             self.memory_bytes, self.temp_dir)
+        return hash_join(self.right, self.left, self.right_key, self.left_key, False,
+                         self.memory_bytes, self.temp_dir)
+
+
+class MergeJoin(HashJoin):
+    """
+    Inner equi-join dua child yang terurut menurut kunci (urutan string),
+    dibaca bersamaan tanpa hash table (lihat join.merge_join).
+
+    Child harus bisa diiterasi ulang: jika ditemukan kunci yang tidak
+    terurut, sisa hasil dihitung dengan hash join (build_left, memory_bytes,
+    dan temp_dir seperti HashJoin) atas scan ulang kedua child.
+    """
+
+    def __iter__(self) -> Iterator[List[str]]:
+        return merge_join(self.left, self.right, self.left_key, self.right_key,
+                          self.build_left, self.memory_bytes, self.temp_dir)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OPERATOR BATCH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Batch:
+    """
+    Sekumpulan baris sumber beserta selection vector-nya.
+
+    Batch dibuat dari potongan baris (scan biasa) atau dari kolom yang sudah
+    terpisah (cache kolom). Kolom diambil dari baris hanya jika diminta
+    kernel (batch[i]), sekali per batch; baris yang lolos tidak disalin
+    sampai dirakit di operator teratas.
+
+    Attributes:
+        size: Jumlah baris di batch
+        sel: Selection vector, index baris yang masih terpilih (terurut)
+        indexes: Posisi kolom sumber untuk setiap kolom keluaran
+                 (None = semua kolom sumber, sesuai urutan)
+    """
+    __slots__ = ("size", "sel", "indexes", "_rows", "_columns")
+
+    def __init__(self, size: int, rows: Optional[List[List[str]]] = None,
+                 columns: Optional[List[Sequence[str]]] = None):
+        self.size = size
+        self.sel: Sequence[int] = range(size)
+        self.indexes: Optional[List[int]] = None
+        self._rows = rows
+        self._columns: Dict[int, Sequence[str]] = dict(enumerate(columns or ()))
+
+    def __getitem__(self, position: int) -> Sequence[str]:
+        """Nilai kolom keluaran ke-position untuk seluruh batch."""
+        if self.indexes is not None:
+            position = self.indexes[position]
+        column = self._columns.get(position)
+        if column is None:
+            column = self._columns[position] = list(map(itemgetter(position), self._rows))
+        return column
+
+    def project(self, indexes: List[int]) -> None:
+        """Ganti kolom keluaran dengan kolom pada posisi indexes."""
+        if self.indexes is not None:
+            indexes = [self.indexes[i] for i in indexes]
+        self.indexes = indexes
+
+    def rows(self, width: int) -> Iterator[List[str]]:
+        """
+        Rakit baris terpilih.
+
+        Args:
+            width: Jumlah kolom keluaran
+        """
+        sel, indexes = self.sel, self.indexes
+        if self._rows is not None:
+            rows = gather(self._rows, sel)
+            if indexes is None:
+                return iter(rows)
+            if len(indexes) == 1:
+                index = indexes[0]
+                return ([row[index]] for row in rows)
+            return map(list, map(itemgetter(*indexes), rows))
+
+        if not width:
+            return iter([[] for _ in sel])
+        return map(list, zip(*[gather(self[i], sel) for i in range(width)]))
+
+
+class BatchOperator(Operator):
+    """
+    Basis operator mode batch. Iterasi baris merakit baris dari batches().
+    """
+
+    def batches(self) -> Iterator[Batch]:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[List[str]]:
+        width = len(self.columns)
+        return chain.from_iterable(batch.rows(width) for batch in self.batches())
+
+
+class BatchScan(BatchOperator):
+    """
+    Sumber batch: potong iterator baris menjadi batch berukuran size, atau
+    teruskan kolom yang sudah terpisah (mis. row group cache kolom).
+    """
+
+    def __init__(self, columns: List[str], rows: Optional[Iterable[List[str]]], size: int,
+                 column_groups: Optional[Iterable[List[Sequence[str]]]] = None):
+        self.columns = columns
+        self.size = size
+        self._rows = rows
+        self._groups = column_groups
+
+    def batches(self) -> Iterator[Batch]:
+        if self._groups is not None:
+            return self._split_groups()
+        return self._chunk_rows()
+
+    def _chunk_rows(self) -> Iterator[Batch]:
+        rows = iter(self._rows)
+        while True:
+            chunk = list(islice(rows, self.size))
+            if not chunk:
+                return
+            yield Batch(len(chunk), rows=chunk)
+
+    def _split_groups(self) -> Iterator[Batch]:
+        for group in self._groups:
+            count = len(group[0]) if group else 0
+            for start in range(0, count, self.size):
+                end = min(start + self.size, count)
+                yield Batch(end - start, columns=[column[start:end] for column in group])
+
+
+class BatchFilter(BatchOperator):
+    """
+    Persempit selection vector setiap batch dengan kernel (lihat vectorized.py).
+
+    Kernel bertipe melempar ValueError/TypeError untuk nilai yang tidak sesuai
+    tipe kolom; batch itu dievaluasi ulang dengan fallback (kernel tanpa
+    asumsi tipe).
+    """
+
+    def __init__(self, child: BatchOperator, kernel: Kernel,
+                 fallback: Optional[Kernel] = None):
+        self.child = child
+        self.columns = child.columns
+        self.kernel = kernel
+        self.fallback = fallback
+
+    def batches(self) -> Iterator[Batch]:
+        kernel, fallback = self.kernel, self.fallback
+        for batch in self.child.batches():
+            try:
+                sel = kernel(batch, batch.sel)
+            except (ValueError, TypeError):
+                if fallback is None:
+                    raise
+                sel = fallback(batch, batch.sel)
+            if sel:
+                batch.sel = sel
+                yield batch
+
+
+class BatchProject(BatchOperator):
+    """
+    Pilih kolom batch yang diminta (["*"] = semua kolom child). Hanya posisi
+    kolom yang dicatat; nilai baris terpilih baru diambil saat baris dirakit.
+
+    Raises:
+        Exception: Jika kolom tidak ada di child (saat dibangun)
+    """
+
+    def __init__(self, child: BatchOperator, columns: List[str]):
+        self.child = child
+        if columns == ["*"]:
+            self.columns = child.columns
+            self._indexes = None
+        else:
+            layout = child.layout()
+            for col in columns:
+                if col not in layout:
+                    raise Exception(f"Kolom '{col}' tidak ditemukan")
+            self.columns = columns
+            self._indexes = [layout[col] for col in columns]
+
+    def batches(self) -> Iterator[Batch]:
+        if self._indexes is None:
+            return self.child.batches()
+        return self._project()
+
+    def _project(self) -> Iterator[Batch]:
+        indexes = self._indexes
+        for batch in self.child.batches():
+            batch.project(indexes)
+            yield batch
+
+
+class BatchLimit(BatchOperator):
+    """Batasi jumlah baris terpilih (0 = tanpa batas)."""
+
+    def __init__(self, child: BatchOperator, count: int):
+        self.child = child
+        self.columns = child.columns
+        self.count = count
+
+    def batches(self) -> Iterator[Batch]:
+        if not self.count:
+            return self.child.batches()
+        return self._limit()
+
+    def _limit(self) -> Iterator[Batch]:
+        remaining = self.count
+        for batch in self.child.batches():
+            if len(batch.sel) >= remaining:
+                batch.sel = batch.sel[:remaining]
+                yield batch
+                return
+            remaining -= len(batch.sel)
+            yield batch
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OPERATOR AGREGASI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class HashAggregate(Operator):
+    """
+    Hash aggregation satu pass untuk GROUP BY dan fungsi agregat.
+
+    Setiap grup (nilai kolom group_by) punya satu accumulator per fungsi
+    agregat (lihat aggregate.py). Baris input dibaca sekali dan tidak
+    disimpan, jadi memori sebanding dengan jumlah grup. Grup keluar sesuai
+    urutan kemunculan pertamanya. Tanpa GROUP BY seluruh input adalah satu
+    grup, yang tetap menghasilkan satu baris walaupun input kosong.
+
+    Baris keluaran: nilai kolom group_by, lalu hasil setiap agregat.
+    Jika child operator batch, kolom yang dibutuhkan diambil per batch
+    (hanya baris terpilih) tanpa merakit baris.
+
+    Raises:
+        Exception: Jika kolom tidak ada di child (saat dibangun)
+    """
+
+    def __init__(self, child: Operator, group_by: List[str], aggregates: Sequence):
+        self.child = child
+        self.columns = list(group_by) + [aggregate_label(a) for a in aggregates]
+
+        layout = child.layout()
+        for col in list(group_by) + [a.column for a in aggregates if a.column != "*"]:
+            if col not in layout:
+                raise Exception(f"Kolom '{col}' tidak ditemukan")
+        self._keys = [layout[col] for col in group_by]
+        self._factories = [accumulator_factory(a) for a in aggregates]
+
+        # COUNT(*) tidak membaca nilai: pakai kolom mana saja yang sudah dibaca
+        named = [layout[a.column] for a in aggregates if a.column != "*"]
+        spare = (self._keys + named)[:1]
+        self._values = [layout[a.column] if a.column != "*" else spare[0] if spare else None
+                        for a in aggregates]
+        self._groups: Dict[object, List[Accumulator]] = {}
+
+    def __iter__(self) -> Iterator[List[str]]:
+        groups = self.partial()
+        if not self._keys and not groups:
+            groups[()] = [new() for new in self._factories]
+        single = len(self._keys) == 1
+        for key, state in groups.items():
+            row = [key] if single else list(key)
+            row.extend([accumulator.result() for accumulator in state])
+            yield row
+
+    def partial(self) -> Dict[object, List[Accumulator]]:
+        """
+        Baca seluruh input child ke accumulator grup (tanpa menghitung hasil).
+
+        Returns:
+            Dict key grup -> list accumulator. Key adalah nilai kolom
+            group_by (string jika satu kolom, tuple jika beberapa, () jika
+            tanpa GROUP BY).
+        """
+        if isinstance(self.child, BatchOperator):
+            for batch in self.child.batches():
+                self._accumulate_batch(batch)
+        else:
+            self._accumulate(self.child, self._keys, self._values)
+        return self._groups
+
+    def merge(self, groups: Dict[object, List[Accumulator]]) -> None:
+        """Gabungkan hasil partial() dari operator lain (mis. worker paralel)."""
+        own = self._groups
+        for key, state in groups.items():
+            current = own.get(key)
+            if current is None:
+                own[key] = state
+                continue
+            for accumulator, other in zip(current, state):
+                accumulator.merge(other)
+
+    def _accumulate_batch(self, batch: Batch) -> None:
+        sel = batch.sel
+        positions = sorted({p for p in self._keys + self._values if p is not None})
+        if not positions:
+            self._accumulate(range(len(sel)), [], self._values)
+            return
+        slot = {position: i for i, position in enumerate(positions)}
+        rows = zip(*[gather(batch[position], sel) for position in positions])
+        self._accumulate(rows, [slot[p] for p in self._keys],
+                         [slot.get(p) for p in self._values])
+
+    def _accumulate(self, rows: Iterable, keys: List[int], values: List[Optional[int]]) -> None:
+        groups, factories = self._groups, self._factories
+
+        if not keys:
+            state = groups.get(())
+            if state is None:
+                state = groups[()] = [new() for new in factories]
+            if None in values:
+                # Hanya COUNT(*) tanpa GROUP BY: cukup hitung baris
+                count = sum(1 for _ in rows)
+                for accumulator in state:
+                    accumulator.count += count
+            elif len(values) == 1:
+                add, position = state[0].add, values[0]
+                for row in rows:
+                    add(row[position])
+            else:
+                for value_row in map(itemgetter(*values), rows):
+                    for accumulator, value in zip(state, value_row):
+                        accumulator.add(value)
+            return
+
+        key_of = itemgetter(*keys)
+        if not values:
+            # GROUP BY tanpa agregat: cukup catat key
+            for key in map(key_of, rows):
+                if key not in groups:
+                    groups[key] = []
+        elif len(values) == 1:
+            new, position = factories[0], values[0]
+            for row in rows:
+                key = key_of(row)
+                state = groups.get(key)
+                if state is None:
+                    state = groups[key] = [new()]
+                state[0].add(row[position])
+        else:
+            values_of = itemgetter(*values)
+            for row in rows:
+                key = key_of(row)
+                state = groups.get(key)
+                if state is None:
+                    state = groups[key] = [new() for new in factories]
+                for accumulator, value in zip(state, values_of(row)):
+                    accumulator.add(value)
@@ -0,0 +1,437 @@
+"""
+optimizer.py - Optimasi Query Plan untuk CSV_QL
+
+Modul ini berisi rewrite pass yang dijalankan pada Query Plan (lihat ir.py)
+sesudah semantic analysis dan sebelum eksekusi. Setiap pass menerima plan
+dan mengembalikan plan baru yang hasilnya sama, tetapi lebih murah dijalankan.
+
+Pass yang tersedia (dijalankan berurutan oleh optimize):
+    - simplify_predicates: constant folding, penggabungan rentang numerik
+      per kolom (batas bawah dan atas inklusif menjadi satu Between), dan
+      rantai OR "kolom = nilai" menjadi InList (lookup set).
+      FILTER yang pasti False membuat engine melewati scan sama sekali
+    - reorder_predicates: urutkan operand rantai AND/OR berdasarkan
+      perkiraan selektivitas (dari sampel baris di katalog) dan biaya evaluasi
+
+Statistik diambil dari catalog.TableInfo: schema dan sampel baris awal.
+Sampel itu hanya perkiraan; saat scan berjalan, urutan operand masih bisa
+berubah mengikuti pass rate teramati (lihat predicate.AdaptiveChain).
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+from ast_nodes import (Expr, Op, BinaryOp, Literal, StringLiteral, Number, Identifier,
+                       BoolLiteral, InList, Between)
+from catalog import TableInfo
+from ir import QueryPlan, FilterStep
+from operators import build_layout
+from predicate import (EPSILON, compile_predicate, constant_result, estimate_cost,
+                       flatten_chain, _FLIPPED_OPS)
+
+
+# Perkiraan selektivitas tanpa sampel (gaya System R)
+DEFAULT_SELECTIVITY = {
+    Op.EQUAL: 0.1,
+    Op.NOT_EQUAL: 0.9,
+}
+DEFAULT_RANGE_SELECTIVITY = 1 / 3
+
+# Toleransi tambahan saat membandingkan jarak antar konstanta dengan EPSILON,
+# supaya pembulatan float tidak membuat rentang dianggap kosong/redundan
+# padahal masih ada nilai di batasnya
+RANGE_MARGIN = EPSILON / 2
+
+# Operator yang bisa digabung menjadi rentang per kolom (!= tidak termasuk)
+_RANGE_OPS = (Op.EQUAL, Op.GREATER_THAN, Op.LESS_THAN,
+              Op.GREATER_THAN_OR_EQ, Op.LESS_THAN_OR_EQ)
+
+
+def optimize(plan: QueryPlan, info: Optional[TableInfo] = None) -> QueryPlan:
+    """
+    Jalankan semua rewrite pass pada plan.
+
+    Args:
+        plan: Query Plan dari ast_to_ir()
+        info: Metadata tabel dari katalog (None = tanpa statistik)
+
+    Returns:
+        Query Plan hasil optimasi
+    """
+    return reorder_predicates(simplify_predicates(plan), info)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PENYEDERHANAAN PREDICATE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def simplify_predicates(plan: QueryPlan) -> QueryPlan:
+    """
+    Sederhanakan kondisi setiap FILTER (lihat simplify).
+
+    FILTER yang pasti True dihapus dari plan; FILTER yang pasti False
+    menjadi FILTER FALSE, sehingga engine tidak perlu membaca tabel.
+
+    Args:
+        plan: Query Plan
+
+    Returns:
+        Query Plan baru
+    """
+    steps = []
+    for step in plan.steps:
+        if isinstance(step, FilterStep):
+            condition = simplify(step.condition)
+            if isinstance(condition, BoolLiteral) and condition.value:
+                continue
+            step = FilterStep(condition=condition)
+        steps.append(step)
+    return QueryPlan(steps=steps)
+
+
+def simplify(expr: Expr) -> Expr:
+    """
+    Tulis ulang kondisi menjadi bentuk setara yang lebih murah.
+
+    - Perbandingan tanpa kolom dihitung sekarang (BoolLiteral)
+    - Leaf di posisi kondisi menjadi FALSE (sama dengan eval_expr)
+    - X AND FALSE = FALSE, X OR TRUE = TRUE; TRUE/FALSE netral dibuang
+    - Di rantai AND, batas numerik kolom yang sama digabung
+      (nilai > 2 AND nilai > 3 -> nilai > 3); rentang kosong menjadi FALSE.
+      Batas bawah dan atas inklusif menjadi satu Between
+      (nilai >= 2 AND nilai <= 3 -> nilai BETWEEN 2 AND 3)
+    - Di rantai OR, "kolom = nilai" untuk kolom yang sama digabung menjadi
+      InList (status = "A" OR status = "B" -> status IN ("A", "B"))
+
+    Semantik perbandingan (string, epsilon, nilai non-numerik = 0.0) tidak
+    berubah untuk baris mana pun.
+
+    Args:
+        expr: Kondisi FILTER
+
+    Returns:
+        Expression setara
+    """
+    if isinstance(expr, (BoolLiteral, InList)):
+        return expr
+    if isinstance(expr, Between):
+        result = constant_result(expr)
+        if result is not None:
+            return BoolLiteral(result)
+        merged = _merge_ranges([expr])
+        return BoolLiteral(False) if merged is None else _build_chain(merged, Op.AND)
+    if not isinstance(expr, BinaryOp):
+        return BoolLiteral(False)
+
+    if expr.op == Op.AND:
+        terms: List[Expr] = []
+        for operand in flatten_chain(expr, Op.AND):
+            operand = simplify(operand)
+            if isinstance(operand, BoolLiteral):
+                if not operand.value:
+                    return operand
+                continue
+            terms.extend(flatten_chain(operand, Op.AND))
+        merged = _merge_ranges(terms)
+        if merged is None:
+            return BoolLiteral(False)
+        return _build_chain(merged, Op.AND)
+
+    if expr.op == Op.OR:
+        terms = []
+        for operand in flatten_chain(expr, Op.OR):
+            operand = simplify(operand)
+            if isinstance(operand, BoolLiteral):
+                if operand.value:
+                    return operand
+                continue
+            terms.extend(flatten_chain(operand, Op.OR))
+        return _build_chain(_group_equalities(terms), Op.OR)
+
+    result = constant_result(expr)
+    return expr if result is None else BoolLiteral(result)
+
+
+def _build_chain(terms: List[Expr], op: Op) -> Expr:
+    """Susun operand menjadi rantai left-deep (kosong = elemen identitas)."""
+    if not terms:
+        return BoolLiteral(op == Op.AND)
+    chain = terms[0]
+    for term in terms[1:]:
+        chain = BinaryOp(left=chain, op=op, right=term)
+    return chain
+
+
+def _column_bounds(expr: Expr) -> List[Tuple[str, Op, float]]:
+    """
+    Uraikan "kolom op angka" (atau kebalikannya) menjadi [(kolom, op, angka)],
+    dan "kolom BETWEEN a AND b" menjadi batas >= a dan <= b.
+
+    Returns:
+        List batas (kosong jika expr bukan batas numerik satu kolom)
+    """
+    if isinstance(expr, Between):
+        if not (isinstance(expr.expr, Identifier) and isinstance(expr.low, Number)
+                and isinstance(expr.high, Number)):
+            return []
+        bounds = [(expr.expr.name, Op.GREATER_THAN_OR_EQ, expr.low.value),
+                  (expr.expr.name, Op.LESS_THAN_OR_EQ, expr.high.value)]
+    elif not isinstance(expr, BinaryOp) or expr.op not in _RANGE_OPS:
+        return []
+    elif isinstance(expr.left, Identifier) and isinstance(expr.right, Number):
+        bounds = [(expr.left.name, expr.op, expr.right.value)]
+    elif isinstance(expr.right, Identifier) and isinstance(expr.left, Number):
+        bounds = [(expr.right.name, _FLIPPED_OPS[expr.op], expr.left.value)]
+    else:
+        return []
+    if not all(math.isfinite(value) for _, _, value in bounds):
+        return []
+    return [(name, op, float(value)) for name, op, value in bounds]
+
+
+class _Range:
+    """Gabungan batas numerik satu kolom di dalam rantai AND."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.terms: List[Expr] = []
+        self.points: List[float] = []
+        self.low: Optional[float] = None
+        self.low_inclusive = True
+        self.high: Optional[float] = None
+        self.high_inclusive = True
+
+    def add(self, term: Expr, op: Op, value: float) -> None:
+        """Tambahkan satu batas "kolom op value" (term = expression aslinya)."""
+        if not self.terms or self.terms[-1] is not term:
+            # Between menyumbang dua batas dari satu term
+            self.terms.append(term)
+        if op == Op.EQUAL:
+            if value not in self.points:
+                self.points.append(value)
+        elif op in (Op.GREATER_THAN, Op.GREATER_THAN_OR_EQ):
+            inclusive = op == Op.GREATER_THAN_OR_EQ
+            if self.low is None or value > self.low or (value == self.low and not inclusive):
+                self.low, self.low_inclusive = value, inclusive
+        else:
+            inclusive = op == Op.LESS_THAN_OR_EQ
+            if self.high is None or value < self.high or (value == self.high and not inclusive):
+                self.high, self.high_inclusive = value, inclusive
+
+    def merged(self) -> Optional[List[Expr]]:
+        """
+        Perbandingan minimal yang setara dengan semua batas.
+
+        Returns:
+            List expression, atau None jika tidak ada nilai yang memenuhi
+        """
+        if len(self.terms) == 1 and not isinstance(self.terms[0], Between):
+            return self.terms
+
+        low, high = self.low, self.high
+        if low is not None and high is not None:
+            if low > high or (low == high and not (self.low_inclusive and self.high_inclusive)):
+                return None
+
+        if self.points:
+            # kolom = p berarti |nilai - p| < EPSILON: semua titik harus
+            # berdekatan, dan batas yang dipenuhi seluruh jendela titik redundan
+            first, last = min(self.points), max(self.points)
+            if last - first >= 2 * EPSILON + RANGE_MARGIN:
+                return None
+            if low is not None:
+                if low - first >= EPSILON + RANGE_MARGIN:
+                    return None
+                if last - low >= EPSILON + RANGE_MARGIN:
+                    low = None
+            if high is not None:
+                if last - high >= EPSILON + RANGE_MARGIN:
+                    return None
+                if high - first >= EPSILON + RANGE_MARGIN:
+                    high = None
+
+        column = Identifier(self.name)
+        terms: List[Expr] = [BinaryOp(left=column, op=Op.EQUAL, right=Number(point))
+                             for point in self.points]
+        if (low is not None and high is not None
+                and self.low_inclusive and self.high_inclusive):
+            # Satu rentang untuk zone map / sorted index / satu konversi per baris
+            terms.append(Between(expr=column, low=Number(low), high=Number(high)))
+            return terms
+        if low is not None:
+            op = Op.GREATER_THAN_OR_EQ if self.low_inclusive else Op.GREATER_THAN
+            terms.append(BinaryOp(left=column, op=op, right=Number(low)))
+        if high is not None:
+            op = Op.LESS_THAN_OR_EQ if self.high_inclusive else Op.LESS_THAN
+            terms.append(BinaryOp(left=column, op=op, right=Number(high)))
+        return terms
+
+
+def _merge_ranges(terms: List[Expr]) -> Optional[List[Expr]]:
+    """
+    Gabungkan batas numerik per kolom di operand rantai AND.
+
+    Hasil gabungan satu kolom ditempatkan di posisi operand pertamanya.
+
+    Returns:
+        List operand baru, atau None jika rantai pasti False
+    """
+    ranges: Dict[str, _Range] = {}
+    order: List[object] = []
+    for term in terms:
+        bounds = _column_bounds(term)
+        if not bounds:
+            order.append(term)
+            continue
+        for name, op, value in bounds:
+            if name not in ranges:
+                ranges[name] = _Range(name)
+                order.append(ranges[name])
+            ranges[name].add(term, op, value)
+
+    result: List[Expr] = []
+    for item in order:
+        if isinstance(item, _Range):
+            merged = item.merged()
+            if merged is None:
+                return None
+            result.extend(merged)
+        else:
+            result.append(item)
+    return result
+
+
+def _equality_values(expr: Expr) -> Optional[Tuple[str, List[Expr]]]:
+    """Uraikan "kolom = literal" atau "kolom IN (...)" menjadi (kolom, nilai)."""
+    literal = (Number, StringLiteral, Literal)
+    if isinstance(expr, InList):
+        if not expr.negated and isinstance(expr.expr, Identifier) and all(isinstance(v, literal) for v in expr.values):
+            return (expr.expr.name, expr.values)
+        return None
+    if not isinstance(expr, BinaryOp) or expr.op != Op.EQUAL:
+        return None
+    if isinstance(expr.left, Identifier) and isinstance(expr.right, literal):
+        return (expr.left.name, [expr.right])
+    if isinstance(expr.right, Identifier) and isinstance(expr.left, literal):
+        return (expr.right.name, [expr.left])
+    return None
+
+
+def _group_equalities(terms: List[Expr]) -> List[Expr]:
+    """
+    Gabungkan operand rantai OR "kolom = literal" per kolom menjadi InList.
+
+    InList ditempatkan di posisi operand pertama kolomnya; kolom yang hanya
+    punya satu operand dibiarkan apa adanya.
+    """
+    counts: Dict[str, int] = {}
+    for term in terms:
+        parsed = _equality_values(term)
+        if parsed is not None:
+            counts[parsed[0]] = counts.get(parsed[0], 0) + 1
+
+    groups: Dict[str, InList] = {}
+    seen: Dict[str, set] = {}
+    result: List[Expr] = []
+    for term in terms:
+        parsed = _equality_values(term)
+        if parsed is None or counts[parsed[0]] < 2:
+            result.append(term)
+            continue
+        name, values = parsed
+        if name not in groups:
+            groups[name] = InList(expr=Identifier(name), values=[])
+            seen[name] = set()
+            result.append(groups[name])
+        for value in values:
+            # String dan Literal setara; angka dibedakan dari string
+            key = (isinstance(value, Number), value.value)
+            if key not in seen[name]:
+                seen[name].add(key)
+                groups[name].values.append(value)
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# URUTAN PREDICATE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def reorder_predicates(plan: QueryPlan, info: Optional[TableInfo] = None) -> QueryPlan:
+    """
+    Urutkan ulang operand rantai AND/OR di setiap FILTER.
+
+    Operand AND diurutkan naik menurut biaya / peluang gagal, operand OR
+    menurut biaya / peluang lolos: predicate murah yang paling sering
+    memutus short-circuit dievaluasi lebih dulu. Hasil boolean tidak berubah.
+
+    Args:
+        plan: Query Plan
+        info: Metadata tabel (sumber schema dan sampel baris)
+
+    Returns:
+        Query Plan baru
+    """
+    estimator = _Estimator(info)
+    steps = [FilterStep(condition=estimator.reorder(step.condition))
+             if isinstance(step, FilterStep) else step
+             for step in plan.steps]
+    return QueryPlan(steps=steps)
+
+
+class _Estimator:
+    """Perkiraan selektivitas dan biaya expression untuk satu tabel."""
+
+    def __init__(self, info: Optional[TableInfo]):
+        self.schema: Dict[str, str] = info.schema if info is not None else {}
+        self.sample: List[List[str]] = info.sample if info is not None else []
+        self.layout = build_layout(info.header) if info is not None else {}
+
+    def reorder(self, expr: Expr) -> Expr:
+        """Urutkan operand rantai AND/OR (rekursif, dari dalam ke luar)."""
+        if not isinstance(expr, BinaryOp) or expr.op not in (Op.AND, Op.OR):
+            return expr
+
+        operands = [self.reorder(operand) for operand in flatten_chain(expr, expr.op)]
+        if expr.op == Op.AND:
+            rank = lambda e: self.cost(e) / (1 - self.selectivity(e))
+        else:
+            rank = lambda e: self.cost(e) / self.selectivity(e)
+        operands.sort(key=rank)
+
+        chain = operands[0]
+        for operand in operands[1:]:
+            chain = BinaryOp(left=chain, op=expr.op, right=operand)
+        return chain
+
+    def cost(self, expr: Expr) -> float:
+        """Biaya relatif evaluasi expr (lihat predicate.estimate_cost)."""
+        return estimate_cost(expr, self.schema)
+
+    def selectivity(self, expr: Expr) -> float:
+        """
+        Perkiraan proporsi baris yang lolos expr, selalu di antara 0 dan 1
+        (tidak pernah tepat 0 atau 1 supaya rank tetap terhingga).
+        """
+        if self.sample:
+            try:
+                pred = compile_predicate(expr, self.layout)
+            except Exception:
+                pred = None
+            if pred is not None:
+                passed = sum(1 for row in self.sample if pred(row))
+                # Laplace smoothing
+                return (passed + 1) / (len(self.sample) + 2)
+
+        if isinstance(expr, BinaryOp) and expr.op in (Op.AND, Op.OR):
+            result = 1.0 if expr.op == Op.AND else 0.0
+            for operand in flatten_chain(expr, expr.op):
+                s = self.selectivity(operand)
+                result = result * s if expr.op == Op.AND else result + s - result * s
+            return min(max(result, 0.001), 0.999)
+        if isinstance(expr, InList):
+            selectivity = min(DEFAULT_SELECTIVITY[Op.EQUAL] * len(expr.values), 0.999)
+            return 1.0 - selectivity if expr.negated else selectivity
+        if isinstance(expr, Between):
+            return DEFAULT_RANGE_SELECTIVITY
+        if isinstance(expr, BinaryOp):
+            return DEFAULT_SELECTIVITY.get(expr.op, DEFAULT_RANGE_SELECTIVITY)
+        return 0.5
@@ -0,0 +1,414 @@
+"""
+parallel.py - Scan Paralel berbasis Byte Range untuk CSV_QL
+
+Modul ini membagi file CSV menjadi beberapa potongan byte (byte range) yang
+sejajar dengan batas record, lalu memfilter dan memproyeksikan setiap potongan
+di proses worker (concurrent.futures.ProcessPoolExecutor).
+
+Alur:
+    1. Baca header dan tentukan offset awal data
+    2. Bagi sisa file menjadi byte range yang berakhir tepat di batas record
+    3. Setiap worker: decode potongan -> jalankan Query Plan (FILTER, PROJECT, ...)
+    4. Hasil digabung kembali sesuai urutan file
+    5. Jika LIMIT sudah terpenuhi, potongan yang belum jalan dibatalkan
+
+Query dengan agregasi (GROUP BY / COUNT, SUM, ...): worker hanya menjalankan
+plan sampai langkah AGGREGATE dan mengirim accumulator per grup (agregasi
+parsial). Proses utama menggabungkannya, lalu menjalankan sisa plan.
+
+Query dengan ORDER BY: setiap worker mengurutkan potongannya (cukup K baris
+teratas jika ada LIMIT), lalu proses utama menggabungkan potongan yang sudah
+terurut dengan k-way merge. Potongan yang tidak muat di anggaran memori
+ditulis ke file sementara dulu (lihat sorting.ExternalSort).
+
+Batas record dicari dengan menghitung paritas tanda kutip ("): newline hanya
+dianggap akhir record jika jumlah tanda kutip sebelumnya genap. Dengan begitu
+newline di dalam field yang di-quote tidak memotong record. Escape "" juga
+aman karena selalu menambah dua tanda kutip. Paritas hanya dipakai jika
+setiap kutip pembuka berada di awal field; kutip di tengah field tanpa quote
+(12" monitor) membuat batas dicari baris demi baris dengan aturan module csv
+(lihat scanner.ends_in_quotes).
+File dengan dialect lain atau newline CR saja tidak dibagi (lihat
+engine.use_parallel).
+
+Pool worker disimpan di level modul sehingga tetap hidup antar query di REPL.
+"""
+
+import atexit
+import csv
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from ir import (QueryPlan, AggregateStep, SortStep, ProjectStep, LimitStep, plan_table,
+                plan_limit, step_position)
+from scanner import ends_in_quotes
+
+
+# Ukuran blok baca saat mencari batas record
+_BLOCK_SIZE = 1024 * 1024
+
+# Byte yang boleh mendahului kutip pembuka field
+_FIELD_START = (b',', b'\n', b'"')
+
+# Pool worker yang dipakai ulang antar query
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POOL WORKER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Ambil pool worker yang sedang aktif, atau buat baru jika belum ada /
+    jumlah worker berubah.
+
+    Args:
+        workers: Jumlah proses worker
+
+    Returns:
+        ProcessPoolExecutor yang persisten
+    """
+    global _pool, _pool_workers
+
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Matikan pool worker (dipanggil otomatis saat program keluar)."""
+    global _pool, _pool_workers
+
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        _pool_workers = 0
+
+
+atexit.register(shutdown_pool)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BATAS RECORD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def next_record_start(f, start: int, pos: int) -> int:
+    """
+    Cari awal record pertama yang berada sesudah posisi pos.
+
+    Jalur cepat menghitung paritas tanda kutip di level byte; jika ada kutip
+    yang tidak berada di awal field (mis. 12" monitor), paritas tidak lagi
+    sama dengan aturan module csv dan batas dicari ulang baris demi baris.
+
+    Args:
+        f: File yang dibuka dalam mode binary
+        start: Offset awal record yang sudah diketahui, start <= pos
+        pos: Posisi kandidat
+
+    Returns:
+        Offset awal record berikutnya, atau ukuran file jika tidak ada lagi
+    """
+    offset = _parity_record_start(f, start, pos)
+    if offset is None:
+        offset = _exact_record_start(f, start, pos)
+    return offset
+
+
+def _parity_record_start(f, start: int, pos: int) -> Optional[int]:
+    """
+    next_record_start lewat paritas kutip: newline adalah akhir record jika
+    jumlah tanda kutip sebelumnya genap.
+
+    Returns:
+        Offset awal record berikutnya, atau None jika ada kutip pembuka
+        (menurut paritas) yang tidak berada di awal field
+    """
+    f.seek(start)
+    offset = start
+    quotes = 0
+    prev = b'\n'           # byte sebelum blok (start selalu awal record)
+    while True:
+        block = f.read(_BLOCK_SIZE)
+        if not block:
+            return offset
+        if b'"' in block and not _opens_at_field_start(block, quotes, prev):
+            return None
+
+        i = max(pos - offset, 0)
+        if i >= len(block):
+            quotes += block.count(b'"')
+        else:
+            # Maju dari pos sampai newline yang berada di luar field ber-quote
+            quotes += block.count(b'"', 0, i)
+            while True:
+                newline = block.find(b'\n', i)
+                if newline < 0:
+                    quotes += block.count(b'"', i)
+                    break
+                quotes += block.count(b'"', i, newline)
+                if quotes % 2 == 0:
+                    return offset + newline + 1
+                i = newline + 1
+        prev = block[-1:]
+        offset += len(block)
+
+
+def _opens_at_field_start(block: bytes, quotes: int, prev: bytes) -> bool:
+    """
+    Apakah setiap kutip yang membuka field menurut paritas (kutip ke-0, 2,
+    4, ... sejak awal record) berada di awal field: sesudah koma, newline,
+    atau kutip lain (escape ""). Jika ya, paritas sama dengan aturan csv.
+
+    Args:
+        block: Potongan file
+        quotes: Jumlah tanda kutip sebelum block
+        prev: Byte terakhir sebelum block
+    """
+    pieces = block.split(b'"')
+    # pieces[j] berada tepat sebelum kutip ke-(quotes + j)
+    openers = pieces[quotes % 2:-1:2]
+    if openers and quotes % 2 == 0 and not openers[0]:
+        openers[0] = prev
+    return all(not piece or piece[-1:] in _FIELD_START for piece in openers)
+
+
+def _exact_record_start(f, start: int, pos: int) -> int:
+    """next_record_start baris demi baris dengan scanner.ends_in_quotes."""
+    f.seek(start)
+    offset = start          # offset awal pending (selalu awal baris)
+    pending = b''
+    quoted = False          # field ber-quote masih terbuka di akhir baris sebelumnya
+    while True:
+        block = f.read(_BLOCK_SIZE)
+        if not block:
+            return offset + len(pending)
+        data = pending + block
+        lines_end = data.rfind(b'\n') + 1
+        if not lines_end:
+            pending = data
+            continue
+
+        if not quoted and b'"' not in data[:lines_end]:
+            # Tanpa tanda kutip: setiap newline adalah batas record
+            if offset + lines_end > pos:
+                return offset + data.find(b'\n', max(pos - offset, 0)) + 1
+        else:
+            i = 0
+            while i < lines_end:
+                newline = data.find(b'\n', i)
+                line = data[i:newline]
+                if quoted or b'"' in line:
+                    quoted = ends_in_quotes(line, quoted)
+                i = newline + 1
+                if not quoted and offset + i > pos:
+                    return offset + i
+
+        pending = data[lines_end:]
+        offset += lines_end
+
+
+def iter_ranges(f, start: int, size: int, chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    """
+    Bagi file CSV menjadi byte range yang sejajar dengan batas record.
+
+    Range dihasilkan secara lazy, jadi query dengan LIMIT tidak perlu
+    menelusuri seluruh file hanya untuk mencari batas potongan.
+
+    Args:
+        f: File yang dibuka dalam mode binary
+        start: Offset awal data (sesudah header)
+        size: Ukuran file
+        chunk_bytes: Ukuran kira-kira satu potongan
+
+    Yields:
+        Tuple (start, end) berurutan sesuai file
+    """
+    chunk_bytes = max(1, chunk_bytes)
+    while start < size:
+        end = size
+        if start + chunk_bytes < size:
+            end = next_record_start(f, start, start + chunk_bytes)
+        yield (start, end)
+        start = end
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCAN PARALEL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _scan_range(path: str, start: int, end: int, header: List[str], plan,
+                use_mmap: bool, schema: Optional[Dict[str, str]]):
+    """
+    Worker: jalankan plan (filter, proyeksi, ...) pada satu byte range.
+
+    Dijalankan di proses worker, jadi semua argumen harus bisa di-pickle
+    (plan dan AST berupa dataclass, jadi aman).
+
+    Returns:
+        List baris hasil, atau accumulator per grup (HashAggregate.partial)
+        jika langkah terakhir plan adalah AGGREGATE
+    """
+    from engine import build_pipeline, table_pipeline, open_mmap_table, table_info
+    from operators import Scan, HashAggregate, normalize_rows
+
+    if use_mmap:
+        table = open_mmap_table(path, table_info(path))
+        if table is not None:
+            with table:
+                pipeline = table_pipeline(plan, table, schema,
+                                          lambda indexes: table.scan(indexes, start, end))
+                if isinstance(pipeline, HashAggregate):
+                    return pipeline.partial()
+                return list(pipeline)
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    reader = csv.reader(io.StringIO(data.decode('utf-8'), newline=''))
+    source = Scan(header, normalize_rows(reader, len(header)))
+    pipeline = build_pipeline(plan, source, schema=schema)
+    if isinstance(pipeline, HashAggregate):
+        return pipeline.partial()
+    return list(pipeline)
+
+
+def parallel_scan(plan, workers: int, chunk_bytes: int, use_mmap: bool = False,
+                  schema: Optional[Dict[str, str]] = None, sort_memory_bytes: int = 0,
+                  sort_temp_dir: str = "") -> Iterator:
+    """
+    Jalankan Query Plan dengan scan paralel.
+
+    Sama seperti engine.execute_query_iter: item pertama adalah headers,
+    lalu baris hasil sesuai urutan file. Setiap worker menjalankan seluruh
+    plan pada potongannya; LIMIT diterapkan lagi pada hasil gabungan.
+
+    Args:
+        plan: Query Plan (lihat ir.py)
+        workers: Jumlah proses worker
+        chunk_bytes: Ukuran kira-kira satu potongan
+        use_mmap: Worker membaca potongan lewat scanner mmap
+        schema: Tipe kolom (lihat engine.execute_query)
+        sort_memory_bytes: Anggaran memori penggabungan ORDER BY (0 = semua di memori)
+        sort_temp_dir: Direktori file sementara ORDER BY ("" = default sistem)
+
+    Yields:
+        headers, lalu setiap baris hasil
+    """
+    from engine import build_pipeline, build_operators
+    from operators import Scan, HashAggregate
+    from sorting import ExternalSort, SortKey, column_kinds
+
+    path = plan_table(plan)
+    limit = plan_limit(plan)
+
+    # Agregasi: worker berhenti di langkah AGGREGATE (hasil parsial per grup).
+    # ORDER BY: worker berhenti di langkah SORT, dengan kolom kunci tetap ikut
+    # di baris hasil supaya potongan bisa digabung sesuai urutan.
+    position = step_position(plan, AggregateStep)
+    sort_at = step_position(plan, SortStep) if position is None else None
+    worker_plan = plan
+    if position is not None:
+        worker_plan = QueryPlan(steps=plan.steps[:position + 1])
+    elif sort_at is not None:
+        sort_columns = _sort_output_columns(plan, sort_at)
+        steps = plan.steps[:sort_at + 1] + [ProjectStep(columns=sort_columns)]
+        if limit:
+            steps.append(LimitStep(count=limit))
+        worker_plan = QueryPlan(steps=steps)
+
+    with open(path, 'rb') as f:
+        # 1. Header dan offset awal data
+        size = os.fstat(f.fileno()).st_size
+        data_start = next_record_start(f, 0, 0)
+        f.seek(0)
+        header_bytes = f.read(data_start)
+        header = next(csv.reader(io.StringIO(header_bytes.decode('utf-8'), newline='')), [])
+        yield build_pipeline(plan, Scan(header, ())).columns
+        aggregate = None
+        if position is not None:
+            step = plan.steps[position]
+            aggregate = HashAggregate(Scan(header, ()), step.group_by, step.aggregates)
+        sorter = None
+        if sort_at is not None:
+            columns = header if sort_columns == ["*"] else sort_columns
+            keys = plan.steps[sort_at].keys
+            names = [item.column for item in keys]
+            layout = {name: i for i, name in enumerate(columns)}
+            key = SortKey([layout[name] for name in names], [item.descending for item in keys],
+                          column_kinds(names, schema))
+            budget = sort_memory_bytes if sort_memory_bytes > 0 else float("inf")
+            sorter = ExternalSort(key, budget, sort_temp_dir, limit)
+
+        # 2. Kirim potongan ke pool. Jumlah task yang berjalan dibatasi supaya
+        #    hasil yang menunggu diambil tidak menumpuk di memori.
+        pool = get_pool(workers)
+        ranges = iter_ranges(f, data_start, size, chunk_bytes)
+        pending = deque()
+        window = workers * 2
+        count = 0
+
+        try:
+            while True:
+                for start, end in ranges:
+                    pending.append(pool.submit(_scan_range, path, start, end,
+                                               header, worker_plan, use_mmap, schema))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    break
+
+                # 3. Gabungkan hasil sesuai urutan file
+                result = pending.popleft().result()
+                if aggregate is not None:
+                    aggregate.merge(result)
+                    continue
+                if sorter is not None:
+                    sorter.add_sorted(result)
+                    continue
+                for row in result:
+                    yield row
+                    count += 1
+                    if limit and count >= limit:
+                        return
+        except BaseException:
+            if sorter is not None:
+                sorter.close()
+            raise
+        finally:
+            # 4. LIMIT terpenuhi / consumer berhenti: batalkan potongan yang tersisa
+            for future in pending:
+                future.cancel()
+
+    # 5. Agregasi: sisa plan (PROJECT, LIMIT) dijalankan di atas grup gabungan
+    if aggregate is not None:
+        yield from build_operators(aggregate, plan.steps[position + 1:], schema=schema)
+
+    # 6. ORDER BY: gabungkan potongan terurut, lalu jalankan sisa plan
+    if sorter is not None:
+        try:
+            yield from build_operators(Scan(columns, sorter.merged()), plan.steps[sort_at + 1:],
+                                       schema=schema)
+        finally:
+            sorter.close()
+
+
+def _sort_output_columns(plan: QueryPlan, sort_at: int) -> List[str]:
+    """
+    Kolom baris hasil worker untuk plan dengan ORDER BY: kolom yang
+    dibutuhkan PROJECT sesudahnya ditambah kolom kunci SORT (["*"] = semua).
+    """
+    columns: List[str] = []
+    for step in plan.steps[sort_at + 1:]:
+        if isinstance(step, ProjectStep):
+            if step.columns == ["*"]:
+                return ["*"]
+            columns.extend(step.columns)
+    columns.extend(item.column for item in plan.steps[sort_at].keys)
+    return list(dict.fromkeys(columns))
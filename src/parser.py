@@ -29,15 +29,25 @@ TUGAS YANG HARUS DIKERJAKAN:
 
 GRAMMAR (dalam pseudo-BNF):
 ---------------------------
-query       ::= SELECT columns FROM table [WHERE expr] [LIMIT number]
-columns     ::= column (',' column)* | '*'
-column      ::= IDENTIFIER
-table       ::= IDENTIFIER
+statement   ::= query | create_index
+query       ::= SELECT columns FROM table [JOIN table ON column '=' column]
+                [WHERE expr] [GROUP BY column (',' column)*]
+                [ORDER BY order_item (',' order_item)*] [LIMIT number]
+create_index ::= CREATE INDEX ON table '(' column ')' [USING (HASH | SORTED)]
+columns     ::= item (',' item)*
+item        ::= '*' | column | aggregate
+aggregate   ::= func '(' (column | '*') ')'       ('*' hanya untuk COUNT)
+func        ::= COUNT | SUM | AVG | MIN | MAX     (hanya jika diikuti '(')
+order_item  ::= (column | aggregate) [ASC | DESC]
+column      ::= IDENTIFIER | soft_keyword
+table       ::= IDENTIFIER | soft_keyword
+soft_keyword ::= keyword yang juga boleh jadi nama (tokens.SOFT_KEYWORDS)
 expr        ::= and_expr (OR and_expr)*
 and_expr    ::= cmp_expr (AND cmp_expr)*
-cmp_expr    ::= leaf (op leaf)?
+cmp_expr    ::= leaf (op leaf)? | leaf [NOT] IN '(' leaf (',' leaf)* ')'
+                | leaf BETWEEN leaf AND leaf
 op          ::= '=' | '!=' | '>' | '<' | '>=' | '<='
-leaf        ::= IDENTIFIER | NUMBER | STRING_LITERAL
+leaf        ::= column | NUMBER | STRING_LITERAL
 
 REFERENSI:
 ----------
@@ -53,8 +63,20 @@ TIPS:
 """
 
 from typing import Optional, List
-from tokens import Token, TokenType
-from ast_nodes import Statement, SelectStatement, Expr, Op, BinaryOp, Identifier, Number, StringLiteral
+from tokens import Token, TokenType, SOFT_KEYWORDS
+from ast_nodes import (Statement, SelectStatement, CreateIndexStatement, Expr, Op, BinaryOp, Identifier,
+                       Number, StringLiteral, AggFunc, Aggregate, SelectItem, OrderItem,
+                       JoinClause, InList, Between)
+
+
+# Token fungsi agregat -> AggFunc
+AGGREGATE_TOKENS = {
+    TokenType.COUNT: AggFunc.COUNT,
+    TokenType.SUM: AggFunc.SUM,
+    TokenType.AVG: AggFunc.AVG,
+    TokenType.MIN: AggFunc.MIN,
+    TokenType.MAX: AggFunc.MAX,
+}
 
 
 class Parser:
@@ -106,6 +128,35 @@ class Parser:
             return True
         return False
     
+    def peek_type(self) -> Optional[TokenType]:
+        """Dapatkan tipe token sesudah token saat ini tanpa memajukan posisi."""
+        if self.pos + 1 >= len(self.tokens):
+            return None
+        return self.tokens[self.pos + 1].type
+    
+    def match_name(self) -> Optional[str]:
+        """
+        Ambil nama kolom/tabel pada token saat ini: IDENTIFIER, atau keyword
+        yang di luar klausanya boleh dipakai sebagai nama (SOFT_KEYWORDS,
+        mis. kolom "count" atau "desc"). Jika ada, maju ke token berikutnya.
+        
+        Returns:
+            Nama, atau None jika token saat ini bukan nama
+        """
+        token = self.current()
+        if token is None:
+            return None
+        if token.type == TokenType.IDENTIFIER or token.type in SOFT_KEYWORDS:
+            self.advance()
+            return token.value
+        return None
+    
+    def at_aggregate(self) -> bool:
+        """Apakah token saat ini fungsi agregat, yaitu COUNT/SUM/... yang diikuti '('."""
+        token = self.current()
+        return (token is not None and token.type in AGGREGATE_TOKENS
+                and self.peek_type() == TokenType.LPAREN)
+    
     # ─────────────────────────────────────────────────────────────────────────
     # PARSING METHODS
     # ─────────────────────────────────────────────────────────────────────────
@@ -120,13 +171,18 @@ class Parser:
         Raises:
             Exception: Jika parsing gagal
         """
+        token = self.current()
+        if token is not None and token.type == TokenType.CREATE:
+            return self.parse_create_index()
         return self.parse_select()
     
     def parse_select(self) -> Statement:
         """
         Parse statement SELECT.
         
-        Format: SELECT columns FROM table [WHERE expr] [LIMIT number]
+        Format: SELECT columns FROM table [JOIN table ON column '=' column]
+                [WHERE expr] [GROUP BY column (',' column)*]
+                [ORDER BY order_item (',' order_item)*] [LIMIT number]
         """
         # 1. Cek & makan token SELECT
         if not self.match_token(TokenType.SELECT):
@@ -140,18 +196,43 @@ class Parser:
             raise Exception("Expected FROM keyword")
         
         # 4. Ambil nama table (IDENTIFIER)
-        token = self.current()
-        if token is None or token.type != TokenType.IDENTIFIER:
+        table = self.match_name()
+        if table is None:
             raise Exception("Expected table name (identifier)")
-        table = token.value
-        self.advance()
+        
+        # 4b. Cek JOIN (opsional) -> tabel kedua dan kunci ON
+        join: Optional[JoinClause] = None
+        if self.match_token(TokenType.JOIN):
+            join = self.parse_join()
         
         # 5. Cek WHERE (opsional) -> parse expression
         where_clause: Optional[Expr] = None
         if self.match_token(TokenType.WHERE):
             where_clause = self.parse_expression()
         
-        # 6. Cek LIMIT (opsional) -> ambil angka
+        # 6. Cek GROUP BY (opsional) -> daftar kolom
+        group_by: List[str] = []
+        if self.match_token(TokenType.GROUP):
+            if not self.match_token(TokenType.BY):
+                raise Exception("Expected BY after GROUP")
+            while True:
+                column = self.match_name()
+                if column is None:
+                    raise Exception("Expected column name after GROUP BY")
+                group_by.append(column)
+                if not self.match_token(TokenType.COMMA):
+                    break
+        
+        # 7. Cek ORDER BY (opsional) -> daftar kunci urutan
+        order_by: List[OrderItem] = []
+        if self.match_token(TokenType.ORDER):
+            if not self.match_token(TokenType.BY):
+                raise Exception("Expected BY after ORDER")
+            order_by.append(self.parse_order_item())
+            while self.match_token(TokenType.COMMA):
+                order_by.append(self.parse_order_item())
+        
+        # 8. Cek LIMIT (opsional) -> ambil angka
         limit: Optional[int] = None
         if self.match_token(TokenType.LIMIT):
             token = self.current()
@@ -160,23 +241,93 @@ class Parser:
             limit = int(token.value)
             self.advance()
         
-        # 7. Return Statement
+        # 9. Return Statement
         return SelectStatement(
             columns=columns,
             table=table,
             where_clause=where_clause,
-            limit=limit
+            limit=limit,
+            group_by=group_by,
+            order_by=order_by,
+            join=join
         )
     
-    def parse_columns(self) -> List[str]:
+    def parse_join(self) -> JoinClause:
+        """
+        Parse klausa JOIN (sesudah token JOIN).
+        
+        Format: table ON column '=' column
+        """
+        table = self.match_name()
+        if table is None:
+            raise Exception("Expected table name after JOIN")
+        
+        if not self.match_token(TokenType.ON):
+            raise Exception("Expected ON after JOIN table")
+        left = self.match_name()
+        if left is None:
+            raise Exception("Expected column name after ON")
+        if not self.match_token(TokenType.EQUAL):
+            raise Exception("Expected '=' in JOIN condition")
+        right = self.match_name()
+        if right is None:
+            raise Exception("Expected column name after '=' in JOIN condition")
+        
+        return JoinClause(table=table, left=left, right=right)
+    
+    def parse_create_index(self) -> Statement:
+        """
+        Parse statement CREATE INDEX.
+        
+        Format: CREATE INDEX ON table '(' column ')' [USING (HASH | SORTED)]
+        """
+        # 1. Makan token CREATE INDEX ON
+        if not self.match_token(TokenType.CREATE):
+            raise Exception("Expected CREATE keyword")
+        if not self.match_token(TokenType.INDEX):
+            raise Exception("Expected INDEX after CREATE")
+        if not self.match_token(TokenType.ON):
+            raise Exception("Expected ON after CREATE INDEX")
+        
+        # 2. Ambil nama table (IDENTIFIER)
+        table = self.match_name()
+        if table is None:
+            raise Exception("Expected table name (identifier)")
+        
+        # 3. Ambil nama kolom di dalam kurung
+        if not self.match_token(TokenType.LPAREN):
+            raise Exception("Expected '(' after table name")
+        column = self.match_name()
+        if column is None:
+            raise Exception("Expected column name (identifier)")
+        if not self.match_token(TokenType.RPAREN):
+            raise Exception("Expected ')' after column name")
+        
+        # 4. Jenis index (opsional, default HASH)
+        kind = "hash"
+        if self.match_token(TokenType.USING):
+            token = self.current()
+            if (token is None or token.type != TokenType.IDENTIFIER
+                    or token.value.lower() not in ("hash", "sorted")):
+                raise Exception("Expected HASH or SORTED after USING")
+            kind = token.value.lower()
+            self.advance()
+        
+        return CreateIndexStatement(table=table, column=column, kind=kind)
+    
+    def parse_columns(self) -> List[SelectItem]:
         """
         Parse daftar kolom.
         
-        Format: column (',' column)* | '*'
+        Format: item (',' item)*
+                item := '*' | column | func '(' (column | '*') ')'
+                func := COUNT | SUM | AVG | MIN | MAX
+        
+        Nama fungsi tanpa '(' sesudahnya dibaca sebagai nama kolom.
         """
-        columns: List[str] = []
+        columns: List[SelectItem] = []
         
-        # Loop: ambil IDENTIFIER atau STAR
+        # Loop: ambil IDENTIFIER, STAR, atau fungsi agregat
         while True:
             token = self.current()
             
@@ -187,12 +338,15 @@ class Parser:
             if token.type == TokenType.STAR:
                 columns.append("*")
                 self.advance()
+            # Cek fungsi agregat
+            elif self.at_aggregate():
+                columns.append(self.parse_aggregate())
             # Cek IDENTIFIER
-            elif token.type == TokenType.IDENTIFIER:
-                columns.append(token.value)
-                self.advance()
             else:
-                break
+                column = self.match_name()
+                if column is None:
+                    break
+                columns.append(column)
             
             # Jika ada COMMA, lanjutkan loop
             if not self.match_token(TokenType.COMMA):
@@ -203,6 +357,51 @@ class Parser:
         
         return columns
     
+    def parse_aggregate(self) -> Aggregate:
+        """
+        Parse fungsi agregat.
+        
+        Format: func '(' (column | '*') ')'   ('*' hanya untuk COUNT)
+        """
+        func = AGGREGATE_TOKENS[self.current().type]
+        self.advance()
+        
+        if not self.match_token(TokenType.LPAREN):
+            raise Exception(f"Expected '(' after {func.name}")
+        token = self.current()
+        if token is not None and token.type == TokenType.STAR and func == AggFunc.COUNT:
+            column = "*"
+            self.advance()
+        else:
+            column = self.match_name()
+            if column is None:
+                raise Exception(f"Expected column name inside {func.name}()")
+        if not self.match_token(TokenType.RPAREN):
+            raise Exception(f"Expected ')' after {func.name} argument")
+        
+        return Aggregate(func=func, column=column)
+    
+    def parse_order_item(self) -> OrderItem:
+        """
+        Parse satu kunci ORDER BY.
+        
+        Format: (column | func '(' (column | '*') ')') [ASC | DESC]
+        """
+        if self.at_aggregate():
+            column = self.parse_aggregate()
+        else:
+            column = self.match_name()
+            if column is None:
+                raise Exception("Expected column name after ORDER BY")
+        
+        descending = False
+        if self.match_token(TokenType.DESC):
+            descending = True
+        else:
+            self.match_token(TokenType.ASC)
+        
+        return OrderItem(column=column, descending=descending)
+    
     def parse_expression(self) -> Expr:
         """Parse ekspresi (entry point untuk WHERE clause)."""
         return self.parse_logic_or()
@@ -239,7 +438,7 @@ class Parser:
         """
         Parse operasi perbandingan.
         
-        Format: leaf (op leaf)?
+        Format: leaf (op leaf)? | leaf [NOT] IN (leaf, ...) | leaf BETWEEN leaf AND leaf
         """
         left = self.parse_leaf()
         
@@ -248,6 +447,17 @@ class Parser:
         if token is None:
             return left
         
+        if token.type in (TokenType.IN, TokenType.NOT):
+            return self.parse_in_list(left)
+        
+        if token.type == TokenType.BETWEEN:
+            self.advance()  # Makan BETWEEN
+            low = self.parse_leaf()
+            if not self.match_token(TokenType.AND):
+                raise Exception("Expected AND between BETWEEN bounds")
+            high = self.parse_leaf()
+            return Between(expr=left, low=low, high=high)
+        
         op: Optional[Op] = None
         
         if token.type == TokenType.EQUAL:
@@ -271,9 +481,40 @@ class Parser:
         
         return left
     
+    def parse_in_list(self, left: Expr) -> InList:
+        """
+        Parse keanggotaan setelah operand kiri.
+        
+        Format: [NOT] IN '(' leaf (',' leaf)* ')'
+        
+        Raises:
+            Exception: Jika list kosong atau tanda kurung tidak lengkap
+        """
+        negated = self.match_token(TokenType.NOT)
+        if not self.match_token(TokenType.IN):
+            raise Exception("Expected IN after NOT")
+        if not self.match_token(TokenType.LPAREN):
+            raise Exception("Expected '(' after IN")
+        
+        token = self.current()
+        if token is not None and token.type == TokenType.RPAREN:
+            raise Exception("Expected at least one value in IN list")
+        
+        values = [self.parse_leaf()]
+        while self.match_token(TokenType.COMMA):
+            values.append(self.parse_leaf())
+        
+        if not self.match_token(TokenType.RPAREN):
+            raise Exception("Expected ')' after IN list")
+        
+        return InList(expr=left, values=values, negated=negated)
+    
     def parse_leaf(self) -> Expr:
         """
         Parse leaf expression (identifier, number, atau string literal).
+        
+        Keyword seperti min, count, desc, atau in di posisi leaf dibaca
+        sebagai nama kolom.
         """
         token = self.current()
         
@@ -281,9 +522,9 @@ class Parser:
             raise Exception("Unexpected end of input")
         
         # Jika IDENTIFIER -> return Identifier
-        if token.type == TokenType.IDENTIFIER:
-            self.advance()
-            return Identifier(name=token.value)
+        name = self.match_name()
+        if name is not None:
+            return Identifier(name=name)
         
         # Jika NUMBER -> return Number
         if token.type == TokenType.NUMBER:
@@ -315,6 +556,14 @@ if __name__ == "__main__":
         "SELECT * FROM data.csv WHERE status = \"Lulus\" OR nilai_huruf = \"A\"",
         "SELECT nama, nilai FROM data.csv LIMIT 5",
         'SELECT * FROM data.csv WHERE status = "Tidak Lulus" LIMIT 10',
+        "CREATE INDEX ON data.csv (nim)",
+        "CREATE INDEX ON data.csv (nilai) USING SORTED",
+        "SELECT COUNT(*) FROM data.csv",
+        "SELECT mata_kuliah, AVG(nilai), MAX(nilai) FROM data.csv GROUP BY mata_kuliah",
+        "SELECT nama, nilai FROM data.csv ORDER BY nilai DESC, nama LIMIT 10",
+        "SELECT nama, alamat FROM data.csv JOIN mhs.csv ON data.nim = mhs.nim",
+        'SELECT * FROM data.csv WHERE nim IN ("001", "002") AND semester NOT IN (1, 2)',
+        "SELECT * FROM data.csv WHERE nilai BETWEEN 2.0 AND 3.0 AND semester = 5",
     ]
     
     print("=" * 70)
@@ -335,9 +584,16 @@ if __name__ == "__main__":
             ast = parser.parse()
             
             # Print AST
+            if isinstance(ast, CreateIndexStatement):
+                print(f"  Index: {ast.table} ({ast.column}) USING {ast.kind.upper()}")
+                print("  ✅ Parsing berhasil!")
+                continue
             print(f"  Columns: {ast.columns}")
             print(f"  Table: {ast.table}")
+            print(f"  Join: {ast.join}")
             print(f"  Where: {ast.where_clause}")
+            print(f"  Group By: {ast.group_by}")
+            print(f"  Order By: {ast.order_by}")
             print(f"  Limit: {ast.limit}")
             print("  ✅ Parsing berhasil!")
             
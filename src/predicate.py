@@ -0,0 +1,730 @@
+"""
+predicate.py - Predicate Compiler untuk CSV_QL
+
+Modul ini mengubah WHERE clause (AST) menjadi satu closure Python yang sudah
+terspesialisasi, dibangun SEKALI sebelum scan dimulai.
+
+engine.eval_expr menelusuri pohon BinaryOp untuk setiap baris: cek isinstance,
+bandingkan Op, lalu panggil get_string_value/get_value. Di sini semua keputusan
+itu diambil saat kompilasi:
+    - dispatch operator  -> dipilih satu closure khusus per operator
+    - konversi literal   -> Number/StringLiteral jadi konstanta Python
+    - lookup kolom       -> nama kolom diikat langsung ke closure
+
+Semantik hasil kompilasi sama persis dengan engine.eval_expr (reference path),
+termasuk perbandingan float dengan epsilon dan nilai 0.0 untuk data non-numerik.
+
+Baris bisa berupa dict (nama kolom -> nilai, seperti csv.DictReader) atau
+list posisional (seperti csv.reader). Untuk baris posisional, berikan layout
+{nama kolom: index} sehingga setiap kolom diikat ke index-nya sekali saja.
+
+Jika schema (hasil catalog.infer_schema) diberikan, kolom bertipe "int" atau
+"float" dibandingkan dengan komparator bertipe: konversi float() langsung tanpa
+try/except dan tanpa lapisan fungsi tambahan. Komparator bertipe MELEMPAR
+ValueError/TypeError untuk nilai yang ternyata tidak numerik; pemanggil harus
+menangkapnya dan mengevaluasi ulang baris itu dengan predicate tanpa schema
+(lihat operators.Filter).
+
+Contoh:
+    pred = compile_predicate(ast.where_clause)
+    rows = [row for row in dict_reader if pred(row)]
+
+    pred = compile_predicate(ast.where_clause, {"nim": 0, "status": 7})
+    rows = [row for row in csv_reader if pred(row)]
+"""
+
+import math
+import operator
+from bisect import bisect_left
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from ast_nodes import (Expr, Op, BinaryOp, Literal, StringLiteral, Number, Identifier,
+                       BoolLiteral, InList, Between)
+
+
+# Predicate: fungsi yang menerima satu baris dan mengembalikan bool
+Predicate = Callable[[Any], bool]
+
+# Layout baris posisional: nama kolom -> index di dalam baris
+Layout = Dict[str, int]
+
+# Schema kolom: nama kolom -> "int" | "float" | "string" (lihat catalog.infer_schema)
+Schema = Dict[str, str]
+
+# Threshold perbandingan float (sama dengan engine.eval_expr)
+EPSILON = 1e-9
+
+# Tipe kolom yang boleh memakai komparator bertipe
+_NUMERIC_TYPES = ("int", "float")
+
+# Operator perbandingan numerik (selain = dan !=)
+_NUMERIC_OPS = {
+    Op.GREATER_THAN: operator.gt,
+    Op.LESS_THAN: operator.lt,
+    Op.GREATER_THAN_OR_EQ: operator.ge,
+    Op.LESS_THAN_OR_EQ: operator.le,
+}
+
+# Operator kebalikan, untuk menormalkan "konstanta op kolom" menjadi "kolom op konstanta"
+_FLIPPED_OPS = {
+    Op.EQUAL: Op.EQUAL,
+    Op.NOT_EQUAL: Op.NOT_EQUAL,
+    Op.GREATER_THAN: Op.LESS_THAN,
+    Op.LESS_THAN: Op.GREATER_THAN,
+    Op.GREATER_THAN_OR_EQ: Op.LESS_THAN_OR_EQ,
+    Op.LESS_THAN_OR_EQ: Op.GREATER_THAN_OR_EQ,
+}
+
+
+# Perkiraan biaya relatif evaluasi satu perbandingan (lihat estimate_cost)
+COST_COMPARE = 1
+COST_FLOAT = 1
+COST_FLOAT_UNTYPED = 3
+
+# Rantai adaptif: jumlah minimum baris teramati sebelum urutan operand diubah,
+# dan jendela pengamatan (hitungan dibagi dua agar perubahan data terkejar)
+ADAPT_MIN_ROWS = 64
+ADAPT_WINDOW_ROWS = 1024
+
+
+def _always(result: bool) -> Predicate:
+    """Buat predicate konstan (hasil sudah diketahui saat kompilasi)."""
+    return lambda row: result
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KOMPILASI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def compile_predicate(expr: Optional[Expr], layout: Optional[Layout] = None,
+                      schema: Optional[Schema] = None) -> Predicate:
+    """
+    Kompilasi WHERE clause menjadi closure.
+
+    Args:
+        expr: Expression dari WHERE clause (None = tanpa filter)
+        layout: Mapping nama kolom -> index untuk baris posisional.
+                None berarti baris berupa dict (nama kolom -> nilai).
+        schema: Tipe kolom. Kolom numerik memakai komparator bertipe yang
+                bisa melempar ValueError/TypeError (lihat docstring modul).
+
+    Returns:
+        Fungsi pred(row) -> bool
+
+    Raises:
+        Exception: Jika kolom di WHERE clause tidak ada di layout
+    """
+    if expr is None:
+        return _always(True)
+    return _Compiler(layout, schema).compile(expr)
+
+
+def compile_adaptive_predicate(expr: Optional[Expr], layout: Optional[Layout] = None,
+                               schema: Optional[Schema] = None) -> Tuple[Predicate, List['AdaptiveChain']]:
+    """
+    Seperti compile_predicate, tetapi setiap rantai AND/OR dikompilasi
+    menjadi AdaptiveChain yang urutan evaluasinya bisa diubah saat scan
+    berjalan (lihat operators.Filter).
+
+    Args:
+        expr: Expression dari WHERE clause (None = tanpa filter)
+        layout: Lihat compile_predicate()
+        schema: Lihat compile_predicate()
+
+    Returns:
+        Tuple (predicate, list AdaptiveChain di dalam predicate)
+    """
+    if expr is None:
+        return (_always(True), [])
+    compiler = _Compiler(layout, schema, adaptive=True)
+    return (compiler.compile(expr), compiler.chains)
+
+
+def estimate_cost(expr: Expr, schema: Optional[Schema] = None) -> float:
+    """
+    Perkiraan biaya relatif mengevaluasi expr untuk satu baris.
+
+    Mengikuti bentuk closure hasil kompilasi: perbandingan string paling
+    murah, kolom numerik bertipe butuh satu float(), kolom tanpa tipe
+    numerik butuh float() di dalam try/except (mahal untuk nilai teks).
+    Rantai AND/OR dihitung sebagai jumlah biaya operand (batas atas).
+
+    Args:
+        expr: Expression
+        schema: Tipe kolom
+
+    Returns:
+        Biaya relatif (0 untuk expression konstan)
+    """
+    if isinstance(expr, InList):
+        # Satu lookup set (ditambah float() jika ada nilai angka)
+        if not isinstance(expr.expr, Identifier):
+            return 0.0
+        if all(isinstance(value, (StringLiteral, Literal)) for value in expr.values):
+            return float(COST_COMPARE)
+        typed = (schema or {}).get(expr.expr.name) in _NUMERIC_TYPES
+        return float(COST_COMPARE + (COST_FLOAT if typed else COST_FLOAT_UNTYPED))
+    if isinstance(expr, Between):
+        # Satu konversi nilai untuk kedua batas
+        columns = [side.name for side in (expr.expr, expr.low, expr.high)
+                   if isinstance(side, Identifier)]
+        if not columns:
+            return 0.0
+        schema = schema or {}
+        return float(COST_COMPARE + sum(
+            COST_FLOAT if schema.get(name) in _NUMERIC_TYPES else COST_FLOAT_UNTYPED
+            for name in columns))
+    if not isinstance(expr, BinaryOp):
+        return 0.0
+    if expr.op in (Op.AND, Op.OR):
+        return sum(estimate_cost(operand, schema) for operand in flatten_chain(expr, expr.op))
+
+    sides = (expr.left, expr.right)
+    columns = [side.name for side in sides if isinstance(side, Identifier)]
+    if not columns:
+        return 0.0
+
+    string_valued = (Identifier, StringLiteral, Literal)
+    if expr.op in (Op.EQUAL, Op.NOT_EQUAL) and all(isinstance(side, string_valued) for side in sides):
+        return float(COST_COMPARE)
+
+    schema = schema or {}
+    return float(COST_COMPARE + sum(
+        COST_FLOAT if schema.get(name) in _NUMERIC_TYPES else COST_FLOAT_UNTYPED
+        for name in columns))
+
+
+def column_getter(name: str, layout: Optional[Layout] = None) -> Callable[[Any], Optional[str]]:
+    """
+    Buat fungsi pengambil nilai kolom, diselesaikan sekali saat kompilasi.
+
+    Args:
+        name: Nama kolom
+        layout: Mapping nama kolom -> index (None untuk baris dict)
+
+    Returns:
+        Fungsi row -> nilai kolom
+    """
+    if layout is None:
+        return lambda row: row.get(name)
+    if name not in layout:
+        raise Exception(f"Kolom '{name}' tidak ditemukan")
+    return operator.itemgetter(layout[name])
+
+
+class AdaptiveChain:
+    """
+    Rantai AND/OR yang urutan evaluasinya mengikuti pass rate teramati.
+
+    Closure rantai membaca list preds, jadi mengurutkan ulang list itu
+    (in place) langsung mengubah urutan evaluasi tanpa biaya per baris.
+    Urutan awal adalah urutan expression (hasil optimizer); urutan baru
+    dipakai setelah cukup baris diamati lewat observe().
+
+    Attributes:
+        op: Op.AND atau Op.OR
+        preds: Predicate operand sesuai urutan evaluasi saat ini
+    """
+
+    def __init__(self, op: Op, preds: List[Predicate], costs: List[float]):
+        self.op = op
+        self.preds = list(preds)
+        # Per operand: [predicate, biaya, jumlah lolos, jumlah teramati]
+        self._entries = [[pred, cost, 0, 0] for pred, cost in zip(preds, costs)]
+
+    def observe(self, rows: Sequence[Any]) -> None:
+        """
+        Evaluasi setiap operand (tanpa short-circuit) pada sampel baris,
+        lalu urutkan ulang operand jika sudah cukup data.
+
+        Args:
+            rows: Sampel baris dari scan
+        """
+        for entry in self._entries:
+            pred = entry[0]
+            passed = seen = 0
+            for row in rows:
+                try:
+                    if pred(row):
+                        passed += 1
+                except (ValueError, TypeError):
+                    # Nilai tidak sesuai schema: tidak dihitung
+                    continue
+                seen += 1
+            entry[2] += passed
+            entry[3] += seen
+            if entry[3] > ADAPT_WINDOW_ROWS:
+                entry[2] //= 2
+                entry[3] //= 2
+
+        if min(entry[3] for entry in self._entries) >= ADAPT_MIN_ROWS:
+            self.preds[:] = [entry[0] for entry in sorted(self._entries, key=self._rank)]
+
+    def _rank(self, entry: list) -> float:
+        """
+        Urutan optimal operand independen: AND menaikkan biaya / peluang gagal,
+        OR menaikkan biaya / peluang lolos. Pass rate dihaluskan (Laplace).
+        """
+        _, cost, passed, seen = entry
+        selectivity = (passed + 1) / (seen + 2)
+        if self.op == Op.AND:
+            return cost / (1 - selectivity)
+        return cost / selectivity
+
+
+class _Compiler:
+    """Kompilasi expression untuk satu bentuk baris (dict atau posisional)."""
+
+    def __init__(self, layout: Optional[Layout], schema: Optional[Schema] = None,
+                 adaptive: bool = False):
+        self.layout = layout
+        self.schema = schema or {}
+        self.adaptive = adaptive
+        self.chains: List[AdaptiveChain] = []
+
+    def is_typed(self, name: str) -> bool:
+        """Apakah kolom memakai komparator bertipe (kolom numerik di schema)."""
+        return self.schema.get(name) in _NUMERIC_TYPES
+
+    def compile(self, expr: Expr) -> Predicate:
+        """Kompilasi satu node expression."""
+        if isinstance(expr, BoolLiteral):
+            return _always(expr.value)
+
+        if isinstance(expr, InList):
+            return self.compile_membership(expr)
+
+        if isinstance(expr, Between):
+            return self.compile_between(expr)
+
+        if not isinstance(expr, BinaryOp):
+            # Leaf di posisi kondisi selalu False (sama dengan eval_expr)
+            return _always(False)
+
+        if expr.op in (Op.AND, Op.OR):
+            return self.compile_logic(expr)
+
+        if expr.op in (Op.EQUAL, Op.NOT_EQUAL):
+            return self.compile_equality(expr)
+
+        return self.compile_numeric(expr)
+
+
+    def compile_logic(self, expr: BinaryOp) -> Predicate:
+        """
+        Kompilasi rantai AND/OR dengan short-circuit sesuai urutan expression
+        (mode adaptif: urutan AdaptiveChain).
+        """
+        operands = flatten_chain(expr, expr.op)
+        preds = [self.compile(operand) for operand in operands]
+
+        adaptive = self.adaptive and len(preds) > 1
+        if adaptive:
+            chain = AdaptiveChain(expr.op, preds,
+                                  [estimate_cost(operand, self.schema) for operand in operands])
+            self.chains.append(chain)
+            preds = chain.preds
+
+        if expr.op == Op.AND:
+            if len(preds) == 2 and not adaptive:
+                left, right = preds
+                return lambda row: left(row) and right(row)
+
+            def all_of(row) -> bool:
+                for pred in preds:
+                    if not pred(row):
+                        return False
+                return True
+            return all_of
+
+        if len(preds) == 2 and not adaptive:
+            left, right = preds
+            return lambda row: left(row) or right(row)
+
+        def any_of(row) -> bool:
+            for pred in preds:
+                if pred(row):
+                    return True
+            return False
+        return any_of
+
+    def compile_membership(self, expr: InList) -> Predicate:
+        """
+        Kompilasi "kolom IN (nilai, ...)" menjadi lookup frozenset.
+
+        Nilai string dicocokkan persis (seperti = string). Nilai angka
+        dicocokkan numerik dengan epsilon: lookup set untuk nilai yang sama
+        persis, lalu cek tetangga terdekat di list terurut (bisect) untuk
+        nilai yang hanya berbeda kurang dari EPSILON. NOT IN adalah negasi
+        dari predicate IN.
+        """
+        if expr.negated:
+            member = self.compile_membership(replace(expr, negated=False))
+            return lambda row: not member(row)
+
+        values = expr.values
+        literal = (Number, StringLiteral, Literal)
+        numbers = [value.value for value in values if isinstance(value, Number)]
+        if (not isinstance(expr.expr, Identifier)
+                or not all(isinstance(value, literal) for value in values)
+                or not all(math.isfinite(number) for number in numbers)):
+            # Bentuk umum: evaluasi sebagai rantai OR biasa
+            return self.compile(expand_in_list(expr))
+
+        name = expr.expr.name
+        get = column_getter(name, self.layout)
+        strings = frozenset(value.value for value in values
+                            if isinstance(value, (StringLiteral, Literal)))
+        if not numbers:
+            return lambda row: get(row) in strings
+
+        near = number_matcher(numbers)
+        invalid = near(0.0)
+
+        if self.is_typed(name):
+            # Komparator bertipe: tanpa try/except (lihat docstring modul)
+            number_pred = lambda row: near(float(get(row)))
+        else:
+            def number_pred(row) -> bool:
+                try:
+                    return near(float(get(row)))
+                except (ValueError, TypeError):
+                    return invalid
+
+        if not strings:
+            return number_pred
+        return lambda row: get(row) in strings or number_pred(row)
+
+    def compile_between(self, expr: Between) -> Predicate:
+        """
+        Kompilasi "expr BETWEEN low AND high": nilai expr diambil dan
+        dikonversi sekali, lalu dibandingkan berantai low <= nilai <= high.
+        """
+        result = constant_result(expr)
+        if result is not None:
+            return _always(result)
+
+        low, high = _constant_value(expr.low), _constant_value(expr.high)
+        if low is None or high is None or not isinstance(expr.expr, Identifier):
+            # Batas berupa kolom: tetap satu konversi per sisi
+            value = self.numeric_source(expr.expr)
+            low_val = self.numeric_source(expr.low)
+            high_val = self.numeric_source(expr.high)
+            return lambda row: low_val(row) <= value(row) <= high_val(row)
+
+        name = expr.expr.name
+        get = column_getter(name, self.layout)
+        if self.is_typed(name):
+            # Komparator bertipe: tanpa try/except (lihat docstring modul)
+            return lambda row: low <= float(get(row)) <= high
+
+        invalid = low <= 0.0 <= high
+
+        def pred(row) -> bool:
+            try:
+                return low <= float(get(row)) <= high
+            except (ValueError, TypeError):
+                return invalid
+        return pred
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # SUMBER NILAI
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def string_source(self, expr: Expr) -> Optional[Callable[[Any], Optional[str]]]:
+        """
+        Versi kompilasi dari engine.get_string_value.
+
+        Returns:
+            Fungsi row -> str, atau None jika expr tidak punya nilai string
+        """
+        if isinstance(expr, (StringLiteral, Literal)):
+            value = expr.value
+            return lambda row: value
+        if isinstance(expr, Identifier):
+            return column_getter(expr.name, self.layout)
+        return None
+
+    def numeric_source(self, expr: Expr) -> Callable[[Any], float]:
+        """Versi kompilasi dari engine.get_value."""
+        if isinstance(expr, Number):
+            value = expr.value
+            return lambda row: value
+        if isinstance(expr, Identifier):
+            get = column_getter(expr.name, self.layout)
+            if self.is_typed(expr.name):
+                return lambda row: float(get(row))
+
+            def column_value(row) -> float:
+                try:
+                    return float(get(row))
+                except (ValueError, TypeError):
+                    return 0.0
+            return column_value
+        return lambda row: 0.0
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # PERBANDINGAN
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def compile_equality(self, expr: BinaryOp) -> Predicate:
+        """Kompilasi = dan != (string jika kedua sisi punya nilai string, selain itu numerik)."""
+        negate = expr.op == Op.NOT_EQUAL
+        left_str = self.string_source(expr.left)
+        right_str = self.string_source(expr.right)
+
+        if left_str is not None and right_str is not None:
+            left_is_column = isinstance(expr.left, Identifier)
+            right_is_column = isinstance(expr.right, Identifier)
+
+            # Kedua sisi literal: hasil bisa dihitung sekarang
+            if not left_is_column and not right_is_column:
+                return _always((expr.left.value == expr.right.value) != negate)
+
+            # Kolom vs literal: konstanta diikat langsung
+            if left_is_column != right_is_column:
+                get = left_str if left_is_column else right_str
+                value = expr.right.value if left_is_column else expr.left.value
+                if negate:
+                    return lambda row: get(row) != value
+                return lambda row: get(row) == value
+
+            if negate:
+                return lambda row: left_str(row) != right_str(row)
+            return lambda row: left_str(row) == right_str(row)
+
+        return self.compile_numeric(expr)
+
+    def compile_numeric(self, expr: BinaryOp) -> Predicate:
+        """Kompilasi perbandingan numerik (termasuk = dan != dengan epsilon)."""
+        op = expr.op
+        left_const = _constant_value(expr.left)
+        right_const = _constant_value(expr.right)
+
+        # Kedua sisi konstan: constant folding
+        if left_const is not None and right_const is not None:
+            return _always(_compare(op, left_const, right_const))
+
+        # Satu sisi kolom, sisi lain konstan: normalkan ke "kolom op konstanta"
+        if left_const is None and right_const is not None:
+            return self.column_vs_constant(expr.left.name, op, right_const)
+        if left_const is not None and right_const is None:
+            return self.column_vs_constant(expr.right.name, _FLIPPED_OPS[op], left_const)
+
+        # Kolom vs kolom
+        left_val = self.numeric_source(expr.left)
+        right_val = self.numeric_source(expr.right)
+        if op == Op.EQUAL:
+            return lambda row: abs(left_val(row) - right_val(row)) < EPSILON
+        if op == Op.NOT_EQUAL:
+            return lambda row: abs(left_val(row) - right_val(row)) > EPSILON
+        cmp = _NUMERIC_OPS[op]
+        return lambda row: cmp(left_val(row), right_val(row))
+
+    def column_vs_constant(self, name: str, op: Op, const: float) -> Predicate:
+        """
+        Closure khusus untuk "kolom op konstanta".
+
+        Nilai yang tidak bisa dikonversi ke float dianggap 0.0 (seperti get_value),
+        sehingga hasil untuk kasus itu juga bisa dihitung saat kompilasi.
+        """
+        get = column_getter(name, self.layout)
+        invalid = _compare(op, 0.0, const)
+
+        if self.is_typed(name):
+            # Komparator bertipe: tanpa try/except (lihat docstring modul)
+            if op == Op.EQUAL:
+                return lambda row: abs(float(get(row)) - const) < EPSILON
+            if op == Op.NOT_EQUAL:
+                return lambda row: abs(float(get(row)) - const) > EPSILON
+            if op == Op.GREATER_THAN:
+                return lambda row: float(get(row)) > const
+            if op == Op.LESS_THAN:
+                return lambda row: float(get(row)) < const
+            if op == Op.GREATER_THAN_OR_EQ:
+                return lambda row: float(get(row)) >= const
+            return lambda row: float(get(row)) <= const
+
+        if op == Op.EQUAL:
+            def pred(row) -> bool:
+                try:
+                    return abs(float(get(row)) - const) < EPSILON
+                except (ValueError, TypeError):
+                    return invalid
+            return pred
+
+        if op == Op.NOT_EQUAL:
+            def pred(row) -> bool:
+                try:
+                    return abs(float(get(row)) - const) > EPSILON
+                except (ValueError, TypeError):
+                    return invalid
+            return pred
+
+        cmp = _NUMERIC_OPS[op]
+
+        def pred(row) -> bool:
+            try:
+                return cmp(float(get(row)), const)
+            except (ValueError, TypeError):
+                return invalid
+        return pred
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HELPER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def flatten_chain(expr: Expr, op: Op) -> List[Expr]:
+    """
+    Ratakan rantai AND/OR (pohon left-deep dari parser) menjadi list operand.
+
+    Dilakukan secara iteratif supaya rantai panjang tidak menyentuh batas rekursi.
+
+    Args:
+        expr: Akar rantai
+        op: Op.AND atau Op.OR
+
+    Returns:
+        List operand sesuai urutan sumber
+    """
+    operands: List[Expr] = []
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, BinaryOp) and node.op == op:
+            stack.append(node.right)
+            stack.append(node.left)
+        else:
+            operands.append(node)
+    return operands
+
+
+def expr_columns(expr: Optional[Expr]) -> List[str]:
+    """
+    Kumpulkan nama kolom yang direferensikan sebuah expression.
+
+    Args:
+        expr: Expression (boleh None)
+
+    Returns:
+        List nama kolom unik sesuai urutan kemunculan
+    """
+    columns: List[str] = []
+    stack = [expr] if expr is not None else []
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Identifier):
+            if node.name not in columns:
+                columns.append(node.name)
+        elif isinstance(node, BinaryOp):
+            stack.append(node.right)
+            stack.append(node.left)
+        elif isinstance(node, InList):
+            stack.extend(reversed(node.values))
+            stack.append(node.expr)
+        elif isinstance(node, Between):
+            stack.extend((node.high, node.low, node.expr))
+    return columns
+
+
+def expand_between(expr: Between) -> Expr:
+    """
+    Ubah "x BETWEEN a AND b" menjadi "x >= a AND x <= b".
+
+    Args:
+        expr: Node Between
+
+    Returns:
+        Expression setara tanpa Between
+    """
+    return BinaryOp(left=BinaryOp(left=expr.expr, op=Op.GREATER_THAN_OR_EQ, right=expr.low),
+                    op=Op.AND,
+                    right=BinaryOp(left=expr.expr, op=Op.LESS_THAN_OR_EQ, right=expr.high))
+
+
+def expand_in_list(expr: InList) -> Expr:
+    """
+    Ubah "x IN (a, b, ...)" menjadi rantai OR "x = a OR x = b OR ...".
+
+    Args:
+        expr: Node InList (minimal satu nilai)
+
+    Returns:
+        Expression setara tanpa InList
+    """
+    chain: Expr = BinaryOp(left=expr.expr, op=Op.EQUAL, right=expr.values[0])
+    for value in expr.values[1:]:
+        chain = BinaryOp(left=chain, op=Op.OR,
+                         right=BinaryOp(left=expr.expr, op=Op.EQUAL, right=value))
+    return chain
+
+
+def number_matcher(numbers: List[float]) -> Callable[[float], bool]:
+    """
+    Buat fungsi value -> apakah |value - n| < EPSILON untuk salah satu n.
+
+    Nilai yang sama persis ditemukan lewat lookup frozenset; selebihnya cukup
+    memeriksa dua tetangga terdekat di list terurut (bisect), karena hanya
+    mereka yang mungkin berjarak kurang dari EPSILON.
+
+    Args:
+        numbers: Konstanta angka (berhingga)
+
+    Returns:
+        Fungsi pencocok
+    """
+    ordered = sorted(set(numbers))
+    exact = frozenset(ordered)
+    count = len(ordered)
+
+    def near(value: float) -> bool:
+        if value in exact:
+            return True
+        i = bisect_left(ordered, value)
+        return ((i < count and ordered[i] - value < EPSILON)
+                or (i > 0 and value - ordered[i - 1] < EPSILON))
+    return near
+
+
+def constant_result(expr: Union[BinaryOp, Between]) -> Optional[bool]:
+    """
+    Hasil perbandingan yang tidak mereferensikan kolom.
+
+    Args:
+        expr: BinaryOp perbandingan (bukan AND/OR) atau Between
+
+    Returns:
+        True/False sesuai semantik eval_expr, atau None jika hasilnya
+        bergantung pada nilai kolom
+    """
+    if isinstance(expr, Between):
+        values = [_constant_value(side) for side in (expr.low, expr.expr, expr.high)]
+        if None in values:
+            return None
+        return values[0] <= values[1] <= values[2]
+    if isinstance(expr.left, Identifier) or isinstance(expr.right, Identifier):
+        return None
+    string_valued = (StringLiteral, Literal)
+    if (expr.op in (Op.EQUAL, Op.NOT_EQUAL)
+            and isinstance(expr.left, string_valued) and isinstance(expr.right, string_valued)):
+        return (expr.left.value == expr.right.value) != (expr.op == Op.NOT_EQUAL)
+    return _compare(expr.op, _constant_value(expr.left), _constant_value(expr.right))
+
+
+def _constant_value(expr: Expr) -> Optional[float]:
+    """Nilai numerik expr jika bisa diketahui saat kompilasi (bukan kolom)."""
+    if isinstance(expr, Number):
+        return expr.value
+    if isinstance(expr, Identifier):
+        return None
+    return 0.0
+
+
+def _compare(op: Op, left: float, right: float) -> bool:
+    """Bandingkan dua float dengan semantik yang sama seperti eval_expr."""
+    if op == Op.EQUAL:
+        return abs(left - right) < EPSILON
+    if op == Op.NOT_EQUAL:
+        return abs(left - right) > EPSILON
+    return _NUMERIC_OPS[op](left, right)
@@ -0,0 +1,415 @@
+"""
+scanner.py - Memory-Mapped CSV Scanner untuk CSV_QL
+
+Modul ini membaca tabel (ScanStep) lewat mmap, bukan lewat file text-mode +
+module csv. Batas record dicari langsung di mmap dengan find(), dan hanya
+field yang direferensikan query yang di-decode menjadi string.
+
+Alur per record:
+    1. Cari newline berikutnya dengan mm.find(b'\\n')
+    2. Record tanpa tanda kutip -> split(b',') pada level byte, ambil index
+       yang dibutuhkan, lalu decode hanya field tersebut
+    3. Record dengan tanda kutip -> record diperpanjang selama masih ada
+       field ber-quote yang terbuka (newline di dalam field), lalu di-parse
+       oleh module csv
+
+Seperti module csv, tanda kutip hanya membuka field ber-quote jika berada di
+awal field (awal record atau tepat sesudah koma). Kutip di tengah field
+tanpa quote (9,12" monitor,100) adalah karakter biasa.
+
+Hanya dialect standar (koma, tanda kutip ", tanpa escapechar, newline LF/CRLF,
+encoding UTF-8) yang didukung. Untuk dialect lain MmapTable.open() mengembalikan
+None sehingga engine kembali ke csv.reader biasa.
+"""
+
+import csv
+import io
+import mmap
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DIALECT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def supports_dialect(dialect) -> bool:
+    """
+    Cek apakah dialect CSV bisa dibaca oleh scanner mmap.
+
+    Args:
+        dialect: Dialect csv (class atau instance, mis. csv.excel)
+
+    Returns:
+        True jika dialect setara dengan CSV standar (RFC 4180)
+    """
+    return (dialect.delimiter == ','
+            and dialect.quotechar == '"'
+            and dialect.doublequote
+            and dialect.escapechar is None
+            and not dialect.skipinitialspace)
+
+
+def cr_newlines(data) -> bool:
+    """
+    Cek apakah data (bytes atau mmap) memakai newline gaya CR saja.
+
+    Batas record untuk file seperti ini tidak bisa dicari dengan b'\\n',
+    jadi scanner mmap dan scan paralel menyerahkannya ke module csv.
+    """
+    return data.find(b'\n') < 0 and data.find(b'\r') >= 0
+
+
+def supports_file(path: str, dialect=csv.excel) -> bool:
+    """
+    Cek apakah batas record file bisa dicari langsung di level byte
+    (dialect standar, newline LF/CRLF). Dipakai sebelum scan paralel.
+
+    Args:
+        path: Path file CSV
+        dialect: Dialect CSV yang dipakai file
+
+    Returns:
+        True jika file kosong atau formatnya didukung
+    """
+    if not supports_dialect(dialect):
+        return False
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # File kosong
+            return True
+        with mm:
+            return not cr_newlines(mm)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MMAP TABLE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class MmapTable:
+    """
+    File CSV yang dipetakan ke memori (read-only).
+
+    Attributes:
+        path: Path file CSV
+        header: List nama kolom
+        data_start: Offset byte awal data (sesudah header)
+        size: Ukuran file dalam byte
+    """
+
+    def __init__(self, path: str, f, mm: mmap.mmap, header: List[str], data_start: int):
+        self.path = path
+        self.header = header
+        self.data_start = data_start
+        self.size = len(mm)
+        self._file = f
+        self._mm = mm
+
+    @classmethod
+    def open(cls, path: str, dialect=csv.excel) -> Optional['MmapTable']:
+        """
+        Buka file CSV dengan mmap.
+
+        Args:
+            path: Path file CSV
+            dialect: Dialect CSV yang dipakai file
+
+        Returns:
+            MmapTable, atau None jika file/dialect tidak didukung
+            (misalnya file kosong atau newline hanya berupa CR)
+        """
+        if not supports_dialect(dialect):
+            return None
+
+        f = open(path, 'rb')
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # File kosong tidak bisa di-mmap
+            f.close()
+            return None
+
+        if cr_newlines(mm):
+            # Newline gaya CR saja: serahkan ke module csv
+            mm.close()
+            f.close()
+            return None
+
+        header_end = _record_end(mm, 0, len(mm))
+        header = _parse_quoted(mm[0:header_end])
+        return cls(path, f, mm, header, header_end)
+
+    def close(self) -> None:
+        """Tutup mmap dan file."""
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> 'MmapTable':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def quoted_ratio(self, sample: int = 1000) -> float:
+        """
+        Perkirakan proporsi record yang mengandung tanda kutip.
+
+        Record ber-quote di-parse lewat module csv, jadi untuk file yang
+        sebagian besar record-nya ber-quote, csv.reader biasa lebih cepat.
+
+        Args:
+            sample: Jumlah record awal yang diperiksa
+
+        Returns:
+            Rasio 0.0 - 1.0 (0.0 untuk tabel tanpa data)
+        """
+        total = quoted = 0
+        for _, record in self.iter_records():
+            total += 1
+            if b'"' in record:
+                quoted += 1
+            if total >= sample:
+                break
+        return quoted / total if total else 0.0
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # SCAN
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def iter_records(self, start: Optional[int] = None,
+                     end: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """
+        Iterasi record mentah (tanpa newline penutup) beserta offset-nya.
+
+        Args:
+            start: Offset awal (default: awal data). Harus di batas record.
+            end: Offset akhir (default: akhir file)
+
+        Yields:
+            Tuple (offset, record_bytes). Baris kosong dilewati.
+        """
+        mm = self._mm
+        find = mm.find
+        pos = self.data_start if start is None else start
+        end = self.size if end is None else end
+
+        while pos < end:
+            newline = find(b'\n', pos, end)
+            stop = end if newline < 0 else newline
+            record = mm[pos:stop]
+            offset = pos
+            pos = stop + 1
+
+            if b'"' in record and ends_in_quotes(record):
+                # Newline di dalam field ber-quote: perpanjang record
+                pos = _record_end(mm, offset, end)
+                record = mm[offset:pos]
+                if record.endswith(b'\n'):
+                    record = record[:-1]
+
+            if record.endswith(b'\r'):
+                record = record[:-1]
+            if record:
+                yield (offset, record)
+
+    def scan(self, indexes: List[int], start: Optional[int] = None,
+             end: Optional[int] = None) -> Iterator[List[str]]:
+        """
+        Scan record dan decode hanya kolom pada indexes.
+
+        Args:
+            indexes: Index kolom (di header) yang dibutuhkan, berurutan
+            start: Offset awal (default: awal data)
+            end: Offset akhir (default: akhir file)
+
+        Yields:
+            List string dengan panjang len(indexes), sesuai urutan indexes.
+            Field yang tidak ada (baris pendek) diisi string kosong.
+        """
+        return self.decode_records(indexes, self.iter_records(start, end))
+
+    def scan_offsets(self, indexes: List[int], offsets: Iterable[int]) -> Iterator[List[str]]:
+        """
+        Seperti scan(), tetapi hanya untuk record yang dimulai di offsets
+        (mis. hasil lookup index).
+
+        Args:
+            indexes: Index kolom (di header) yang dibutuhkan, berurutan
+            offsets: Offset awal record
+
+        Yields:
+            List string dengan panjang len(indexes), sesuai urutan indexes
+        """
+        return self.decode_records(indexes, self.records_at(offsets))
+
+    def records_at(self, offsets: Iterable[int]) -> Iterator[Tuple[int, bytes]]:
+        """
+        Ambil record mentah yang dimulai di setiap offset.
+
+        Args:
+            offsets: Offset awal record (harus di batas record)
+
+        Yields:
+            Tuple (offset, record_bytes), sama seperti iter_records()
+        """
+        mm = self._mm
+        for offset in offsets:
+            record = mm[offset:_record_end(mm, offset, self.size)]
+            if record.endswith(b'\n'):
+                record = record[:-1]
+            if record.endswith(b'\r'):
+                record = record[:-1]
+            if record:
+                yield (offset, record)
+
+    def decode_records(self, indexes: List[int],
+                       records: Iterable[Tuple[int, bytes]]) -> Iterator[List[str]]:
+        """
+        Decode kolom pada indexes dari record mentah (lihat scan()).
+        """
+        if not indexes:
+            for _ in records:
+                yield []
+            return
+
+        width = len(indexes)
+        last = max(indexes)
+        pick = itemgetter(*indexes) if width > 1 else None
+        first = indexes[0]
+        prefix = indexes == list(range(width))
+        parse_quoted = _QuotedParser()
+
+        for _, record in records:
+            if b'"' in record:
+                fields = parse_quoted(record)
+                yield [fields[i] if i < len(fields) else "" for i in indexes]
+                continue
+
+            if prefix:
+                # Semua kolom awal dibutuhkan (mis. SELECT *): decode sekali lalu split
+                fields = record.decode('utf-8').split(',', width)
+                if len(fields) == width:
+                    yield fields
+                elif len(fields) > width:
+                    yield fields[:width]
+                else:
+                    yield fields + [""] * (width - len(fields))
+                continue
+
+            parts = record.split(b',', last + 1)
+            if len(parts) <= last:
+                yield [parts[i].decode('utf-8') if i < len(parts) else "" for i in indexes]
+            elif pick is None:
+                yield [parts[first].decode('utf-8')]
+            else:
+                # Field tanpa kutip tidak mengandung koma: gabung, decode sekali, split lagi
+                yield b','.join(pick(parts)).decode('utf-8').split(',')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HELPER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def compact_layout(header: List[str], indexes: List[int]) -> Dict[str, int]:
+    """
+    Layout untuk baris hasil MmapTable.scan (hanya kolom pada indexes).
+
+    Args:
+        header: List nama kolom
+        indexes: Index kolom yang di-scan
+
+    Returns:
+        Mapping nama kolom -> posisi di baris hasil scan. Untuk nama kolom
+        ganda, index terakhir yang dipakai (sama seperti operators.build_layout).
+    """
+    full = {name: i for i, name in enumerate(header)}
+    slots = {index: slot for slot, index in enumerate(indexes)}
+    return {name: slots[i] for name, i in full.items() if i in slots}
+
+
+def ends_in_quotes(line: bytes, quoted: bool = False) -> bool:
+    """
+    Apakah satu baris (tanpa newline) berakhir di dalam field ber-quote.
+
+    Mengikuti aturan module csv (dialect standar): kutip hanya membuka field
+    jika berada di awal field, "" di dalam field ber-quote adalah escape, dan
+    sesudah kutip penutup sisa field sampai koma dibaca apa adanya.
+
+    Args:
+        line: Isi baris
+        quoted: True jika baris dimulai di dalam field ber-quote (lanjutan
+            record dari baris sebelumnya); False jika dimulai di awal record
+
+    Returns:
+        True jika field ber-quote masih terbuka di akhir baris
+    """
+    find = line.find
+    pos = 0
+    while True:
+        if quoted:
+            close = find(b'"', pos)
+            if close < 0:
+                return True
+            if line[close + 1:close + 2] == b'"':
+                # Escape "" di dalam field
+                pos = close + 2
+                continue
+            quoted = False
+            pos = close + 1
+        elif line[pos:pos + 1] == b'"':
+            # Awal field ber-quote
+            quoted = True
+            pos += 1
+            continue
+        # Lewati sisa field tanpa quote sampai awal field berikutnya
+        comma = find(b',', pos)
+        if comma < 0:
+            return False
+        pos = comma + 1
+
+
+def _record_end(mm: mmap.mmap, start: int, end: int) -> int:
+    """Offset sesudah newline penutup record yang dimulai di start (sadar tanda kutip)."""
+    quoted = False
+    pos = start
+    while pos < end:
+        newline = mm.find(b'\n', pos, end)
+        if newline < 0:
+            return end
+        line = mm[pos:newline]
+        if quoted or b'"' in line:
+            quoted = ends_in_quotes(line, quoted)
+        if not quoted:
+            return newline + 1
+        pos = newline + 1
+    return end
+
+
+def _parse_quoted(record: bytes) -> List[str]:
+    """Parse satu record dengan module csv (untuk record yang mengandung tanda kutip)."""
+    return next(csv.reader(io.StringIO(record.decode('utf-8'), newline='')), [])
+
+
+class _QuotedParser:
+    """
+    Parser record ber-quote yang memakai ulang satu csv.reader.
+
+    Membuat csv.reader baru untuk setiap record cukup mahal; di sini record
+    disuapkan satu per satu ke reader yang sama.
+    """
+
+    def __init__(self):
+        self._pending: List[str] = []
+        self._reader = csv.reader(iter(self._pending.pop, None))
+
+    def __call__(self, record: bytes) -> List[str]:
+        self._pending.append(record.decode('utf-8'))
+        try:
+            return next(self._reader)
+        except IndexError:
+            # Field ber-quote tidak ditutup sampai akhir file: reader lama
+            # menunggu baris berikutnya, jadi ganti dengan reader baru
+            self._reader = csv.reader(iter(self._pending.pop, None))
+            return _parse_quoted(record)
@@ -60,10 +60,12 @@ TIPS:
 """
 
 import os
-import csv
 from dataclasses import dataclass, field
-from typing import Set, List
-from ast_nodes import Statement, Expr, BinaryOp, Identifier, Number, StringLiteral, Literal
+from typing import Set, List, Dict, Optional
+from ast_nodes import (Statement, CreateIndexStatement, Expr, BinaryOp, Identifier, Number, StringLiteral,
+                       Literal, Op, AggFunc, Aggregate, InList, Between)
+from catalog import table_catalog, TableInfo, TYPE_STRING
+from join import ColumnResolver, qualified_header, qualified_schema
 
 
 @dataclass
@@ -72,6 +74,7 @@ class SemanticResult:
     valid: bool = True
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
+    schema: Dict[str, str] = field(default_factory=dict)
 
 
 def analyze(query: Statement) -> SemanticResult:
@@ -87,32 +90,58 @@ def analyze(query: Statement) -> SemanticResult:
     errors: List[str] = []
     warnings: List[str] = []
     
-    # 1. Cek file CSV ada
+    # 1-2. Cek file CSV ada, lalu ambil header & schema dari katalog tabel
+    #      (file dibaca hanya jika belum ada di katalog atau sudah berubah;
+    #      lihat catalog.py)
     table = query.table
-    if not os.path.exists(table):
-        errors.append(f"File '{table}' tidak ditemukan")
+    info = lookup_table(table, errors)
+    if info is None:
         return SemanticResult(valid=False, errors=errors, warnings=warnings)
+    headers = set(info.header)
+    schema = info.schema
     
-    # 2. Baca header CSV
-    try:
-        with open(table, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            headers = set(next(reader))
-    except StopIteration:
-        errors.append(f"File '{table}' kosong atau tidak memiliki header")
-        return SemanticResult(valid=False, errors=errors, warnings=warnings)
-    except Exception as e:
-        errors.append(f"Gagal membaca file '{table}': {str(e)}")
-        return SemanticResult(valid=False, errors=errors, warnings=warnings)
+    # CREATE INDEX: cukup validasi kolom yang di-index
+    if isinstance(query, CreateIndexStatement):
+        if query.column not in headers:
+            errors.append(f"Kolom '{query.column}' tidak ada di file '{table}'. Kolom yang tersedia: {', '.join(sorted(headers))}")
+        return SemanticResult(valid=len(errors) == 0, errors=errors, warnings=warnings, schema=schema)
+    
+    # 2b. JOIN: header tabel kedua; semua nama kolom di-resolve ke nama
+    #     lengkap "tabel.kolom" (lihat join.py), lalu divalidasi seperti biasa
+    if query.join is not None:
+        join_table = query.join.table
+        join_info = lookup_table(join_table, errors)
+        if join_info is None:
+            return SemanticResult(valid=False, errors=errors, warnings=warnings)
+        try:
+            resolver = ColumnResolver(table, info.header, join_table, join_info.header)
+            query = resolver.resolve_query(query)
+        except Exception as e:
+            errors.append(str(e))
+            return SemanticResult(valid=False, errors=errors, warnings=warnings)
+        headers = set(qualified_header(table, info.header) + qualified_header(join_table, join_info.header))
+        schema = {**qualified_schema(table, info.schema), **qualified_schema(join_table, join_info.schema)}
+        table = f"{table} JOIN {join_table}"
     
     # 3. Validasi kolom SELECT
     for col in query.columns:
-        if col != "*" and col not in headers:
-            errors.append(f"Kolom '{col}' tidak ada di file '{table}'. Kolom yang tersedia: {', '.join(sorted(headers))}")
+        name = col.column if isinstance(col, Aggregate) else col
+        if name != "*" and name not in headers:
+            errors.append(f"Kolom '{name}' tidak ada di file '{table}'. Kolom yang tersedia: {', '.join(sorted(headers))}")
+    
+    # 3b. Validasi GROUP BY & fungsi agregat
+    validate_aggregates(query, headers, schema, errors, warnings, table)
+    
+    # 3c. Validasi kolom ORDER BY
+    for item in query.order_by:
+        name = item.column.column if isinstance(item.column, Aggregate) else item.column
+        if name != "*" and name not in headers:
+            errors.append(f"Kolom '{name}' di ORDER BY tidak ada di file '{table}'")
     
     # 4. Validasi kolom WHERE
     if query.where_clause is not None:
         validate_expr_columns(query.where_clause, headers, errors, table)
+        check_numeric_comparisons(query.where_clause, schema, warnings)
     
     # 5. Validasi LIMIT
     if query.limit is not None:
@@ -129,10 +158,128 @@ def analyze(query: Statement) -> SemanticResult:
     return SemanticResult(
         valid=len(errors) == 0,
         errors=errors,
-        warnings=warnings
+        warnings=warnings,
+        schema=schema
     )
 
 
+def lookup_table(table: str, errors: List[str]) -> Optional[TableInfo]:
+    """
+    Ambil metadata tabel dari katalog.
+    
+    Args:
+        table: Path file CSV
+        errors: List untuk menampung error
+        
+    Returns:
+        TableInfo, atau None jika file tidak ada atau tidak bisa dibaca
+        (pesan error ditambahkan ke errors)
+    """
+    if not os.path.exists(table):
+        errors.append(f"File '{table}' tidak ditemukan")
+        return None
+    try:
+        return table_catalog.lookup(table)
+    except StopIteration:
+        errors.append(f"File '{table}' kosong atau tidak memiliki header")
+    except Exception as e:
+        errors.append(f"Gagal membaca file '{table}': {str(e)}")
+    return None
+
+
+def validate_aggregates(query, headers: Set[str], schema: Dict[str, str], errors: List[str],
+                        warnings: List[str], table: str) -> None:  # query: SelectStatement
+    """
+    Validasi GROUP BY dan fungsi agregat.
+    
+    Jika query memakai GROUP BY atau fungsi agregat (di SELECT atau ORDER BY),
+    setiap kolom biasa di SELECT dan ORDER BY harus ada di GROUP BY, dan
+    SELECT * tidak diperbolehkan.
+    SUM/AVG pada kolom teks diberi warning (nilai non-numerik dianggap 0).
+    
+    Args:
+        query: SelectStatement dari parser
+        headers: Set nama kolom yang valid
+        schema: Tipe kolom hasil catalog.infer_schema()
+        errors: List untuk menampung error
+        warnings: List untuk menampung warning
+        table: Nama file untuk pesan error
+    """
+    items = list(query.columns) + [item.column for item in query.order_by]
+    aggregates = [col for col in items if isinstance(col, Aggregate)]
+    if not aggregates and not query.group_by:
+        return
+    
+    for col in query.group_by:
+        if col not in headers:
+            errors.append(f"Kolom '{col}' di GROUP BY tidak ada di file '{table}'")
+    
+    for col in query.columns:
+        if col == "*":
+            errors.append("SELECT * tidak bisa dipakai bersama GROUP BY atau fungsi agregat")
+        elif isinstance(col, str) and col not in query.group_by:
+            errors.append(f"Kolom '{col}' harus ada di GROUP BY atau dipakai di dalam fungsi agregat")
+    for item in query.order_by:
+        if isinstance(item.column, str) and item.column not in query.group_by:
+            errors.append(f"Kolom '{item.column}' di ORDER BY harus ada di GROUP BY "
+                          "atau dipakai di dalam fungsi agregat")
+    
+    for aggregate in aggregates:
+        if aggregate.func in (AggFunc.SUM, AggFunc.AVG) and schema.get(aggregate.column) == TYPE_STRING:
+            message = (f"Kolom '{aggregate.column}' berisi teks tetapi dipakai di "
+                       f"{aggregate.func.name}(); nilai non-numerik dianggap 0")
+            if message not in warnings:
+                warnings.append(message)
+
+
+def check_numeric_comparisons(expr: Expr, schema: Dict[str, str], warnings: List[str]) -> None:
+    """
+    Beri warning untuk kolom string yang dibandingkan secara numerik
+    (<, >, <=, >=, atau = / != terhadap angka).
+    
+    Nilai non-numerik dianggap 0 oleh engine, jadi hasilnya sering tidak
+    sesuai harapan.
+    
+    Args:
+        expr: Expression dari WHERE clause
+        schema: Tipe kolom hasil catalog.infer_schema()
+        warnings: List untuk menampung warning
+    """
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, InList):
+            # expr IN (...) = rangkaian expr = nilai; numerik jika salah satu sisi angka
+            if isinstance(node.expr, Number):
+                sides = list(node.values)
+            elif any(isinstance(value, Number) for value in node.values):
+                sides = [node.expr]
+            else:
+                continue
+        elif isinstance(node, Between):
+            sides = [node.expr, node.low, node.high]
+        elif not isinstance(node, BinaryOp):
+            continue
+        elif node.op in (Op.AND, Op.OR):
+            stack.append(node.right)
+            stack.append(node.left)
+            continue
+        
+        # = dan != antara dua nilai string adalah perbandingan string biasa
+        elif node.op in (Op.EQUAL, Op.NOT_EQUAL) and not (
+                isinstance(node.left, Number) or isinstance(node.right, Number)):
+            continue
+        else:
+            sides = [node.left, node.right]
+        
+        for side in sides:
+            if isinstance(side, Identifier) and schema.get(side.name) == TYPE_STRING:
+                message = (f"Kolom '{side.name}' berisi teks tetapi dibandingkan secara numerik; "
+                           "nilai non-numerik dianggap 0")
+                if message not in warnings:
+                    warnings.append(message)
+
+
 def validate_expr_columns(expr: Expr, headers: Set[str], errors: List[str], table: str) -> None:
     """
     Validasi kolom dalam ekspresi WHERE secara rekursif.
@@ -154,6 +301,17 @@ def validate_expr_columns(expr: Expr, headers: Set[str], errors: List[str], tabl
         validate_expr_columns(expr.left, headers, errors, table)
         validate_expr_columns(expr.right, headers, errors, table)
     
+    # Jika expr adalah InList (IN / NOT IN)
+    elif isinstance(expr, InList):
+        validate_expr_columns(expr.expr, headers, errors, table)
+        for value in expr.values:
+            validate_expr_columns(value, headers, errors, table)
+    
+    # Jika expr adalah Between (BETWEEN ... AND ...)
+    elif isinstance(expr, Between):
+        for side in (expr.expr, expr.low, expr.high):
+            validate_expr_columns(side, headers, errors, table)
+    
     # Untuk Number, StringLiteral, Literal - tidak perlu validasi
     elif isinstance(expr, (Number, StringLiteral, Literal)):
         pass  # Literal values tidak perlu validasi
@@ -186,6 +344,7 @@ if __name__ == "__main__":
         ("SELECT kolom_salah FROM data_nilai.csv", "c:/Codingan/csv_ql"),
         ('SELECT nama FROM data_nilai.csv WHERE kolom_tidak_ada = "test"', "c:/Codingan/csv_ql"),
         ("SELECT * FROM data_nilai.csv LIMIT 0", "c:/Codingan/csv_ql"),
+        ("SELECT nama, COUNT(*) FROM data_nilai.csv GROUP BY mata_kuliah", "c:/Codingan/csv_ql"),
     ]
     
     print("=" * 70)
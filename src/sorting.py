@@ -0,0 +1,301 @@
+"""
+sorting.py - Pengurutan (ORDER BY) untuk CSV_QL
+
+Modul ini membangun kunci urutan untuk baris posisional dan menjalankan
+external merge sort untuk hasil yang lebih besar dari memori (lihat
+operators.Sort). Semua nilai CSV berupa string, jadi urutannya ditentukan
+dari isinya:
+
+    kosong ("")  <  angka (urut numerik)  <  teks lain (urut string)
+
+Urutan ini total dan sama di semua jalur eksekusi, jadi kolom campuran
+(mis. "85", "abc", "") tetap bisa diurutkan. DESC membalik seluruh urutan
+(kosong menjadi paling akhir). Pengurutan stabil: baris dengan kunci sama
+tetap mengikuti urutan file.
+
+External merge sort:
+    1. Baris dibaca ke buffer sampai anggaran memori habis, lalu buffer
+       diurutkan menjadi satu run
+    2. Run yang tidak muat di memori ditulis ke file sementara (format
+       biner marshal, per blok RUN_BLOCK_ROWS record)
+    3. Semua run digabung dengan k-way heapq.merge
+
+Kunci setiap baris dihitung sekali (bertipe, mengikuti schema kolom) dan
+ikut disimpan di run, jadi penggabungan tidak mem-parse ulang string.
+"""
+
+import heapq
+import marshal
+import tempfile
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Union
+from cache import row_size
+
+
+# Kategori nilai, urut dari yang paling kecil
+_NULL_KEY = (0,)
+_NUMBER = 1
+_TEXT = 2
+
+# Tipe kolom numerik (lihat catalog.infer_schema)
+_NUMERIC_TYPES = ("int", "float")
+
+# Karakter awal yang mungkin diterima float() (selain digit dan spasi)
+_NUMBER_STARTS = frozenset("+-.iInN")
+
+# Jumlah record per blok marshal di file run
+RUN_BLOCK_ROWS = 1024
+
+# Perkiraan memori kunci urutan + tuple record per baris (byte)
+KEY_OVERHEAD_BYTES = 120
+
+# LIMIT sampai sebanyak ini memakai heap top-K; di atasnya external sort
+HEAP_MAX_ROWS = 10000
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KUNCI NILAI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def value_key(value: str) -> tuple:
+    """
+    Kunci urutan untuk satu nilai.
+
+    Args:
+        value: Nilai kolom (string)
+
+    Returns:
+        (0,) untuk nilai kosong, (1, float) untuk angka, (2, str) untuk teks.
+        "nan" diperlakukan sebagai teks supaya urutan tetap total.
+    """
+    if not value:
+        return _NULL_KEY
+    try:
+        number = float(value)
+    except ValueError:
+        return (_TEXT, value)
+    if number != number:
+        return (_TEXT, value)
+    return (_NUMBER, number)
+
+
+def number_key(value: str) -> tuple:
+    """value_key untuk kolom numerik: langsung float(), kasus lain lewat value_key."""
+    try:
+        number = float(value)
+    except ValueError:
+        return value_key(value)
+    if number != number:
+        return (_TEXT, value)
+    return (_NUMBER, number)
+
+
+def text_key(value: str) -> tuple:
+    """
+    value_key untuk kolom teks: float() hanya dicoba jika karakter pertama
+    memungkinkan (digit, spasi, tanda, titik, inf/nan), supaya nilai teks
+    biasa tidak melempar exception.
+    """
+    if not value:
+        return _NULL_KEY
+    first = value[0]
+    if first.isdecimal() or first.isspace() or first in _NUMBER_STARTS:
+        return value_key(value)
+    return (_TEXT, value)
+
+
+def typed_value_key(kind: Optional[str]) -> Callable[[str], tuple]:
+    """
+    Fungsi kunci nilai untuk tipe kolom (hasil catalog.infer_schema).
+    Hasilnya selalu sama dengan value_key; tipe hanya menentukan jalur cepat.
+    """
+    if kind in _NUMERIC_TYPES:
+        return number_key
+    return text_key
+
+
+class Descending:
+    """
+    Pembungkus kunci dengan urutan terbalik, untuk ORDER BY yang mencampur
+    ASC dan DESC (mis. ORDER BY semester DESC, nama).
+    """
+    __slots__ = ("key",)
+
+    def __init__(self, key: tuple):
+        self.key = key
+
+    def __lt__(self, other: 'Descending') -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: 'Descending') -> bool:
+        return self.key == other.key
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KUNCI BARIS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SortKey:
+    """
+    Kunci ORDER BY untuk baris posisional.
+
+    Attributes:
+        raw: Fungsi row -> kunci mentah (tuple biasa, bisa disimpan di run)
+        wrap: Fungsi kunci mentah -> kunci pembanding, atau None jika kunci
+              mentah bisa langsung dibandingkan. Hanya dipakai jika ASC dan
+              DESC dicampur (kunci DESC dibungkus Descending).
+        reverse: True jika semua kunci DESC (dipakai sebagai reverse=)
+    """
+
+    def __init__(self, positions: Sequence[int], descending: Sequence[bool],
+                 kinds: Optional[Sequence[Optional[str]]] = None):
+        """
+        Args:
+            positions: Posisi kolom kunci di baris, urut prioritas
+            descending: True untuk kunci DESC (sepanjang positions)
+            kinds: Tipe kolom kunci (lihat typed_value_key), None = tidak diketahui
+        """
+        parts = [typed_value_key(kind) for kind in (kinds or [None] * len(positions))]
+        if len(positions) == 1:
+            position, part = positions[0], parts[0]
+            self.raw: Callable = lambda row: part(row[position])
+        else:
+            pairs = list(zip(parts, positions))
+            self.raw = lambda row: tuple([part(row[p]) for part, p in pairs])
+
+        self.reverse = all(descending)
+        self.wrap: Optional[Callable] = None
+        if not self.reverse and any(descending):
+            flags = list(descending)
+            self.wrap = lambda key: tuple([Descending(k) if desc else k
+                                           for k, desc in zip(key, flags)])
+
+    def row(self) -> Callable:
+        """Fungsi row -> kunci pembanding, untuk sorted()/heapq pada baris."""
+        raw, wrap = self.raw, self.wrap
+        if wrap is None:
+            return raw
+        return lambda row: wrap(raw(row))
+
+    def record(self) -> Callable:
+        """Fungsi kunci pembanding untuk record (kunci mentah, baris)."""
+        wrap = self.wrap
+        if wrap is None:
+            return itemgetter(0)
+        return lambda record: wrap(record[0])
+
+
+def column_kinds(columns: Sequence[str], schema: Optional[Dict[str, str]]) -> List[Optional[str]]:
+    """Tipe kolom untuk typed_value_key (None jika kolom tidak ada di schema)."""
+    return [schema.get(name) if schema else None for name in columns]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EXTERNAL MERGE SORT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ExternalSort:
+    """
+    External merge sort dengan anggaran memori.
+
+    Run disimpan di memori selama total perkiraan ukurannya muat di
+    memory_bytes; run berikutnya ditulis ke file sementara di temp_dir.
+    File sementara dihapus otomatis saat close().
+
+    Contoh:
+        sorter = ExternalSort(key, 64 * 1024 * 1024)
+        try:
+            sorter.add(rows)
+            for row in sorter.merged():
+                ...
+        finally:
+            sorter.close()
+    """
+
+    def __init__(self, key: SortKey, memory_bytes: int, temp_dir: str = "",
+                 limit: Optional[int] = None):
+        """
+        Args:
+            key: Kunci urutan
+            memory_bytes: Anggaran memori untuk run (perkiraan, byte)
+            temp_dir: Direktori file run ("" = direktori sementara sistem)
+            limit: Hanya limit baris pertama hasil yang dibutuhkan (None = semua)
+        """
+        self.key = key
+        self.memory_bytes = memory_bytes
+        self.temp_dir = temp_dir or None
+        self.limit = limit
+        self.spilled = 0
+        self._runs: List[Union[list, IO[bytes]]] = []
+        self._memory = 0
+
+    def add(self, rows: Iterable[List[str]]) -> None:
+        """Baca baris (belum terurut) dan potong menjadi run terurut."""
+        raw = self.key.raw
+        buffer: list = []
+        size = 0
+        for row in rows:
+            buffer.append((raw(row), row))
+            size += row_size(row) + KEY_OVERHEAD_BYTES
+            if size >= self.memory_bytes:
+                self._add_run(buffer, size, presorted=False)
+                buffer, size = [], 0
+        if buffer:
+            self._add_run(buffer, size, presorted=False)
+
+    def add_sorted(self, rows: List[List[str]]) -> None:
+        """Tambahkan satu run yang sudah terurut dengan kunci yang sama."""
+        raw = self.key.raw
+        size = sum(map(row_size, rows)) + KEY_OVERHEAD_BYTES * len(rows)
+        self._add_run([(raw(row), row) for row in rows], size, presorted=True)
+
+    def merged(self) -> Iterator[List[str]]:
+        """Baris semua run, terurut (k-way merge)."""
+        sources = [iter(run) if isinstance(run, list) else _read_run(run) for run in self._runs]
+        if len(sources) == 1:
+            records = sources[0]
+        else:
+            records = heapq.merge(*sources, key=self.key.record(), reverse=self.key.reverse)
+        rows = map(itemgetter(1), records)
+        return islice(rows, self.limit) if self.limit else rows
+
+    def close(self) -> None:
+        """Tutup (dan hapus) semua file run."""
+        for run in self._runs:
+            if not isinstance(run, list):
+                run.close()
+        self._runs = []
+
+    def _add_run(self, records: list, size: int, presorted: bool) -> None:
+        if not presorted:
+            records.sort(key=self.key.record(), reverse=self.key.reverse)
+        if self.limit and len(records) > self.limit:
+            del records[self.limit:]
+        if self._memory + size <= self.memory_bytes:
+            self._runs.append(records)
+            self._memory += size
+            return
+        self._runs.append(self._spill(records))
+        self.spilled += 1
+
+    def _spill(self, records: list) -> IO[bytes]:
+        f = tempfile.TemporaryFile(dir=self.temp_dir)
+        try:
+            for start in range(0, len(records), RUN_BLOCK_ROWS):
+                marshal.dump(records[start:start + RUN_BLOCK_ROWS], f)
+            f.seek(0)
+        except BaseException:
+            f.close()
+            raise
+        return f
+
+
+def _read_run(f: IO[bytes]) -> Iterator[tuple]:
+    """Baca record file run per blok."""
+    while True:
+        try:
+            block = marshal.load(f)
+        except EOFError:
+            return
+        yield from block
@@ -20,6 +20,26 @@ class TokenType(Enum):
     LIMIT = auto()
     OR = auto()
     AND = auto()
+    CREATE = auto()
+    INDEX = auto()
+    ON = auto()
+    USING = auto()
+    GROUP = auto()
+    BY = auto()
+    ORDER = auto()
+    ASC = auto()
+    DESC = auto()
+    JOIN = auto()
+    IN = auto()
+    NOT = auto()
+    BETWEEN = auto()
+    
+    # Fungsi Agregat
+    COUNT = auto()
+    SUM = auto()
+    AVG = auto()
+    MIN = auto()
+    MAX = auto()
     
     # Operators (Operator)
     EQUAL = auto()           # =
@@ -37,6 +57,8 @@ class TokenType(Enum):
     
     # Punctuation (Tanda Baca)
     COMMA = auto()           # ,
+    LPAREN = auto()          # (
+    RPAREN = auto()          # )
     
     # Special
     EOF = auto()             # End of File/Input
@@ -82,9 +104,67 @@ KEYWORDS = {
     "or": TokenType.OR,
     "AND": TokenType.AND,
     "and": TokenType.AND,
+    "CREATE": TokenType.CREATE,
+    "create": TokenType.CREATE,
+    "INDEX": TokenType.INDEX,
+    "index": TokenType.INDEX,
+    "ON": TokenType.ON,
+    "on": TokenType.ON,
+    "USING": TokenType.USING,
+    "using": TokenType.USING,
+    "GROUP": TokenType.GROUP,
+    "group": TokenType.GROUP,
+    "BY": TokenType.BY,
+    "by": TokenType.BY,
+    "ORDER": TokenType.ORDER,
+    "order": TokenType.ORDER,
+    "ASC": TokenType.ASC,
+    "asc": TokenType.ASC,
+    "DESC": TokenType.DESC,
+    "desc": TokenType.DESC,
+    "JOIN": TokenType.JOIN,
+    "join": TokenType.JOIN,
+    "IN": TokenType.IN,
+    "in": TokenType.IN,
+    "NOT": TokenType.NOT,
+    "not": TokenType.NOT,
+    "BETWEEN": TokenType.BETWEEN,
+    "between": TokenType.BETWEEN,
+    "COUNT": TokenType.COUNT,
+    "count": TokenType.COUNT,
+    "SUM": TokenType.SUM,
+    "sum": TokenType.SUM,
+    "AVG": TokenType.AVG,
+    "avg": TokenType.AVG,
+    "MIN": TokenType.MIN,
+    "min": TokenType.MIN,
+    "MAX": TokenType.MAX,
+    "max": TokenType.MAX,
 }
 
 
+# Keyword yang di luar klausanya juga boleh dipakai sebagai nama kolom/tabel
+# (mis. kolom "count", "min", "desc", "order"). Token-nya membawa teks asli
+# sebagai value agar parser bisa memakainya sebagai identifier.
+SOFT_KEYWORDS = frozenset({
+    TokenType.INDEX,
+    TokenType.ON,
+    TokenType.GROUP,
+    TokenType.BY,
+    TokenType.ORDER,
+    TokenType.ASC,
+    TokenType.DESC,
+    TokenType.IN,
+    TokenType.NOT,
+    TokenType.BETWEEN,
+    TokenType.COUNT,
+    TokenType.SUM,
+    TokenType.AVG,
+    TokenType.MIN,
+    TokenType.MAX,
+})
+
+
 def get_keyword_token(text: str) -> Token | None:
     """
     Cek apakah text adalah keyword, kalau iya kembalikan Token-nya.
@@ -93,8 +173,12 @@ def get_keyword_token(text: str) -> Token | None:
         text: String yang akan dicek
         
     Returns:
-        Token jika text adalah keyword, None jika bukan
+        Token jika text adalah keyword, None jika bukan. Token untuk
+        SOFT_KEYWORDS menyimpan text sebagai value.
     """
-    if text in KEYWORDS:
-        return Token(KEYWORDS[text])
-    return None
+    token_type = KEYWORDS.get(text)
+    if token_type is None:
+        return None
+    if token_type in SOFT_KEYWORDS:
+        return Token(token_type, text)
+    return Token(token_type)
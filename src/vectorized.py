@@ -0,0 +1,597 @@
+"""
+vectorized.py - Kernel Filter Batch untuk CSV_QL
+
+Modul ini mengompilasi WHERE clause (AST) menjadi kernel batch: fungsi yang
+mengevaluasi kondisi untuk sekumpulan baris sekaligus (lihat operators.Batch),
+bukan satu baris per panggilan seperti predicate.py.
+
+Kernel menerima batch (columns[i] = nilai kolom ke-i untuk seluruh batch)
+dan selection vector (index baris yang masih terpilih), lalu mengembalikan
+selection vector baru:
+
+    kernel(columns, sel) -> sel'      (sel' selalu subset terurut dari sel)
+
+Perbandingan "kolom op konstanta" dijalankan lewat map/compress dengan method
+bawaan (mis. map(float, nilai) lalu map(const.__lt__, ...)), sehingga loop per
+nilai berjalan di C tanpa panggilan fungsi Python per baris. Rantai AND
+mempersempit selection vector operand demi operand; rantai OR hanya
+mengevaluasi operand berikutnya pada baris yang belum lolos.
+
+Semantik hasil sama persis dengan engine.eval_expr dan predicate.py:
+perbandingan string untuk = / != antar nilai string, float dengan epsilon,
+dan 0.0 untuk nilai yang tidak numerik.
+
+Seperti predicate.py, kernel bertipe (dengan schema) MELEMPAR ValueError/
+TypeError jika ada nilai kolom numerik yang ternyata bukan angka; pemanggil
+mengulang batch itu dengan kernel tanpa schema (lihat operators.BatchFilter).
+
+Backend kernel:
+    - "python": map/compress bawaan (selalu tersedia)
+    - "numpy":  kolom numerik yang direferensikan dimuat ke ndarray per batch,
+                WHERE dievaluasi sebagai mask boolean (& untuk AND, | untuk
+                OR). NumPy opsional; jika tidak bisa di-import, backend
+                "python" yang dipakai.
+    - "auto":   "numpy" jika tersedia, selain itu "python"
+Konversi teks ke angka tetap memakai float() Python di kedua backend, jadi
+nilai yang diterima (spasi, "1_000", "nan", ...) sama persis.
+"""
+
+import math
+from dataclasses import replace
+from itertools import compress, filterfalse
+from operator import eq, ne
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from ast_nodes import (Expr, Op, BinaryOp, Literal, StringLiteral, Number, Identifier,
+                       BoolLiteral, InList, Between)
+from predicate import (EPSILON, Layout, Schema, constant_result, expand_between, expand_in_list,
+                       flatten_chain, number_matcher, _FLIPPED_OPS, _constant_value, _compare)
+
+
+# Kernel: (kolom batch, selection vector) -> selection vector baru
+Kernel = Callable[[Sequence[Sequence[str]], Sequence[int]], List[int]]
+
+# Tipe kolom yang boleh memakai kernel bertipe (sama dengan predicate.py)
+_NUMERIC_TYPES = ("int", "float")
+
+# Backend kernel yang dikenal (lihat docstring modul)
+BACKEND_PYTHON = "python"
+BACKEND_NUMPY = "numpy"
+BACKEND_AUTO = "auto"
+
+try:
+    import numpy
+except ImportError:
+    # NumPy opsional: tanpa NumPy semua kernel memakai backend "python"
+    numpy = None
+
+
+def resolve_backend(name: str) -> str:
+    """
+    Backend yang benar-benar dipakai untuk nama backend dari konfigurasi.
+
+    Args:
+        name: "python", "numpy", atau "auto"
+
+    Returns:
+        "numpy" jika diminta (atau auto) dan NumPy tersedia, selain itu "python"
+
+    Raises:
+        Exception: Jika nama backend tidak dikenal
+    """
+    if name not in (BACKEND_PYTHON, BACKEND_NUMPY, BACKEND_AUTO):
+        raise Exception(f"Backend kernel '{name}' tidak dikenal (python, numpy, auto)")
+    if name != BACKEND_PYTHON and numpy is not None:
+        return BACKEND_NUMPY
+    return BACKEND_PYTHON
+
+
+def compile_kernel(expr: Optional[Expr], layout: Layout,
+                   schema: Optional[Schema] = None,
+                   backend: str = BACKEND_PYTHON) -> Kernel:
+    """
+    Kompilasi WHERE clause menjadi kernel batch.
+
+    Args:
+        expr: Expression dari WHERE clause (None = tanpa filter)
+        layout: Mapping nama kolom -> posisi kolom di batch
+        schema: Tipe kolom. Kolom numerik memakai konversi float() tanpa
+                penanganan nilai non-numerik (lihat docstring modul).
+        backend: Nama backend kernel (lihat resolve_backend)
+
+    Returns:
+        Fungsi kernel(columns, sel) -> list index terpilih
+
+    Raises:
+        Exception: Jika kolom di WHERE clause tidak ada di layout
+    """
+    if expr is None:
+        return _select_all
+    if resolve_backend(backend) == BACKEND_NUMPY:
+        return _MaskCompiler(layout, schema).compile_kernel(expr)
+    return _KernelCompiler(layout, schema).compile(expr)
+
+
+def gather(column: Sequence[str], sel: Sequence[int]) -> Sequence[str]:
+    """
+    Ambil nilai kolom pada baris terpilih.
+
+    Args:
+        column: Nilai satu kolom untuk seluruh batch
+        sel: Selection vector (index terurut)
+
+    Returns:
+        Nilai untuk setiap index di sel (kolom itu sendiri jika semua terpilih)
+    """
+    if len(sel) == len(column):
+        return column
+    return list(map(column.__getitem__, sel))
+
+
+def _select_all(columns, sel) -> List[int]:
+    return list(sel)
+
+
+def _select_none(columns, sel) -> List[int]:
+    return []
+
+
+def _floats(values: Sequence[str]) -> List[float]:
+    """
+    Konversi nilai ke float; nilai non-numerik menjadi 0.0 (sama dengan
+    engine.get_value).
+
+    list.extend menyimpan hasil sebelum nilai yang gagal, jadi konversi
+    cukup dilanjutkan dari iterator yang sama sesudah nilai itu.
+    """
+    result: List[float] = []
+    remaining = iter(values)
+    while True:
+        try:
+            result.extend(map(float, remaining))
+            return result
+        except (ValueError, TypeError):
+            result.append(0.0)
+
+
+class _KernelCompiler:
+    """Kompilasi expression menjadi kernel untuk satu layout batch."""
+
+    def __init__(self, layout: Layout, schema: Optional[Schema] = None):
+        self.layout = layout
+        self.schema = schema or {}
+
+    def position(self, name: str) -> int:
+        """Posisi kolom di batch."""
+        if name not in self.layout:
+            raise Exception(f"Kolom '{name}' tidak ditemukan")
+        return self.layout[name]
+
+    def numbers(self, name: str) -> Callable[[Sequence[str]], Sequence[float]]:
+        """Konverter nilai kolom ke float (bertipe: map(float) tanpa cadangan)."""
+        if self.schema.get(name) in _NUMERIC_TYPES:
+            return lambda values: map(float, values)
+        return _floats
+
+    def compile(self, expr: Expr) -> Kernel:
+        """Kompilasi satu node expression."""
+        if isinstance(expr, BoolLiteral):
+            return _select_all if expr.value else _select_none
+
+        if isinstance(expr, InList):
+            return self.compile_membership(expr)
+
+        if isinstance(expr, Between):
+            return self.compile_between(expr)
+
+        if not isinstance(expr, BinaryOp):
+            # Leaf di posisi kondisi selalu False (sama dengan eval_expr)
+            return _select_none
+
+        if expr.op in (Op.AND, Op.OR):
+            return self.compile_logic(expr)
+
+        result = constant_result(expr)
+        if result is not None:
+            return _select_all if result else _select_none
+
+        if expr.op in (Op.EQUAL, Op.NOT_EQUAL):
+            string_valued = (Identifier, StringLiteral, Literal)
+            if isinstance(expr.left, string_valued) and isinstance(expr.right, string_valued):
+                return self.compile_string_equality(expr)
+
+        left_const = _constant_value(expr.left)
+        right_const = _constant_value(expr.right)
+        if left_const is None and right_const is not None:
+            return self.column_vs_constant(expr.left.name, expr.op, right_const)
+        if left_const is not None and right_const is None:
+            return self.column_vs_constant(expr.right.name, _FLIPPED_OPS[expr.op], left_const)
+        return self.column_vs_column(expr)
+
+    def compile_logic(self, expr: BinaryOp) -> Kernel:
+        """Rantai AND mempersempit sel; rantai OR mengisi baris yang belum lolos."""
+        kernels = [self.compile(operand) for operand in flatten_chain(expr, expr.op)]
+
+        if expr.op == Op.AND:
+            def all_of(columns, sel) -> List[int]:
+                for kernel in kernels:
+                    if not sel:
+                        break
+                    sel = kernel(columns, sel)
+                return list(sel)
+            return all_of
+
+        def any_of(columns, sel) -> List[int]:
+            selected: List[int] = []
+            remaining = sel
+            for kernel in kernels:
+                if not remaining:
+                    break
+                hit = kernel(columns, remaining)
+                if hit:
+                    selected.extend(hit)
+                    remaining = list(filterfalse(set(hit).__contains__, remaining))
+            selected.sort()
+            return selected
+        return any_of
+
+    def compile_membership(self, expr: InList) -> Kernel:
+        """
+        Kolom IN (nilai, ...): frozenset untuk string, number_matcher untuk angka.
+        NOT IN memilih sel yang tidak dipilih kernel IN.
+        """
+        if expr.negated:
+            member = self.compile_membership(replace(expr, negated=False))
+
+            def non_member(columns, sel) -> List[int]:
+                return list(filterfalse(set(member(columns, sel)).__contains__, sel))
+            return non_member
+
+        literal = (Number, StringLiteral, Literal)
+        numbers = [value.value for value in expr.values if isinstance(value, Number)]
+        if (not isinstance(expr.expr, Identifier)
+                or not all(isinstance(value, literal) for value in expr.values)
+                or not all(math.isfinite(number) for number in numbers)):
+            return self.compile(expand_in_list(expr))
+
+        name = expr.expr.name
+        index = self.position(name)
+        strings = frozenset(value.value for value in expr.values
+                            if isinstance(value, (StringLiteral, Literal)))
+        if not numbers:
+            def string_member(columns, sel) -> List[int]:
+                return list(compress(sel, map(strings.__contains__, gather(columns[index], sel))))
+            return string_member
+
+        near = number_matcher(numbers)
+        convert = self.numbers(name)
+
+        def member(columns, sel) -> List[int]:
+            values = gather(columns[index], sel)
+            mask = map(near, convert(values))
+            if strings:
+                mask = map(bool.__or__, map(strings.__contains__, values), mask)
+            return list(compress(sel, mask))
+        return member
+
+    def compile_between(self, expr: Between) -> Kernel:
+        """Kolom BETWEEN konstanta AND konstanta: satu konversi per nilai."""
+        result = constant_result(expr)
+        if result is not None:
+            return _select_all if result else _select_none
+
+        low, high = _constant_value(expr.low), _constant_value(expr.high)
+        if low is None or high is None or not isinstance(expr.expr, Identifier):
+            return self.compile(expand_between(expr))
+
+        index = self.position(expr.expr.name)
+        convert = self.numbers(expr.expr.name)
+        low, high = float(low), float(high)
+
+        def within(columns, sel) -> List[int]:
+            values = convert(gather(columns[index], sel))
+            return list(compress(sel, [low <= value <= high for value in values]))
+        return within
+
+    def compile_string_equality(self, expr: BinaryOp) -> Kernel:
+        """= / != antar nilai string (minimal satu sisi kolom)."""
+        negate = expr.op == Op.NOT_EQUAL
+        left_is_column = isinstance(expr.left, Identifier)
+        right_is_column = isinstance(expr.right, Identifier)
+
+        if left_is_column and right_is_column:
+            left, right = self.position(expr.left.name), self.position(expr.right.name)
+            cmp = ne if negate else eq
+
+            def columns_equal(columns, sel) -> List[int]:
+                return list(compress(sel, map(cmp, gather(columns[left], sel),
+                                              gather(columns[right], sel))))
+            return columns_equal
+
+        index = self.position(expr.left.name if left_is_column else expr.right.name)
+        value = expr.right.value if left_is_column else expr.left.value
+        test = value.__ne__ if negate else value.__eq__
+
+        def column_equals(columns, sel) -> List[int]:
+            return list(compress(sel, map(test, gather(columns[index], sel))))
+        return column_equals
+
+    def column_vs_constant(self, name: str, op: Op, const: float) -> Kernel:
+        """Perbandingan numerik "kolom op konstanta" sebagai map di C."""
+        index = self.position(name)
+        convert = self.numbers(name)
+        const = float(const)
+
+        if op in (Op.EQUAL, Op.NOT_EQUAL):
+            # |nilai - const| dibandingkan dengan EPSILON
+            test = EPSILON.__gt__ if op == Op.EQUAL else EPSILON.__lt__
+            distance = const.__rsub__
+
+            def near(columns, sel) -> List[int]:
+                values = convert(gather(columns[index], sel))
+                return list(compress(sel, map(test, map(abs, map(distance, values)))))
+            return near
+
+        # nilai > const  <=>  const < nilai, dst.
+        test = {
+            Op.GREATER_THAN: const.__lt__,
+            Op.LESS_THAN: const.__gt__,
+            Op.GREATER_THAN_OR_EQ: const.__le__,
+            Op.LESS_THAN_OR_EQ: const.__ge__,
+        }[op]
+
+        def compare(columns, sel) -> List[int]:
+            return list(compress(sel, map(test, convert(gather(columns[index], sel)))))
+        return compare
+
+    def column_vs_column(self, expr: BinaryOp) -> Kernel:
+        """Perbandingan numerik antar dua kolom."""
+        left, right = expr.left, expr.right
+        left_index, right_index = self.position(left.name), self.position(right.name)
+        left_convert, right_convert = self.numbers(left.name), self.numbers(right.name)
+        op = expr.op
+
+        def compare(columns, sel) -> List[int]:
+            lefts = left_convert(gather(columns[left_index], sel))
+            rights = right_convert(gather(columns[right_index], sel))
+            mask = [_compare(op, a, b) for a, b in zip(lefts, rights)]
+            return list(compress(sel, mask))
+        return compare
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BACKEND NUMPY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Mask: fungsi konteks batch -> ndarray boolean (satu elemen per baris terpilih)
+Mask = Callable[['_BatchValues'], 'numpy.ndarray']
+
+
+class _BatchValues:
+    """
+    Nilai kolom untuk baris terpilih satu batch, dimuat sekali per kolom
+    selama satu evaluasi kernel (kolom yang dipakai beberapa operand tidak
+    dikonversi ulang).
+    """
+    __slots__ = ("columns", "sel", "size", "_strings", "_numbers")
+
+    def __init__(self, columns: Sequence[Sequence[str]], sel: Sequence[int]):
+        self.columns = columns
+        self.sel = sel
+        self.size = len(sel)
+        self._strings: Dict[int, Sequence[str]] = {}
+        self._numbers: Dict[Tuple[int, bool], 'numpy.ndarray'] = {}
+
+    def strings(self, index: int) -> Sequence[str]:
+        """Nilai teks kolom pada baris terpilih."""
+        values = self._strings.get(index)
+        if values is None:
+            values = self._strings[index] = gather(self.columns[index], self.sel)
+        return values
+
+    def numbers(self, index: int, typed: bool) -> 'numpy.ndarray':
+        """
+        Nilai kolom sebagai ndarray float64. Bertipe: float() tanpa cadangan
+        (melempar ValueError); tanpa tipe: nilai non-numerik menjadi 0.0.
+        """
+        key = (index, typed)
+        values = self._numbers.get(key)
+        if values is None:
+            strings = self.strings(index)
+            if typed:
+                values = numpy.fromiter(map(float, strings), numpy.float64, len(strings))
+            else:
+                values = numpy.array(_floats(strings), dtype=numpy.float64)
+            self._numbers[key] = values
+        return values
+
+    def constant(self, result: bool) -> 'numpy.ndarray':
+        """Mask dengan nilai sama untuk semua baris."""
+        return numpy.full(self.size, result, dtype=bool)
+
+    def test(self, index: int, predicate: Callable[[str], bool]) -> 'numpy.ndarray':
+        """Mask dari predicate Python per nilai teks (dijalankan lewat map)."""
+        return numpy.fromiter(map(predicate, self.strings(index)), bool, self.size)
+
+
+# Perbandingan numerik elemen demi elemen
+_NUMPY_OPS = {
+    Op.GREATER_THAN: lambda a, b: a > b,
+    Op.LESS_THAN: lambda a, b: a < b,
+    Op.GREATER_THAN_OR_EQ: lambda a, b: a >= b,
+    Op.LESS_THAN_OR_EQ: lambda a, b: a <= b,
+    Op.EQUAL: lambda a, b: numpy.abs(a - b) < EPSILON,
+    Op.NOT_EQUAL: lambda a, b: numpy.abs(a - b) > EPSILON,
+}
+
+
+class _MaskCompiler:
+    """Kompilasi expression menjadi fungsi mask NumPy untuk satu layout batch."""
+
+    def __init__(self, layout: Layout, schema: Optional[Schema] = None):
+        self.layout = layout
+        self.schema = schema or {}
+
+    def position(self, name: str) -> int:
+        """Posisi kolom di batch."""
+        if name not in self.layout:
+            raise Exception(f"Kolom '{name}' tidak ditemukan")
+        return self.layout[name]
+
+    def is_typed(self, name: str) -> bool:
+        """Apakah kolom dikonversi tanpa cadangan (kolom numerik di schema)."""
+        return self.schema.get(name) in _NUMERIC_TYPES
+
+    def compile_kernel(self, expr: Expr) -> Kernel:
+        """Bungkus mask menjadi kernel (selection vector masuk dan keluar)."""
+        mask = self.compile(expr)
+
+        def kernel(columns, sel) -> List[int]:
+            if not sel:
+                return []
+            # inf - inf = nan: hasilnya sudah benar (False), peringatan diabaikan
+            with numpy.errstate(invalid="ignore"):
+                selected = mask(_BatchValues(columns, sel))
+            return numpy.asarray(sel)[selected].tolist()
+        return kernel
+
+    def compile(self, expr: Expr) -> Mask:
+        """Kompilasi satu node expression."""
+        if isinstance(expr, BoolLiteral):
+            result = expr.value
+            return lambda values: values.constant(result)
+
+        if isinstance(expr, InList):
+            return self.compile_membership(expr)
+
+        if isinstance(expr, Between):
+            return self.compile_between(expr)
+
+        if not isinstance(expr, BinaryOp):
+            # Leaf di posisi kondisi selalu False (sama dengan eval_expr)
+            return lambda values: values.constant(False)
+
+        if expr.op in (Op.AND, Op.OR):
+            return self.compile_logic(expr)
+
+        result = constant_result(expr)
+        if result is not None:
+            return lambda values: values.constant(result)
+
+        if expr.op in (Op.EQUAL, Op.NOT_EQUAL):
+            string_valued = (Identifier, StringLiteral, Literal)
+            if isinstance(expr.left, string_valued) and isinstance(expr.right, string_valued):
+                return self.compile_string_equality(expr)
+
+        return self.compile_numeric(expr)
+
+    def compile_logic(self, expr: BinaryOp) -> Mask:
+        """AND menjadi &, OR menjadi | (berhenti jika hasil sudah pasti)."""
+        masks = [self.compile(operand) for operand in flatten_chain(expr, expr.op)]
+
+        if expr.op == Op.AND:
+            def all_of(values) -> 'numpy.ndarray':
+                result = masks[0](values)
+                for mask in masks[1:]:
+                    if not result.any():
+                        break
+                    result = result & mask(values)
+                return result
+            return all_of
+
+        def any_of(values) -> 'numpy.ndarray':
+            result = masks[0](values)
+            for mask in masks[1:]:
+                if result.all():
+                    break
+                result = result | mask(values)
+            return result
+        return any_of
+
+    def compile_membership(self, expr: InList) -> Mask:
+        """
+        Kolom IN (nilai, ...): frozenset untuk string; untuk angka,
+        searchsorted pada konstanta terurut lalu cek dua tetangga terdekat
+        dengan EPSILON (sama dengan predicate.number_matcher).
+        NOT IN adalah kebalikan mask IN.
+        """
+        if expr.negated:
+            member = self.compile_membership(replace(expr, negated=False))
+            return lambda values: ~member(values)
+
+        literal = (Number, StringLiteral, Literal)
+        numbers = [value.value for value in expr.values if isinstance(value, Number)]
+        if (not isinstance(expr.expr, Identifier)
+                or not all(isinstance(value, literal) for value in expr.values)
+                or not all(math.isfinite(number) for number in numbers)):
+            return self.compile(expand_in_list(expr))
+
+        name = expr.expr.name
+        index = self.position(name)
+        typed = self.is_typed(name)
+        strings = frozenset(value.value for value in expr.values
+                            if isinstance(value, (StringLiteral, Literal)))
+        ordered = numpy.array(sorted(set(numbers)), dtype=numpy.float64)
+        last = len(ordered) - 1
+
+        def member(values) -> 'numpy.ndarray':
+            result = values.test(index, strings.__contains__) if strings else None
+            if not len(ordered):
+                return result
+            column = values.numbers(index, typed)
+            i = numpy.searchsorted(ordered, column)
+            above = ordered[numpy.minimum(i, last)] - column
+            below = column - ordered[numpy.maximum(i - 1, 0)]
+            near = ((i <= last) & (above < EPSILON)) | ((i > 0) & (below < EPSILON))
+            return near if result is None else result | near
+        return member
+
+    def compile_string_equality(self, expr: BinaryOp) -> Mask:
+        """= / != antar nilai string (minimal satu sisi kolom)."""
+        negate = expr.op == Op.NOT_EQUAL
+        left_is_column = isinstance(expr.left, Identifier)
+        right_is_column = isinstance(expr.right, Identifier)
+
+        if left_is_column and right_is_column:
+            left, right = self.position(expr.left.name), self.position(expr.right.name)
+            cmp = ne if negate else eq
+            return lambda values: numpy.fromiter(
+                map(cmp, values.strings(left), values.strings(right)), bool, values.size)
+
+        index = self.position(expr.left.name if left_is_column else expr.right.name)
+        value = expr.right.value if left_is_column else expr.left.value
+        test = value.__ne__ if negate else value.__eq__
+        return lambda values: values.test(index, test)
+
+    def compile_between(self, expr: Between) -> Mask:
+        """low <= nilai <= high atas ndarray (kolom dimuat sekali per batch)."""
+        result = constant_result(expr)
+        if result is not None:
+            return lambda values: values.constant(result)
+        if not isinstance(expr.expr, Identifier):
+            return self.compile(expand_between(expr))
+
+        value = self.numeric_source(expr.expr)
+        low = self.numeric_source(expr.low)
+        high = self.numeric_source(expr.high)
+
+        def within(values) -> 'numpy.ndarray':
+            column = value(values)
+            return (low(values) <= column) & (column <= high(values))
+        return within
+
+    def compile_numeric(self, expr: BinaryOp) -> Mask:
+        """Perbandingan numerik (termasuk = dan != dengan epsilon) atas ndarray."""
+        cmp = _NUMPY_OPS[expr.op]
+        left = self.numeric_source(expr.left)
+        right = self.numeric_source(expr.right)
+        return lambda values: cmp(left(values), right(values))
+
+    def numeric_source(self, expr: Expr) -> Callable[['_BatchValues'], object]:
+        """Sumber nilai numerik: ndarray untuk kolom, float untuk konstanta."""
+        const = _constant_value(expr)
+        if const is not None:
+            const = float(const)
+            return lambda values: const
+        index = self.position(expr.name)
+        typed = self.is_typed(expr.name)
+        return lambda values: values.numbers(index, typed)
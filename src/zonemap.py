@@ -0,0 +1,350 @@
+"""
+zonemap.py - Zone Map (Statistik Min/Max per Blok) untuk CSV_QL
+
+Modul ini membagi file CSV menjadi blok berisi BLOCK_ROWS record dan mencatat,
+untuk setiap blok, rentang byte-nya serta nilai minimum dan maksimum setiap
+kolom. Sebelum scan, WHERE clause dievaluasi terhadap statistik blok: blok
+yang PASTI tidak memiliki baris yang cocok dilewati tanpa di-parse sama sekali.
+
+Statistik memakai semantik numerik yang sama dengan engine.get_value: nilai
+yang tidak bisa di-parse float() dihitung sebagai 0.0. Nilai NaN tidak ikut
+dihitung karena NaN tidak pernah lolos perbandingan numerik apapun.
+
+Hanya perbandingan numerik (kolom op angka, kolom BETWEEN a AND b, kolom IN
+daftar angka) yang bisa memangkas blok.
+Perbandingan string (status = "Lulus") dan kolom vs kolom dianggap selalu
+mungkin cocok.
+
+Zone map disimpan sebagai JSON di samping file CSV (data.csv -> data.csv.cqlz)
+bersama fingerprint file; jika file berubah, zone map dibangun ulang.
+
+Contoh:
+    zones = ZoneMap.open_or_build(table)          # table: scanner.MmapTable
+    ranges = zones.candidate_ranges(ast.where_clause)
+"""
+
+import json
+import math
+import os
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+from ast_nodes import (Expr, Op, BinaryOp, Identifier, Number, StringLiteral, Literal, BoolLiteral,
+                       InList, Between)
+from fingerprint import file_fingerprint, header_hash
+from predicate import (EPSILON, flatten_chain, expand_between, expand_in_list, _FLIPPED_OPS,
+                       _compare, _constant_value)
+from scanner import MmapTable, _QuotedParser
+
+
+# Ekstensi file zone map
+SUFFIX = ".cqlz"
+
+# Versi format file (naikkan jika struktur JSON berubah)
+VERSION = 1
+
+# Jumlah record per blok
+BLOCK_ROWS = 65536
+
+# Byte range di dalam file CSV: (start, end)
+ByteRange = Tuple[int, int]
+
+
+def zonemap_path(path: str) -> str:
+    """Path file zone map untuk file CSV."""
+    return path + SUFFIX
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build(table: MmapTable, block_rows: int = BLOCK_ROWS) -> Dict:
+    """
+    Bangun zone map untuk tabel lalu simpan ke file sidecar.
+
+    Args:
+        table: Tabel CSV yang sudah dibuka dengan mmap
+        block_rows: Jumlah record per blok
+
+    Returns:
+        Metadata zone map (dict yang sama dengan isi file)
+    """
+    size, mtime_ns, _ = file_fingerprint(table.path)
+    width = len(table.header)
+    parse_quoted = _QuotedParser()
+    blocks = []
+
+    lows: List[float] = [math.inf] * width
+    highs: List[float] = [-math.inf] * width
+    start = None
+    rows = 0
+
+    def flush(end: int) -> None:
+        blocks.append({
+            "start": start,
+            "end": end,
+            "rows": rows,
+            # Kolom yang seluruh nilainya NaN tidak punya rentang
+            "min": [None if lo > hi else lo for lo, hi in zip(lows, highs)],
+            "max": [None if lo > hi else hi for lo, hi in zip(lows, highs)],
+        })
+
+    for offset, record in table.iter_records():
+        if rows >= block_rows:
+            flush(offset)
+            lows = [math.inf] * width
+            highs = [-math.inf] * width
+            start = None
+            rows = 0
+        if start is None:
+            start = offset
+
+        if b'"' in record:
+            fields = parse_quoted(record)
+        else:
+            fields = record.decode('utf-8').split(',')
+
+        for i in range(width):
+            try:
+                value = float(fields[i]) if i < len(fields) else 0.0
+            except ValueError:
+                value = 0.0
+            if value != value:
+                # NaN
+                continue
+            if value < lows[i]:
+                lows[i] = value
+            if value > highs[i]:
+                highs[i] = value
+        rows += 1
+
+    if rows:
+        flush(table.size)
+
+    meta = {
+        "version": VERSION,
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "header_hash": header_hash(table.header),
+        "block_rows": block_rows,
+        "blocks": blocks,
+    }
+
+    target = zonemap_path(table.path)
+    temp = target + ".tmp"
+    try:
+        with open(temp, 'w', encoding='utf-8') as out:
+            json.dump(meta, out)
+        os.replace(temp, target)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    return meta
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ZONE MAP
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ZoneMap:
+    """
+    Statistik min/max per blok untuk satu file CSV.
+
+    Attributes:
+        header: List nama kolom
+        blocks: List blok: {"start", "end", "rows", "min", "max"}
+    """
+
+    def __init__(self, header: List[str], meta: Dict):
+        self.header = header
+        self.blocks: List[Dict] = meta["blocks"]
+        self._index = {name: i for i, name in enumerate(header)}
+        # id(InList) -> (InList, konstanta angka terurut), dipakai ulang antar blok
+        # dalam satu candidate_ranges()
+        self._members: Dict[int, Tuple[InList, List[float]]] = {}
+
+    @classmethod
+    def open(cls, table: MmapTable) -> Optional['ZoneMap']:
+        """
+        Baca zone map jika ada dan masih sesuai dengan file CSV.
+
+        Args:
+            table: Tabel CSV yang sudah dibuka dengan mmap
+
+        Returns:
+            ZoneMap, atau None jika file tidak ada / basi / rusak
+        """
+        target = zonemap_path(table.path)
+        if not os.path.exists(target):
+            return None
+        try:
+            with open(target, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            size, mtime_ns, _ = file_fingerprint(table.path)
+            if (meta.get("version") != VERSION or meta["size"] != size
+                    or meta["mtime_ns"] != mtime_ns
+                    or meta["header_hash"] != header_hash(table.header)):
+                return None
+        except (OSError, ValueError, KeyError):
+            return None
+        return cls(table.header, meta)
+
+    @classmethod
+    def open_or_build(cls, table: MmapTable) -> Optional['ZoneMap']:
+        """
+        Baca zone map, atau bangun dulu jika belum ada / sudah basi.
+
+        Args:
+            table: Tabel CSV yang sudah dibuka dengan mmap
+
+        Returns:
+            ZoneMap, atau None jika file zone map tidak bisa ditulis
+        """
+        zones = cls.open(table)
+        if zones is not None:
+            return zones
+        try:
+            return cls(table.header, build(table))
+        except OSError:
+            return None
+
+    def candidate_ranges(self, expr: Optional[Expr]) -> List[ByteRange]:
+        """
+        Byte range blok yang mungkin berisi baris yang cocok dengan expr.
+
+        Blok yang bersebelahan digabung menjadi satu range.
+
+        Args:
+            expr: WHERE clause (None = semua blok)
+
+        Returns:
+            List (start, end) berurutan sesuai file
+        """
+        ranges: List[ByteRange] = []
+        self._members.clear()
+        for block in self.blocks:
+            if expr is not None and not self.may_match(expr, block):
+                continue
+            if ranges and ranges[-1][1] == block["start"]:
+                ranges[-1] = (ranges[-1][0], block["end"])
+            else:
+                ranges.append((block["start"], block["end"]))
+        return ranges
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # EVALUASI TERHADAP STATISTIK
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def may_match(self, expr: Expr, block: Dict) -> bool:
+        """
+        Apakah blok MUNGKIN berisi baris yang membuat expr bernilai True.
+
+        False hanya dikembalikan jika dijamin tidak ada baris yang cocok.
+        """
+        if isinstance(expr, BoolLiteral):
+            return expr.value
+        if isinstance(expr, InList):
+            return self.membership_may_match(expr, block)
+        if isinstance(expr, Between):
+            low, high = _constant_value(expr.low), _constant_value(expr.high)
+            if isinstance(expr.expr, Identifier) and low is not None and high is not None:
+                return self.column_may_match_range(expr.expr.name, low, high, block)
+            return self.may_match(expand_between(expr), block)
+        if not isinstance(expr, BinaryOp):
+            # Leaf di posisi kondisi selalu False (sama dengan eval_expr)
+            return False
+
+        if expr.op == Op.AND:
+            return all(self.may_match(e, block) for e in flatten_chain(expr, Op.AND))
+        if expr.op == Op.OR:
+            return any(self.may_match(e, block) for e in flatten_chain(expr, Op.OR))
+
+        if expr.op in (Op.EQUAL, Op.NOT_EQUAL) and _has_string_value(expr.left) \
+                and _has_string_value(expr.right):
+            # Perbandingan string: hanya literal vs literal yang bisa dipastikan
+            if isinstance(expr.left, Identifier) or isinstance(expr.right, Identifier):
+                return True
+            return (expr.left.value == expr.right.value) != (expr.op == Op.NOT_EQUAL)
+
+        left_const = _constant_value(expr.left)
+        right_const = _constant_value(expr.right)
+        if left_const is not None and right_const is not None:
+            return _compare(expr.op, left_const, right_const)
+        if left_const is None and right_const is not None:
+            return self.column_may_match(expr.left.name, expr.op, right_const, block)
+        if left_const is not None and right_const is None:
+            return self.column_may_match(expr.right.name, _FLIPPED_OPS[expr.op],
+                                         left_const, block)
+        # Kolom vs kolom
+        return True
+
+    def membership_may_match(self, expr: InList, block: Dict) -> bool:
+        """
+        Versi may_match untuk "kolom IN (nilai, ...)".
+
+        Nilai string tidak bisa dipastikan dari statistik numerik; untuk
+        angka cukup satu bisect pada konstanta terurut per blok. NOT IN
+        selalu dianggap mungkin cocok.
+        """
+        if expr.negated:
+            return True
+        literal = (Number, StringLiteral, Literal)
+        if (not isinstance(expr.expr, Identifier)
+                or not all(isinstance(value, literal) for value in expr.values)):
+            return self.may_match(expand_in_list(expr), block)
+        if any(isinstance(value, (StringLiteral, Literal)) for value in expr.values):
+            return True
+
+        cached = self._members.get(id(expr))
+        if cached is None or cached[0] is not expr:
+            cached = (expr, sorted(value.value for value in expr.values))
+            self._members[id(expr)] = cached
+        numbers = cached[1]
+
+        index = self._index.get(expr.expr.name)
+        if index is None:
+            return True
+        low, high = block["min"][index], block["max"][index]
+        if low is None:
+            return False
+        # Konstanta terkecil yang > low - EPSILON harus < high + EPSILON
+        i = bisect_right(numbers, low - EPSILON)
+        return i < len(numbers) and numbers[i] < high + EPSILON
+
+    def column_may_match_range(self, name: str, low: float, high: float, block: Dict) -> bool:
+        """Apakah ada nilai kolom di blok yang memenuhi "kolom BETWEEN low AND high"."""
+        index = self._index.get(name)
+        if index is None:
+            return True
+        block_low, block_high = block["min"][index], block["max"][index]
+        if block_low is None:
+            return False
+        return low <= high and block_high >= low and block_low <= high
+
+    def column_may_match(self, name: str, op: Op, const: float, block: Dict) -> bool:
+        """Apakah ada nilai kolom di blok yang memenuhi "kolom op konstanta"."""
+        index = self._index.get(name)
+        if index is None:
+            return True
+        low, high = block["min"][index], block["max"][index]
+        if low is None:
+            # Semua nilai NaN: tidak ada yang lolos perbandingan numerik
+            return False
+
+        if op == Op.EQUAL:
+            return low - EPSILON < const < high + EPSILON
+        if op == Op.NOT_EQUAL:
+            return abs(low - const) > EPSILON or abs(high - const) > EPSILON
+        if op == Op.GREATER_THAN:
+            return high > const
+        if op == Op.LESS_THAN:
+            return low < const
+        if op == Op.GREATER_THAN_OR_EQ:
+            return high >= const
+        return low <= const
+
+
+def _has_string_value(expr: Expr) -> bool:
+    """Apakah expr punya nilai string (sama dengan engine.get_string_value)."""
+    return isinstance(expr, (Identifier, StringLiteral, Literal))